@@ -0,0 +1,177 @@
+import asyncio
+import os
+import threading
+
+from google.genai import types
+
+from stt import breaker, metrics, ratelimit, scheduler
+
+
+# Sync-over-async bridge: SyncClient lets the blocking pipeline share one loop, async client and
+# connection pool, but each caller still waits on its own thread. Only TTS chunks run concurrently here.
+class LoopRunner:
+    def __init__(self, max_in_flight=64):
+        self.loop = asyncio.new_event_loop()
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._thread = threading.Thread(target=self._run, name="stt-aio", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    async def _limited(self, coro):
+        async with self._semaphore:
+            return await coro
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(self._limited(coro), self.loop)
+
+    def run(self, coro, timeout=None):
+        return self.submit(coro).result(timeout)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+
+async def upload_file(aclient, path, display_name):
+    myfile = await aclient.files.upload(file=path, config={"display_name": display_name})
+    metrics.UPLOAD_BYTES_TOTAL.inc(os.path.getsize(path))
+    return myfile
+
+
+async def list_files(aclient):
+    pager = await aclient.files.list()
+    return [f async for f in pager]
+
+
+async def synthesize_chunk(aclient, model, text, language_name, max_retries=3):
+    from stt.generators.audio import extract_pcm
+
+    gate = breaker.get(f"gemini:{model}")
+    for attempt in range(max_retries):
+        gate.before_call()
+        # Same accounting as every other model call; the blocking waits run off the event loop.
+        await asyncio.to_thread(ratelimit.acquire)
+        await asyncio.to_thread(scheduler.acquire)
+        metrics.MODEL_CALLS_IN_FLIGHT.inc()
+        try:
+            response = await aclient.models.generate_content(
+                model=model,
+                contents=f"Please read this text naturally in {language_name}: {text}",
+                config=types.GenerateContentConfig(response_modalities=["AUDIO"]),
+            )
+            gate.record_success()
+            metrics.MODEL_CALLS_TOTAL.inc(model=model, outcome="ok")
+            pcm = extract_pcm(response)
+            if pcm:
+                return pcm, response
+        except Exception as e:
+            gate.record(e)
+            metrics.MODEL_CALLS_TOTAL.inc(model=model, outcome="error")
+            print(f"   Warning: TTS chunk error (Attempt {attempt+1}/{max_retries}): {e}")
+        finally:
+            metrics.MODEL_CALLS_IN_FLIGHT.dec()
+            scheduler.release()
+        if attempt < max_retries - 1:
+            metrics.RETRIES_TOTAL.inc(operation="tts")
+            await asyncio.sleep(3 * (attempt + 1))
+    return b"", None
+
+
+async def synthesize_chunks(aclient, model, chunks, language_name, limit=4):
+    semaphore = asyncio.Semaphore(limit)
+
+    async def one(chunk):
+        if not chunk.strip():
+            return b"", None
+        async with semaphore:
+            return await synthesize_chunk(aclient, model, chunk, language_name)
+
+    return await asyncio.gather(*(one(chunk) for chunk in chunks))
+
+
+class _Files:
+    def __init__(self, bridge):
+        self._bridge = bridge
+
+    def upload(self, file, config=None):
+        display_name = (config or {}).get("display_name") or os.path.basename(file)
+        return self._bridge.run(upload_file(self._bridge.aio, file, display_name))
+
+    def get(self, name):
+        return self._bridge.run(self._bridge.aio.files.get(name=name))
+
+    def delete(self, name):
+        return self._bridge.run(self._bridge.aio.files.delete(name=name))
+
+    def list(self):
+        return self._bridge.run(list_files(self._bridge.aio))
+
+
+class _Models:
+    def __init__(self, bridge):
+        self._bridge = bridge
+
+    def generate_content(self, model, contents, config=None):
+        return self._bridge.run(self._bridge.aio.models.generate_content(model=model, contents=contents, config=config))
+
+    def generate_content_stream(self, model, contents, config=None):
+        stream = self._bridge.run(
+            self._bridge.aio.models.generate_content_stream(model=model, contents=contents, config=config)
+        )
+        while True:
+            try:
+                yield self._bridge.run(stream.__anext__())
+            except StopAsyncIteration:
+                return
+
+
+class _Caches:
+    def __init__(self, bridge):
+        self._bridge = bridge
+
+    def create(self, model, config=None):
+        return self._bridge.run(self._bridge.aio.caches.create(model=model, config=config))
+
+    def delete(self, name):
+        return self._bridge.run(self._bridge.aio.caches.delete(name=name))
+
+
+class SyncClient:
+    is_async_bridge = True
+
+    def __init__(self, client, runner):
+        self.aio = client.aio
+        self.runner = runner
+        self.files = _Files(self)
+        self.models = _Models(self)
+        self.caches = _Caches(self)
+
+    def run(self, coro, timeout=None):
+        return self.runner.run(coro, timeout)
+
+
+_runner = None
+_sync_client = None
+_lock = threading.Lock()
+
+
+def get_runner(config):
+    global _runner
+    with _lock:
+        if _runner is None:
+            _runner = LoopRunner(config.get("async", {}).get("max_in_flight", 64))
+        return _runner
+
+
+def get_sync_client(config):
+    global _sync_client
+    runner = get_runner(config)
+    with _lock:
+        if _sync_client is None:
+            from stt import clients
+
+            _sync_client = SyncClient(clients.get_genai_client(), runner)
+        return _sync_client
@@ -0,0 +1,156 @@
+import threading
+import time
+
+from stt import metrics
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+TRANSIENT_ERRORS = [
+    "timeout",
+    "timed out",
+    "connection",
+    "disconnect",
+    "reset",
+    "unavailable",
+    "overloaded",
+    "resource_exhausted",
+    "500",
+    "502",
+    "503",
+    "504",
+    "429",
+]
+
+DEFAULT_SETTINGS = {"failure_threshold": 5, "reset_seconds": 60, "half_open_calls": 1}
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, dependency, retry_after):
+        super().__init__(f"Circuit open for {dependency}; retry in {retry_after:.0f}s")
+        self.dependency = dependency
+        self.retry_after = retry_after
+
+
+def is_failure(error):
+    if isinstance(error, CircuitOpenError):
+        return False
+    return isinstance(error, OSError) or any(x in str(error).lower() for x in TRANSIENT_ERRORS)
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=5, reset_seconds=60, half_open_calls=1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.half_open_calls = half_open_calls
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probes = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+        metrics.CIRCUIT_STATE.set(0, dependency=name)
+
+    def _set_state(self, state):
+        self.state = state
+        metrics.CIRCUIT_STATE.set(STATE_VALUES[state], dependency=self.name)
+
+    def retry_after(self):
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_seconds - time.time())
+
+    def before_call(self):
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self.retry_after()
+                if remaining > 0:
+                    raise CircuitOpenError(self.name, remaining)
+                self._set_state(HALF_OPEN)
+                self.probes = 0
+            if self.state == HALF_OPEN:
+                if self.probes >= self.half_open_calls:
+                    raise CircuitOpenError(self.name, self.reset_seconds)
+                self.probes += 1
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)[:200] if error is not None else None
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    metrics.CIRCUIT_OPENED_TOTAL.inc(dependency=self.name)
+                    print(f"   Circuit opened for {self.name} after {self.failures} failures.")
+                self._set_state(OPEN)
+                self.opened_at = time.time()
+
+    def record(self, error):
+        if is_failure(error):
+            self.record_failure(error)
+        else:
+            self.record_success()
+
+    def call(self, fn):
+        self.before_call()
+        try:
+            result = fn()
+        except Exception as e:
+            self.record(e)
+            raise
+        self.record_success()
+        return result
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "retry_after_seconds": round(self.retry_after(), 1),
+                "last_error": self.last_error,
+            }
+
+
+_breakers = {}
+_settings = {"default": dict(DEFAULT_SETTINGS), "overrides": {}}
+_lock = threading.Lock()
+
+
+def configure(config):
+    breaker_cfg = config.get("breakers", {})
+    with _lock:
+        _settings["default"] = dict(DEFAULT_SETTINGS)
+        _settings["default"].update({k: v for k, v in breaker_cfg.items() if k in DEFAULT_SETTINGS})
+        _settings["overrides"] = breaker_cfg.get("overrides", {})
+        _breakers.clear()
+
+
+def get(name):
+    with _lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            settings = dict(_settings["default"])
+            settings.update(_settings["overrides"].get(name.split(":")[0], {}))
+            settings.update(_settings["overrides"].get(name, {}))
+            breaker = CircuitBreaker(name, **settings)
+            _breakers[name] = breaker
+        return breaker
+
+
+def call(name, fn):
+    return get(name).call(fn)
+
+
+def snapshot():
+    with _lock:
+        breakers = dict(_breakers)
+    return {name: breaker.snapshot() for name, breaker in sorted(breakers.items())}
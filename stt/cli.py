@@ -8,14 +8,14 @@ except ImportError:
     pass
 
 from stt.config import load_config
-from stt.pipeline import collect_targets, process_target
-from stt.downloaders.podcast import process_feeds
-from stt import interactive
-from stt import compare as compare_mode
-from stt import server
-from stt import watch as watch_mode
+from stt.pipeline import collect_targets, run_batch
 
 
+def _priorities(targets, feeds_targets, priority=None):
+    priorities = {target: "backfill" for target in feeds_targets}
+    if priority:
+        priorities.update({target: priority for target in targets})
+    return priorities
 
 
 def main():
@@ -24,42 +24,133 @@ def main():
     parser = argparse.ArgumentParser(description="YouTube/Audio to Reports")
     parser.add_argument("inputs", nargs="*", help="Audio file(s) or YouTube URL(s)")
     parser.add_argument("--with-transcript", action="store_true", help="Generate verbatim transcript")
-    parser.add_argument("--lang", choices=["zh", "en", "ja"], help="Report language")
+    parser.add_argument("--lang", help="Report language(s): zh, en, ja, or a list such as zh,en,ja")
     parser.add_argument("--config", default="config.yaml", help="Path to config.yaml")
     parser.add_argument("--batch", help="Text file with URLs/paths or a folder path")
     parser.add_argument("--timestamps", action="store_true", help="Add timestamps in reports")
     parser.add_argument("--reports", help="Comma-separated report types (override config)")
-    parser.add_argument("--format", help="Comma-separated export formats: md,pdf,docx,notion")
+    parser.add_argument("--format", help="Comma-separated export formats: md,pdf,docx,html,notion")
     parser.add_argument("--dry-run", action="store_true", help="Estimate cost and exit")
     parser.add_argument("--interactive", action="store_true", help="Interactive report builder")
-    parser.add_argument("--compare", action="store_true", help="Comparison mode for two inputs")
+    parser.add_argument("--compare", action="store_true", help="Compare two or more inputs (files, URLs, catalog:<query>)")
     parser.add_argument("--serve", action="store_true", help="Run web UI dashboard")
     parser.add_argument("--port", type=int, default=8080, help="Web UI port")
     parser.add_argument("--watch", help="Watch a folder for new audio files")
-    parser.add_argument("--feeds", default="feeds.yaml", help="Podcast feeds config")
+    parser.add_argument("--feeds", help="Podcast feeds config (default: feeds.yaml; --serve only backfills when given)")
+    parser.add_argument("--trace-report", action="store_true", help="Aggregate per-job traces into latency/cost report")
+    parser.add_argument("--metrics-port", type=int, help="Expose /metrics on this port during watch/batch runs")
+    parser.add_argument("--metrics-file", help="Write metrics in Prometheus text format here when the run ends")
+    parser.add_argument("--order", choices=["input", "sjf", "ljf"], help="Batch order: input, shortest or longest first")
+    parser.add_argument("--concurrency", type=int, help="Number of batch jobs to run in parallel")
+    parser.add_argument("--dedup", action="store_true", help="Skip inputs that match earlier audio (dedup.enabled)")
+    parser.add_argument("--no-dedup", action="store_true", help="Process inputs even if they match earlier audio")
+    parser.add_argument("--priority", help="Scheduling class for the given inputs: interactive, watch, batch, backfill")
+    parser.add_argument("--worker", action="store_true", help="Queue inputs and claim jobs from the shared job store")
+    parser.add_argument("--digest", action="store_true", help="Batch completion emails/Telegram messages into digests")
+    parser.add_argument("--export-only", action="store_true", help="Render PDF/DOCX/HTML for existing reports and exit")
 
     args = parser.parse_args()
     config = load_config(args.config)
-    lang = args.lang or config["defaults"].get("language", "zh")
+    if args.dedup:
+        config["dedup"]["enabled"] = True
+    if args.no_dedup:
+        config["dedup"]["enabled"] = False
+    if args.digest:
+        config["plugins"]["digest"]["enabled"] = True
+    from stt import breaker, clients, hedging, ratelimit, scheduler
+    from stt.plugins import dispatcher as plugin_dispatcher
+    clients.configure(config)
+    breaker.configure(config)
+    ratelimit.configure(config)
+    hedging.configure(config)
+    scheduler.configure(config)
+    plugin_dispatcher.configure(config)
+    # Every mode, including --compare, --worker and early exits, drains queued plugin events and writes metrics.
+    try:
+        _run_mode(parser, args, config)
+    finally:
+        plugin_dispatcher.flush()
+        if args.metrics_file:
+            from stt.metrics import REGISTRY
+            REGISTRY.write(args.metrics_file)
+            print(f"Metrics written to: {args.metrics_file}")
+
+
+def _run_mode(parser, args, config):
+    from stt.generators.translate import parse_langs
+    try:
+        langs = parse_langs(args.lang or config["defaults"].get("language", "zh"), config.get("languages", {}).get("pivot"))
+    except ValueError as e:
+        parser.error(str(e))
+    lang = langs[0]
+    translate_to = langs[1:]
+    if args.trace_report:
+        from stt.tracing import print_trace_report
+        print_trace_report(config["paths"]["output_dir"], config)
+        return
+    if args.export_only:
+        from stt.exporters import engine as export_engine
+        formats = [x.strip() for x in args.format.split(",") if x.strip()] if args.format else list(export_engine.FORMATS)
+        output_root = args.inputs[0] if args.inputs else config["paths"]["output_dir"]
+        summary = export_engine.export_tree(output_root, formats, config)
+        print(
+            f"Exported {summary['directories']} report folder(s): {summary['rendered']} rendered, "
+            f"{summary['skipped']} unchanged, {summary['failed']} failed."
+        )
+        return
     if not os.getenv("GEMINI_API_KEY"):
         print("Error: GEMINI_API_KEY not set. Please set it in .env or environment.")
         return
+    from stt import prompts
+    try:
+        prompts.configure(config)
+    except prompts.PromptError as e:
+        print(f"Error: {e}")
+        return
 
     if args.serve:
-        server.run_server(config, args.port)
+        from stt import server
+        from stt.downloaders.podcast import process_feeds
+        backlog = None
+        backlog_targets = collect_targets(args.inputs, args.batch)
+        feeds_targets = process_feeds(args.feeds, config["paths"]["output_dir"]) if args.feeds else []
+        if backlog_targets or feeds_targets:
+            backlog = {
+                "targets": backlog_targets + feeds_targets,
+                "priorities": _priorities(backlog_targets, feeds_targets, args.priority),
+                "concurrency": args.concurrency or config.get("batch", {}).get("concurrency", 1),
+                "max_parks": config.get("breakers", {}).get("max_parks", 10),
+                "config": config,
+                "lang": lang,
+                "include_timestamps": args.timestamps or config["defaults"].get("timestamps", False),
+                "with_transcript": args.with_transcript,
+                "report_keys": [x.strip() for x in args.reports.split(",") if x.strip()] if args.reports else None,
+                "tts_enabled": bool(config["defaults"].get("tts", True)),
+                "export_formats": config["defaults"].get("export_formats", ["md"]),
+                "dry_run": False,
+                "translate_to": translate_to,
+            }
+        server.run_server(config, args.port, backlog=backlog)
         return
 
+    if args.metrics_port:
+        from stt.metrics import serve_metrics
+        serve_metrics(args.metrics_port)
+
     if args.watch:
+        from stt import watch as watch_mode
         watch_mode.run_watch(
             args.watch,
             config=config,
             lang=lang,
             include_timestamps=args.timestamps or config["defaults"].get("timestamps", False),
             with_transcript=args.with_transcript,
+            translate_to=translate_to,
         )
         return
 
     if args.interactive:
+        from stt import interactive
         selection = interactive.run_interactive(config)
         lang = selection["lang"]
         report_keys = selection["reports"]
@@ -84,12 +175,12 @@ def main():
     tts_enabled = bool(config["defaults"].get("tts", True))
 
     if args.compare:
-        if len(args.inputs) < 2:
-            print("Comparison mode requires two inputs.")
+        if len(args.inputs) < 2 and not any(x.startswith("catalog:") for x in args.inputs):
+            print("Comparison mode requires at least two inputs.")
             return
+        from stt import compare as compare_mode
         compare_mode.run_compare(
-            args.inputs[0],
-            args.inputs[1],
+            args.inputs,
             config=config,
             lang=lang,
             include_timestamps=include_timestamps,
@@ -97,11 +188,13 @@ def main():
         )
         return
 
+    from stt.downloaders.podcast import process_feeds
     targets = collect_targets(args.inputs, args.batch)
-    feeds_targets = process_feeds(args.feeds, config["paths"]["output_dir"])
+    feeds_targets = process_feeds(args.feeds or "feeds.yaml", config["paths"]["output_dir"])
+    priorities = _priorities(targets, feeds_targets, args.priority)
     targets.extend(feeds_targets)
 
-    if not targets:
+    if not targets and not args.worker:
         parser.print_help()
         print("\nExamples:")
         print("  python stt.py audio.mp3")
@@ -109,21 +202,54 @@ def main():
         print("  python stt.py https://youtu.be/xxx --with-transcript")
         print("  python stt.py --batch playlist.txt")
         print("  python stt.py --watch ./incoming")
+        print("  python stt.py --worker")
         print("  python stt.py --serve --port 8080")
         return
 
-    for target in targets:
-        process_target(
-            target,
-            config=config,
-            lang=lang,
-            include_timestamps=include_timestamps,
-            with_transcript=args.with_transcript,
-            report_keys=report_keys,
-            tts_enabled=tts_enabled,
-            export_formats=export_formats,
-            dry_run=args.dry_run,
+    order = args.order or config.get("batch", {}).get("order", "input")
+    concurrency = args.concurrency or config.get("batch", {}).get("concurrency", 1)
+    if args.dry_run or order != "input":
+        from stt import planner
+        plan = planner.build_plan(targets, config, order=order, concurrency=concurrency)
+        if args.dry_run:
+            planner.print_plan(plan)
+            return
+        targets = [item["target"] for item in plan["items"]]
+
+    if args.worker:
+        from stt.worker import run_worker
+        run_worker(
+            config,
+            targets=targets,
+            params={
+                "lang": lang,
+                "include_timestamps": include_timestamps,
+                "with_transcript": args.with_transcript,
+                "report_keys": report_keys,
+                "tts_enabled": tts_enabled,
+                "export_formats": export_formats,
+                "translate_to": translate_to,
+            },
+            priorities=priorities,
+            concurrency=concurrency,
         )
+        return
+
+    run_batch(
+        targets,
+        concurrency=concurrency,
+        max_parks=config.get("breakers", {}).get("max_parks", 10),
+        priorities=priorities,
+        config=config,
+        lang=lang,
+        include_timestamps=include_timestamps,
+        with_transcript=args.with_transcript,
+        report_keys=report_keys,
+        tts_enabled=tts_enabled,
+        export_formats=export_formats,
+        dry_run=False,
+        translate_to=translate_to,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+import os
+import threading
+
+
+DEFAULT_HTTP = {
+    "timeout_ms": 1800000,
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_seconds": 30,
+}
+
+_lock = threading.RLock()
+_settings = dict(DEFAULT_HTTP)
+_genai_client = None
+_http_session = None
+_notion_clients = {}
+
+
+def configure(config):
+    global _settings
+    with _lock:
+        _settings = dict(DEFAULT_HTTP)
+        _settings.update(config.get("http", {}))
+
+
+def http_settings():
+    return dict(_settings)
+
+
+def _httpx_limits():
+    import httpx
+
+    return httpx.Limits(
+        max_connections=_settings["max_connections"],
+        max_keepalive_connections=_settings["max_keepalive_connections"],
+        keepalive_expiry=_settings["keepalive_seconds"],
+    )
+
+
+def get_genai_client():
+    global _genai_client
+    with _lock:
+        if _genai_client is None:
+            from google import genai
+            from google.genai import types
+
+            _genai_client = genai.Client(
+                api_key=os.getenv("GEMINI_API_KEY"),
+                http_options=types.HttpOptions(
+                    timeout=_settings["timeout_ms"],
+                    client_args={"limits": _httpx_limits()},
+                    async_client_args={"limits": _httpx_limits()},
+                ),
+            )
+        return _genai_client
+
+
+def get_client(config):
+    if config.get("async", {}).get("enabled", False):
+        from stt import aio
+
+        return aio.get_sync_client(config)
+    return get_genai_client()
+
+
+def get_http_session():
+    global _http_session
+    with _lock:
+        if _http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=_settings["max_keepalive_connections"],
+                pool_maxsize=_settings["max_connections"],
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def get_notion_client(token, base_url=None):
+    with _lock:
+        client = _notion_clients.get((token, base_url))
+        if client is None:
+            import httpx
+            from notion_client import Client
+
+            options = {"base_url": base_url} if base_url else {}
+            client = Client(auth=token, client=httpx.Client(limits=_httpx_limits()), **options)
+            _notion_clients[(token, base_url)] = client
+        return client
+
+
+def reset():
+    global _genai_client, _http_session
+    with _lock:
+        if _http_session is not None:
+            _http_session.close()
+        for client in _notion_clients.values():
+            client.close()
+        _notion_clients.clear()
+        _genai_client = None
+        _http_session = None
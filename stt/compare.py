@@ -1,78 +1,293 @@
+import fnmatch
+import hashlib
 import os
-import time
+import threading
 
-from google import genai
 from google.genai import types
 
+from stt import clients, filestate, routing, uploads
 from stt.downloaders.youtube import download_youtube_audio
-from stt.utils import ensure_dir, safe_filename
-from stt.core import generate_with_progress, get_existing_file
+from stt.generators.report import LANGUAGE_MAP
+from stt.utils import ensure_dir, file_sha256, read_json, safe_filename, write_json
+from stt.core import generate_quietly, get_existing_file, run_in_parallel
 
 
-def summarize_media(client, model_id, media_file, title):
-    prompt = (
-        "Provide a concise summary (8-12 bullet points) of the audio content. "
-        "Focus on key arguments, claims, and conclusions."
-    )
-    response = generate_with_progress(
+DEFAULT_SETTINGS = {
+    "concurrency": 4,
+    "group_size": 4,
+    "max_group_chars": 60000,
+    "reuse_reports": True,
+}
+
+SUMMARY_PROMPT = (
+    "Provide a concise summary (8-12 bullet points) of the audio content. "
+    "Focus on key arguments, claims, and conclusions."
+)
+COMPARE_PROMPT = (
+    "Compare these {count} summaries. Highlight similarities, differences, and key contrasts. "
+    "Refer to each source by its [number]. "
+    "Output Markdown with sections: # Similarities, # Differences, # Key Takeaways."
+)
+MERGE_PROMPT = (
+    "Each comparison below covers a different group of sources. Merge them into one comparison of all "
+    "sources {labels}. Keep the [number] labels, fold overlapping points together and stay concise. "
+    "Output Markdown with sections: # Similarities, # Differences, # Key Takeaways."
+)
+SUMMARY_VERSION = hashlib.sha1(SUMMARY_PROMPT.encode("utf-8")).hexdigest()[:8]
+
+_cache_lock = threading.Lock()
+
+
+def resolve_settings(config):
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(config.get("compare", {}))
+    return settings
+
+
+def _language_line(lang):
+    return f" Write in {LANGUAGE_MAP[lang]}." if lang in LANGUAGE_MAP else ""
+
+
+def summarize_media(client, model_id, media_file, title, lang=None):
+    response = generate_quietly(
         client,
         model_id,
-        contents=[media_file, prompt],
+        contents=[media_file, SUMMARY_PROMPT + _language_line(lang)],
         config=types.GenerateContentConfig(temperature=0.3),
         message=f"Summarizing {title}",
     )
     return response.text
 
 
-def run_compare(a, b, *, config, lang, include_timestamps, with_transcript):
+def catalog_entries(output_root):
+    entries = {}
+    for entry in read_json(os.path.join(output_root, "index.json"), default={"items": []}).get("items", []):
+        entries[entry.get("path")] = entry
+    return list(entries.values())
+
+
+def _match(title, query):
+    title = (title or "").lower()
+    if any(ch in query for ch in "*?["):
+        return fnmatch.fnmatch(title, query)
+    return query in title
+
+
+def resolve_inputs(inputs, config):
+    output_root = config["paths"]["output_dir"]
+    catalog = catalog_entries(output_root)
+    items = []
+    seen = set()
+
+    def add(item):
+        key = item["sha256"] or item["output_dir"] or item["path"]
+        if key in seen:
+            return
+        seen.add(key)
+        items.append(item)
+
+    for value in inputs:
+        if value.startswith("catalog:"):
+            query = value[len("catalog:") :].strip().lower()
+            matches = [entry for entry in catalog if _match(entry.get("title"), query)]
+            if not matches:
+                print(f"No catalog entries match '{query}'.")
+            for entry in matches:
+                add({"label": entry["title"], "source": value, "path": None, "output_dir": entry["path"], "sha256": entry.get("sha256")})
+            continue
+        if "youtube.com/" in value or "youtu.be/" in value:
+            value = download_youtube_audio(value, output_root)
+        title = os.path.splitext(os.path.basename(value))[0]
+        output_dir = os.path.join(output_root, f"{safe_filename(title)}_results")
+        # analyze_audio moves processed sources into their output folder.
+        path = next((p for p in (value, os.path.join(output_dir, os.path.basename(value))) if os.path.isfile(p)), None)
+        sha256 = file_sha256(path) if path else None
+        for entry in catalog:
+            if sha256 and entry.get("sha256") == sha256:
+                output_dir = entry["path"]
+        add({"label": title, "source": value, "path": path, "output_dir": output_dir, "sha256": sha256})
+    return items
+
+
+def existing_report(output_dir, lang):
+    if not output_dir or not os.path.isdir(output_dir):
+        return None
+    names = sorted(name for name in os.listdir(output_dir) if name.endswith("_report.md"))
+    for preferred in (f"_professional_{lang}_report.md", "_professional_", f"_{lang}_report.md", ""):
+        for name in names:
+            if preferred in name:
+                with open(os.path.join(output_dir, name), "r", encoding="utf-8") as f:
+                    return f.read()
+    return None
+
+
+def _cache_path(config):
+    return os.path.join(config["paths"]["output_dir"], ".cache", "compare_summaries.json")
+
+
+def _cache_key(item, lang):
+    return f"{item['sha256']}:{lang}:{SUMMARY_VERSION}" if item["sha256"] else None
+
+
+def _store_summary(config, key, summary):
+    path = _cache_path(config)
+    with _cache_lock:
+        cache = read_json(path, default={})
+        cache[key] = summary
+        ensure_dir(os.path.dirname(path))
+        write_json(path + ".tmp", cache)
+        os.replace(path + ".tmp", path)
+
+
+def _summarize_upload(client, model_id, item, config, lang, job_key):
+    path = item["path"]
+    display_name = os.path.basename(path)
+    myfile = get_existing_file(client, display_name)
+    if not myfile:
+        myfile = client.files.upload(file=path, config={"display_name": display_name})
+    registry = uploads.get_registry(config)
+    registry.track(myfile, path, job_key, item["sha256"])
+    try:
+        active = filestate.wait_until_active(client, myfile, config, size_bytes=os.path.getsize(path))
+        return summarize_media(client, model_id, active, item["label"], lang)
+    finally:
+        registry.release(client, myfile.name, job_key)
+
+
+def collect_summaries(client, model_id, items, config, lang, settings):
+    cache = read_json(_cache_path(config), default={})
+    job_key = "compare:" + "|".join(sorted(str(item["sha256"] or item["path"]) for item in items))
+    todo = []
+    for item in items:
+        key = _cache_key(item, lang)
+        report = existing_report(item["output_dir"], lang) if settings["reuse_reports"] else None
+        if key and key in cache:
+            item.update(summary=cache[key], origin="cache")
+        elif report:
+            item.update(summary=report, origin="report")
+        elif item["path"]:
+            todo.append(item)
+        else:
+            print(f"No audio or report found for {item['label']}; skipping.")
+            item.update(summary=None, origin="missing")
+
+    def task(item):
+        def run():
+            return _summarize_upload(client, model_id, item, config, lang, job_key)
+
+        return run
+
+    summaries = run_in_parallel([task(item) for item in todo], settings["concurrency"])
+    for item, summary in zip(todo, summaries):
+        item.update(summary=summary, origin="model")
+        if _cache_key(item, lang):
+            _store_summary(config, _cache_key(item, lang), summary)
+    return [item for item in items if item["summary"]]
+
+
+def group_entries(entries, group_size, max_chars):
+    groups = []
+    current = []
+    size = 0
+    for entry in entries:
+        if current and (len(current) >= group_size or size + len(entry["text"]) > max_chars):
+            groups.append(current)
+            current = []
+            size = 0
+        current.append(entry)
+        size += len(entry["text"])
+    if current:
+        # A lone trailing summary has nothing to be compared with; fold it into the previous group.
+        if len(current) == 1 and groups and size + sum(len(e["text"]) for e in groups[-1]) <= max_chars:
+            groups[-1].extend(current)
+        else:
+            groups.append(current)
+    return groups
+
+
+def build_comparison(entries, generate, settings, lang=None):
+    # entries: [{"labels": ["[1] Title"], "text": summary}]; generate(contents, message) -> text.
+    per_entry = max(1000, settings["max_group_chars"] // max(2, settings["group_size"]))
+    entries = [dict(entry, text=entry["text"][:per_entry]) for entry in entries]
+
+    def compare(group):
+        def run():
+            labels = [label for entry in group for label in entry["labels"]]
+            contents = [COMPARE_PROMPT.format(count=len(group)) + _language_line(lang)]
+            contents += [f"Summary {entry['labels'][0]}:\n{entry['text']}" for entry in group]
+            return {"labels": labels, "text": generate(contents, f"Comparing {', '.join(labels)}")}
+
+        return run
+
+    def merge(pair):
+        def run():
+            labels = [label for entry in pair for label in entry["labels"]]
+            contents = [MERGE_PROMPT.format(labels=", ".join(labels)) + _language_line(lang)]
+            contents += [f"Comparison of {', '.join(entry['labels'])}:\n{entry['text']}" for entry in pair]
+            return {"labels": labels, "text": generate(contents, f"Merging {len(labels)} sources")}
+
+        return run
+
+    groups = group_entries(entries, settings["group_size"], settings["max_group_chars"])
+    level = run_in_parallel([compare(group) for group in groups], settings["concurrency"])
+    tree = [[entry["labels"] for entry in level]]
+    while len(level) > 1:
+        pairs = [level[i : i + 2] for i in range(0, len(level), 2)]
+        level = run_in_parallel(
+            [merge(pair) if len(pair) == 2 else (lambda entry=pair[0]: entry) for pair in pairs], settings["concurrency"]
+        )
+        tree.append([entry["labels"] for entry in level])
+    return level[0]["text"], tree
+
+
+def _output_name(items):
+    labels = [safe_filename(item["label"]) for item in items]
+    if len(labels) <= 3:
+        return "_vs_".join(labels)
+    return f"{labels[0]}_vs_{len(labels) - 1}_more"
+
+
+def run_compare(inputs, *, config, lang, include_timestamps, with_transcript):
     output_root = config["paths"]["output_dir"]
     ensure_dir(output_root)
-    if "youtube.com/" in a or "youtu.be/" in a:
-        a = download_youtube_audio(a, output_root)
-    if "youtube.com/" in b or "youtu.be/" in b:
-        b = download_youtube_audio(b, output_root)
-
-    client = genai.Client(
-        api_key=os.getenv("GEMINI_API_KEY"),
-        http_options=types.HttpOptions(timeout=1800000),
-    )
-    model_id = config["models"]["text"]
-
-    def upload(path):
-        display_name = os.path.basename(path)
-        myfile = get_existing_file(client, display_name)
-        if not myfile:
-            myfile = client.files.upload(file=path, config={"display_name": display_name})
-        while True:
-            myfile = client.files.get(name=myfile.name)
-            if myfile.state.name == "ACTIVE":
-                return myfile
-            if myfile.state.name == "FAILED":
-                raise RuntimeError("Processing failed.")
-            time.sleep(5)
-
-    file_a = upload(a)
-    file_b = upload(b)
-
-    summary_a = summarize_media(client, model_id, file_a, os.path.basename(a))
-    summary_b = summarize_media(client, model_id, file_b, os.path.basename(b))
-
-    compare_prompt = (
-        "Compare these two summaries. Highlight similarities, differences, and key contrasts. "
-        "Output Markdown with sections: # Similarities, # Differences, # Key Takeaways."
-    )
-    response = generate_with_progress(
-        client,
-        model_id,
-        contents=[compare_prompt, f"Summary A:\n{summary_a}", f"Summary B:\n{summary_b}"],
-        config=types.GenerateContentConfig(temperature=0.3),
-        message="Generating Comparison Report",
+    settings = resolve_settings(config)
+    items = resolve_inputs(inputs, config)
+    if len(items) < 2:
+        print("Comparison mode requires at least two inputs.")
+        return None
+
+    client = clients.get_client(config)
+    model_id = routing.model_chain(config, "compare")[0]
+    items = collect_summaries(client, model_id, items, config, lang, settings)
+    if len(items) < 2:
+        print("Fewer than two inputs could be summarized; nothing to compare.")
+        return None
+    for i, item in enumerate(items, 1):
+        item["number"] = f"[{i}] {item['label']}"
+
+    def generate(contents, message):
+        return generate_quietly(
+            client, model_id, contents=contents, config=types.GenerateContentConfig(temperature=0.3), message=message
+        ).text
+
+    report, tree = build_comparison(
+        [{"labels": [item["number"]], "text": item["summary"]} for item in items], generate, settings, lang
     )
 
-    base = f"{safe_filename(os.path.splitext(os.path.basename(a))[0])}_vs_{safe_filename(os.path.splitext(os.path.basename(b))[0])}"
-    output_dir = os.path.join(output_root, f"{base}_comparison")
+    output_dir = os.path.join(output_root, f"{_output_name(items)}_comparison")
     ensure_dir(output_dir)
     out_path = os.path.join(output_dir, "comparison_report.md")
     with open(out_path, "w", encoding="utf-8") as f:
-        f.write(response.text)
+        f.write(report)
+    write_json(
+        os.path.join(output_dir, "sources.json"),
+        {
+            "sources": [
+                {"label": item["number"], "source": item["source"], "output_dir": item["output_dir"], "summary": item["origin"]}
+                for item in items
+            ],
+            "levels": tree,
+        },
+    )
     print(f"Comparison report saved: {out_path}")
+    return out_path
@@ -12,10 +12,13 @@ DEFAULT_CONFIG = {
     "models": {
         "text": "gemini-3-pro-preview",
         "audio": "gemini-2.5-flash-preview-tts",
+        "routes": {},
+        "latency_budget_seconds": {},
     },
     "cost": {
         "tokens_per_minute": 1500,
         "usd_per_1k_tokens": 0.01,
+        "models": {},
     },
     "reports": {
         "professional": {
@@ -30,6 +33,137 @@ DEFAULT_CONFIG = {
     "plugins": {
         "enabled": [],
         "config": {},
+        "dispatch": {
+            "queue_size": 100,
+            "enqueue_timeout_seconds": 1,
+            "timeout_seconds": 60,
+            "max_retries": 2,
+            "retry_delay_seconds": 5,
+        },
+        "digest": {
+            "enabled": False,
+            "plugins": ["email", "telegram"],
+            "window_seconds": 300,
+            "max_items": 50,
+        },
+    },
+    "preprocess": {
+        "enabled": False,
+        "codec": "opus",
+        "bitrate": "32k",
+        "sample_rate": 16000,
+        "channels": 1,
+        "trim_silence": False,
+        "compact_silence": False,
+        "silence_threshold_db": -50,
+        "min_silence_seconds": 2.0,
+        "padding_seconds": 0.25,
+        "cache_dir": None,
+    },
+    "http": {
+        "timeout_ms": 1800000,
+        "max_connections": 100,
+        "max_keepalive_connections": 20,
+        "keepalive_seconds": 30,
+    },
+    "languages": {
+        "pivot": None,
+        "mode": "translate",
+        "concurrency": 4,
+    },
+    "uploads": {
+        "delete_after_success": True,
+        "pin": [],
+        "refresh_margin_seconds": 10800,
+        "stale_job_seconds": 86400,
+        "gc_interval_seconds": 600,
+    },
+    "file_state": {
+        "min_interval_seconds": 1.0,
+        "max_interval_seconds": 30.0,
+        "seconds_per_mb": 0.3,
+        "backoff": 1.5,
+        "list_threshold": 4,
+        "coalesce_seconds": 0.5,
+        "wait_slack_seconds": 60,
+    },
+    "breakers": {
+        "failure_threshold": 5,
+        "reset_seconds": 60,
+        "half_open_calls": 1,
+        "max_parks": 10,
+        "overrides": {},
+    },
+    "rate_limit": {
+        "requests_per_minute": 0,
+    },
+    "hedging": {
+        "enabled": False,
+        "percentile": 95,
+        "min_samples": 20,
+        "default_threshold_seconds": None,
+        "max_fraction": 0.1,
+    },
+    "context_cache": {
+        "enabled": False,
+        "min_ttl_seconds": 300,
+        "seconds_per_call": 120,
+        "max_ttl_seconds": 3600,
+        "cached_discount": 0.75,
+    },
+    "streaming": {
+        "enabled": True,
+    },
+    "async": {
+        "enabled": False,
+        "max_in_flight": 64,
+        "tts_concurrency": 4,
+    },
+    "prompts": {
+        "reload_seconds": 2,
+    },
+    "compare": {
+        "concurrency": 4,
+        "group_size": 4,
+        "max_group_chars": 60000,
+        "reuse_reports": True,
+    },
+    "export": {
+        "workers": 0,
+        "skip_unchanged": True,
+    },
+    "dedup": {
+        "enabled": False,
+        "threshold": 0.75,
+        "sample_rate": 2000,
+        "hop_ms": 50,
+        "max_seconds": 900,
+        "min_overlap_seconds": 60,
+        "max_duration_ratio": 1.5,
+    },
+    "scheduler": {
+        "capacity": 8,
+        "default_priority": "batch",
+        "weights": {"interactive": 8, "watch": 4, "batch": 2, "backfill": 1},
+        "preempt": ["interactive"],
+        "max_yield_seconds": 300,
+    },
+    "workers": {
+        "store": "sqlite",
+        "path": None,
+        "lease_seconds": 120,
+        "heartbeat_seconds": 30,
+        "poll_seconds": 5,
+        "max_attempts": 3,
+        "retry_delay_seconds": 60,
+        "exit_when_idle": False,
+    },
+    "batch": {
+        "order": "input",
+        "concurrency": 1,
+        "probe_workers": 8,
+        "job_overhead_seconds": 60,
+        "seconds_per_audio_minute": 6,
     },
     "paths": {
         "output_dir": "output",
@@ -82,16 +216,20 @@ def load_config(path):
     return DEFAULT_CONFIG
 
 
-def resolve_prompt(prompt_spec, base_dir):
+def prompt_path(prompt_spec, base_dir):
     if isinstance(prompt_spec, dict) and "file" in prompt_spec:
         path = prompt_spec["file"]
-        if not os.path.isabs(path):
-            path = os.path.join(base_dir, path)
+        return path if os.path.isabs(path) else os.path.join(base_dir, path)
+    if isinstance(prompt_spec, str) and prompt_spec.strip().endswith(".md") and os.path.exists(prompt_spec):
+        return prompt_spec
+    return None
+
+
+def resolve_prompt(prompt_spec, base_dir):
+    path = prompt_path(prompt_spec, base_dir)
+    if path:
         with open(path, "r", encoding="utf-8") as f:
             return f.read()
     if isinstance(prompt_spec, str):
-        if prompt_spec.strip().endswith(".md") and os.path.exists(prompt_spec):
-            with open(prompt_spec, "r", encoding="utf-8") as f:
-                return f.read()
         return prompt_spec
     return ""
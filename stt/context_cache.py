@@ -0,0 +1,139 @@
+import contextvars
+from contextlib import contextmanager
+
+from google.genai import types
+
+from stt import metrics, tracing
+
+
+CACHE_ERRORS = ["cachedcontent", "cached_content", "cached content", "cache not found", "cache expired"]
+
+_job_caches = contextvars.ContextVar("stt_job_caches", default=None)
+
+
+def ttl_seconds(planned_calls, config):
+    cache_cfg = config.get("context_cache", {})
+    ttl = cache_cfg.get("min_ttl_seconds", 300) + planned_calls * cache_cfg.get("seconds_per_call", 120)
+    return int(min(ttl, cache_cfg.get("max_ttl_seconds", 3600)))
+
+
+def _is_cache_error(error):
+    return any(x in str(error).lower() for x in CACHE_ERRORS)
+
+
+class MediaCache:
+    def __init__(self, client, model, media_file, name, ttl):
+        self.client = client
+        self.model = model
+        self.media_file = media_file
+        self.name = name
+        self.ttl = ttl
+        self.active = True
+
+    def rewrite(self, model, contents, config):
+        if not self.active or model != self.model:
+            return contents, config
+        if not isinstance(contents, (list, tuple)) or not any(c is self.media_file for c in contents):
+            return contents, config
+        contents = [c for c in contents if c is not self.media_file]
+        if config is None:
+            config = types.GenerateContentConfig(cached_content=self.name)
+        else:
+            config = config.model_copy(update={"cached_content": self.name})
+        return contents, config
+
+    def _call(self, fn, model, contents, config):
+        cached_contents, cached_config = self.rewrite(model, contents, config)
+        if cached_config is config:
+            return fn(contents, config)
+        try:
+            return fn(cached_contents, cached_config)
+        except Exception as e:
+            if not _is_cache_error(e):
+                raise
+            print(f"   Warning: context cache unavailable ({e}); sending audio inline.")
+            self.active = False
+            return fn(contents, config)
+
+    def wrap_generator(self, generator):
+        def generate(client, model, contents, config, message, **kwargs):
+            return self._call(
+                lambda c, cfg: generator(client, model, contents=c, config=cfg, message=message, **kwargs),
+                model,
+                contents,
+                config,
+            )
+
+        return generate
+
+    def wrap_streamer(self, streamer):
+        def stream(client, model, contents, config, message, output_path, **kwargs):
+            return self._call(
+                lambda c, cfg: streamer(client, model, c, cfg, message, output_path, **kwargs),
+                model,
+                contents,
+                config,
+            )
+
+        return stream
+
+    def delete(self):
+        self.active = False
+        try:
+            self.client.caches.delete(name=self.name)
+        except Exception as e:
+            print(f"   Warning: could not delete context cache {self.name}: {e}")
+
+
+def create_media_cache(client, model, media_file, planned_calls, config):
+    ttl = ttl_seconds(planned_calls, config)
+    with tracing.span("cache", "create", ttl_seconds=ttl, planned_calls=planned_calls):
+        try:
+            cached = client.caches.create(
+                model=model,
+                config=types.CreateCachedContentConfig(
+                    contents=[media_file],
+                    ttl=f"{ttl}s",
+                    display_name=getattr(media_file, "display_name", None) or "stt-media",
+                ),
+            )
+        except Exception as e:
+            print(f"   Context cache not created ({e}); sending audio with each prompt.")
+            return None
+    cache = MediaCache(client, model, media_file, cached.name, ttl)
+    caches = _job_caches.get()
+    if caches is not None:
+        caches.append(cache)
+    print(f"Context cache ready ({cached.name}, TTL {ttl}s).")
+    return cache
+
+
+def cached_tokens_in_trace(trace):
+    if trace is None:
+        return 0
+    return sum(record.get("cached_tokens", 0) for record in trace.to_json()["spans"])
+
+
+def estimated_savings(cached_tokens, model, config):
+    cost_cfg = config.get("cost", {})
+    pricing = cost_cfg.get("models", {}).get(model, {})
+    input_rate = pricing.get("input_per_1k", cost_cfg.get("usd_per_1k_tokens", 0.0))
+    discount = config.get("context_cache", {}).get("cached_discount", 0.75)
+    return (cached_tokens / 1000.0) * input_rate * discount
+
+
+@contextmanager
+def job_scope(config):
+    caches = []
+    token = _job_caches.set(caches)
+    try:
+        yield caches
+    finally:
+        _job_caches.reset(token)
+        for cache in caches:
+            cache.delete()
+        if caches:
+            cached_tokens = cached_tokens_in_trace(tracing.current_trace())
+            metrics.CACHED_TOKENS_TOTAL.inc(cached_tokens)
+            usd = estimated_savings(cached_tokens, caches[0].model, config)
+            print(f"Context cache: {cached_tokens} input tokens served from cache (~${usd:.4f} saved).")
@@ -2,37 +2,114 @@ import os
 import time
 import threading
 import json
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
-from google import genai
-from google.genai import types
 from tqdm import tqdm
 
-from stt.config import resolve_prompt
-from stt.utils import ensure_dir, read_json, write_json, safe_filename, get_audio_duration_seconds, estimate_tokens
+from stt import (
+    breaker,
+    clients,
+    context_cache,
+    fingerprint,
+    filestate,
+    hedging,
+    metrics,
+    preprocess,
+    probe,
+    prompts,
+    ratelimit,
+    routing,
+    scheduler,
+    streaming,
+    tracing,
+    uploads,
+    vad,
+)
+from stt.utils import (
+    ensure_dir,
+    read_json,
+    write_json,
+    safe_filename,
+    estimate_tokens,
+    file_sha256,
+    update_json,
+)
 from stt.generators.report import generate_transcript, generate_report, LANGUAGE_MAP
 from stt.generators.audio import text_to_speech
-from stt.generators import intelligence
-from stt.exporters import pdf as pdf_exporter
-from stt.exporters import docx as docx_exporter
+from stt.generators import intelligence, translate
+from stt.exporters import engine as export_engine
+from stt.plugins import dispatcher as plugin_dispatcher
 from stt.plugins.base import load_plugins
 
 
+def add_index_item(output_root, item):
+    # One row per results folder: a re-run replaces its earlier entry instead of appending another.
+    with update_json(os.path.join(output_root, "index.json"), default={"items": []}) as index:
+        index["items"] = [i for i in index.get("items", []) if i.get("path") != item["path"]]
+        index["items"].append(item)
+
+
+RETRYABLE_ERRORS = ["disconnect", "timeout", "reset", "connection"]
+
+
+@contextmanager
+def model_slot(gate, model):
+    gate.before_call()
+    scheduler.acquire()
+    metrics.MODEL_CALLS_IN_FLIGHT.inc()
+    try:
+        yield
+    except Exception as e:
+        gate.record(e)
+        metrics.MODEL_CALLS_TOTAL.inc(model=model, outcome="error")
+        raise
+    else:
+        gate.record_success()
+        metrics.MODEL_CALLS_TOTAL.inc(model=model, outcome="ok")
+    finally:
+        metrics.MODEL_CALLS_IN_FLIGHT.dec()
+        scheduler.release()
+
+
 def generate_with_retry(client, model, contents, config, max_retries=5):
+    gate = breaker.get(f"gemini:{model}")
+
+    def send():
+        response = client.models.generate_content(model=model, contents=contents, config=config)
+        tracing.add_usage(response, model)
+        return response
+
     for attempt in range(max_retries):
+        ratelimit.acquire()
         try:
-            return client.models.generate_content(model=model, contents=contents, config=config)
+            return hedging.call(send, slot=lambda: model_slot(gate, model))
         except Exception as e:
             error_msg = str(e).lower()
-            if any(x in error_msg for x in ["disconnect", "timeout", "reset", "connection"]):
-                wait_time = 10 * (attempt + 1)
-                print(f"   Warning: Attempt {attempt+1}/{max_retries} failed: {e}")
-                if attempt < max_retries - 1:
-                    print(f"   Retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
-                    raise
-            else:
+            if not any(x in error_msg for x in RETRYABLE_ERRORS):
+                raise
+            wait_time = 10 * (attempt + 1)
+            print(f"   Warning: Attempt {attempt+1}/{max_retries} failed: {e}")
+            if attempt == max_retries - 1:
                 raise
+            metrics.RETRIES_TOTAL.inc(operation="generate")
+            print(f"   Retrying in {wait_time}s...")
+        # The slot is already released here; back off without holding it so other jobs can use it.
+        time.sleep(wait_time)
+
+
+def generate_quietly(client, model, contents, config, message, max_retries=5):
+    print(f"- {message}...")
+    return generate_with_retry(client, model, contents, config, max_retries)
+
+
+def run_in_parallel(tasks, workers):
+    if not tasks:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(tasks)))) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, task) for task in tasks]
+        return [future.result() for future in futures]
 
 
 def show_progress(message, stop_event):
@@ -46,6 +123,9 @@ def show_progress(message, stop_event):
 
 
 def generate_with_progress(client, model, contents, config, message, max_retries=5):
+    if getattr(client, "is_async_bridge", False):
+        print(f"- {message}...")
+        return generate_with_retry(client, model, contents, config, max_retries)
     stop_event = threading.Event()
     spinner_thread = threading.Thread(target=show_progress, args=(message, stop_event))
     spinner_thread.start()
@@ -56,6 +136,31 @@ def generate_with_progress(client, model, contents, config, message, max_retries
         spinner_thread.join()
 
 
+def stream_with_progress(client, model, contents, config, message, output_path, max_retries=5):
+    with tqdm(desc=message, unit="ch", unit_scale=True, leave=False) as bar:
+        return streaming.stream_to_file(
+            client,
+            model,
+            contents,
+            config,
+            output_path,
+            label=message,
+            max_retries=max_retries,
+            on_chunk=lambda event: bar.update(len(event["text"])),
+        )
+
+
+def _planned_model_calls(config, checkpoint, report_keys, with_transcript):
+    intel = config["intelligence"]
+    calls = len(report_keys if report_keys is not None else config["defaults"].get("reports", ["professional", "children"]))
+    if with_transcript and not checkpoint.get("transcript_done"):
+        calls += 1
+    if intel.get("enabled", True) and not checkpoint.get("intelligence_done"):
+        features = ["content_type_detection", "key_quotes", "fact_check", "follow_up_questions", "related_content", "knowledge_graph"]
+        calls += sum(1 for feature in features if intel.get(feature, True))
+    return calls
+
+
 def get_existing_file(client, filename):
     print("Checking cloud cache...", end="")
     try:
@@ -76,7 +181,7 @@ def get_existing_file(client, filename):
 
 
 def estimate_cost(path, config):
-    duration = get_audio_duration_seconds(path)
+    duration = probe.probe_duration(path, config)
     tokens = estimate_tokens(duration, config["cost"]["tokens_per_minute"])
     if tokens is None:
         return {"duration_seconds": None, "tokens": None, "usd": None}
@@ -84,6 +189,19 @@ def estimate_cost(path, config):
     return {"duration_seconds": duration, "tokens": tokens, "usd": usd}
 
 
+def results_dir(output_root, audio_path):
+    base_filename = os.path.splitext(os.path.basename(audio_path))[0]
+    return os.path.join(output_root, f"{safe_filename(base_filename)}_results")
+
+
+def resolve_source(audio_path, output_root):
+    # The first attempt moves a local source into its results folder; retries still carry the original path.
+    if os.path.exists(audio_path):
+        return audio_path
+    moved = os.path.join(results_dir(output_root, audio_path), os.path.basename(audio_path))
+    return moved if os.path.exists(moved) else audio_path
+
+
 def analyze_audio(
     audio_path,
     *,
@@ -95,6 +213,54 @@ def analyze_audio(
     tts_enabled,
     export_formats,
     dry_run,
+    translate_to=None,
+):
+    audio_path = resolve_source(audio_path, config["paths"]["output_dir"])
+    owns_trace = tracing.current_trace() is None
+    if owns_trace and not dry_run:
+        tracing.start_trace(os.path.basename(audio_path))
+    if not dry_run:
+        metrics.JOBS_IN_PROGRESS.inc()
+    result = None
+    parked = False
+    try:
+        with context_cache.job_scope(config):
+            result = _analyze_audio(
+                audio_path,
+                config=config,
+                lang=lang,
+                include_timestamps=include_timestamps,
+                with_transcript=with_transcript,
+                report_keys=report_keys,
+                tts_enabled=tts_enabled,
+                export_formats=export_formats,
+                dry_run=dry_run,
+                translate_to=translate_to,
+            )
+        return result
+    except breaker.CircuitOpenError:
+        parked = True
+        raise
+    finally:
+        if not dry_run:
+            metrics.JOBS_IN_PROGRESS.dec()
+            metrics.JOBS_TOTAL.inc(status="parked" if parked else "succeeded" if result else "failed")
+        if owns_trace and not dry_run:
+            tracing.finish_trace()
+
+
+def _analyze_audio(
+    audio_path,
+    *,
+    config,
+    lang,
+    include_timestamps,
+    with_transcript,
+    report_keys,
+    tts_enabled,
+    export_formats,
+    dry_run,
+    translate_to=None,
 ):
     if not os.path.exists(audio_path):
         print(f"Error: File '{audio_path}' not found.")
@@ -111,8 +277,11 @@ def analyze_audio(
     display_name = os.path.basename(audio_path)
     base_filename = os.path.splitext(display_name)[0]
     output_root = config["paths"]["output_dir"]
-    output_dir = os.path.join(output_root, f"{safe_filename(base_filename)}_results")
+    output_dir = results_dir(output_root, audio_path)
     ensure_dir(output_dir)
+    trace = tracing.current_trace()
+    if trace is not None:
+        trace.output_dir = output_dir
 
     source_in_folder = os.path.join(output_dir, display_name)
     if not os.path.exists(source_in_folder) and os.path.exists(audio_path):
@@ -122,15 +291,67 @@ def analyze_audio(
     checkpoint_path = os.path.join(output_dir, "checkpoint.json")
     checkpoint = read_json(checkpoint_path, default={})
 
-    client = genai.Client(
-        api_key=os.getenv("GEMINI_API_KEY"),
-        http_options=types.HttpOptions(timeout=1800000),
-    )
+    source_stat = os.stat(source_in_folder)
+    source_key = [source_stat.st_size, int(source_stat.st_mtime)]
+    if checkpoint.get("source_key") != source_key or not checkpoint.get("source_sha256"):
+        with tracing.span("hash", bytes=source_stat.st_size):
+            checkpoint["source_sha256"] = file_sha256(source_in_folder)
+        checkpoint["source_key"] = source_key
+        write_json(checkpoint_path, checkpoint)
+
+    if config.get("dedup", {}).get("enabled", False):
+        with tracing.span("fingerprint", bytes=source_stat.st_size):
+            duplicate = fingerprint.find_duplicate(
+                source_in_folder, checkpoint["source_sha256"], output_dir, config, title=base_filename
+            )
+        if duplicate:
+            fingerprint.link_duplicate(output_dir, duplicate)
+            add_index_item(
+                output_root,
+                {
+                    "title": base_filename,
+                    "path": output_dir,
+                    "sha256": checkpoint["source_sha256"],
+                    "duplicate_of": duplicate["output_dir"],
+                },
+            )
+            return duplicate["output_dir"]
+
+    upload_path = source_in_folder
+    upload_name = display_name
+    prepared = None
+    offset_map = []
+    if config.get("preprocess", {}).get("enabled", False):
+        with tracing.span("preprocess", bytes=source_stat.st_size):
+            prepared = preprocess.preprocess_audio(source_in_folder, checkpoint["source_sha256"], config)
+        if prepared:
+            upload_path = prepared["path"]
+            upload_name = os.path.basename(upload_path)
+            offset_map = prepared.get("offset_map", [])
+            if offset_map:
+                write_json(os.path.join(output_dir, "offset_map.json"), offset_map)
+            print(
+                f"Pre-processed audio{' (cached)' if prepared['cached'] else ''}: "
+                f"{prepared['source_bytes'] / 1e6:.1f} MB -> {prepared['processed_bytes'] / 1e6:.1f} MB"
+            )
+    upload_bytes = os.path.getsize(upload_path)
+    if checkpoint.get("uploaded_source", display_name) != upload_name:
+        checkpoint.pop("uploaded_file_name", None)
+
+    client = clients.get_client(config)
 
     model_id = config["models"]["text"]
     audio_model_id = config["models"]["audio"]
+    streamer = stream_with_progress if config.get("streaming", {}).get("enabled", True) else None
 
+    upload_registry = uploads.get_registry(config)
+    job_key = output_dir
     myfile = checkpoint.get("uploaded_file_name")
+    if myfile:
+        myfile = upload_registry.current_name(myfile)
+        if upload_registry.expiring(myfile):
+            print("Checkpointed upload expires soon; re-uploading.")
+            myfile = None
     if myfile:
         try:
             myfile = client.files.get(name=myfile)
@@ -138,80 +359,114 @@ def analyze_audio(
             myfile = None
 
     if not myfile:
-        myfile = get_existing_file(client, display_name)
+        myfile = get_existing_file(client, upload_name)
         if not myfile:
-            print(f"Uploading: {source_in_folder} ...")
+            scheduler.stage_boundary()
+            print(f"Uploading: {upload_path} ...")
             max_upload_retries = 3
             for attempt in range(max_upload_retries):
                 try:
-                    start_upload = time.time()
-                    myfile = client.files.upload(file=source_in_folder, config={"display_name": display_name})
-                    upload_elapsed = int(time.time() - start_upload)
+                    with tracing.span("upload", bytes=upload_bytes, attempt=attempt + 1):
+                        start_upload = time.time()
+                        myfile = breaker.call(
+                            "gemini:files",
+                            lambda: client.files.upload(file=upload_path, config={"display_name": upload_name}),
+                        )
+                        upload_seconds = time.time() - start_upload
+                        upload_elapsed = int(upload_seconds)
+                    metrics.UPLOAD_BYTES_TOTAL.inc(upload_bytes)
                     print(f"Upload successful: {myfile.name}")
                     print(f"Upload time: {upload_elapsed}s")
+                    if prepared and upload_bytes:
+                        seconds_saved = prepared["saved_bytes"] * upload_seconds / upload_bytes
+                        print(
+                            f"Pre-processing saved {prepared['saved_bytes'] / 1e6:.1f} MB "
+                            f"(~{seconds_saved:.0f}s of upload time)"
+                        )
+                        checkpoint["preprocess"] = {
+                            "saved_bytes": prepared["saved_bytes"],
+                            "upload_seconds_saved": round(seconds_saved, 1),
+                        }
                     checkpoint["uploaded_file_name"] = myfile.name
+                    checkpoint["uploaded_source"] = upload_name
                     write_json(checkpoint_path, checkpoint)
                     break
+                except breaker.CircuitOpenError:
+                    raise
                 except Exception as e:
                     print(f"   Warning: Upload attempt {attempt+1} failed: {e}")
                     if attempt == max_upload_retries - 1:
                         print(f"Upload failed permanently after {max_upload_retries} attempts.")
                         return
+                    metrics.RETRIES_TOTAL.inc(operation="upload")
                     time.sleep(5)
 
+    upload_registry.track(myfile, upload_path, job_key, checkpoint.get("source_sha256"))
     print("Waiting for Google to process audio...")
-    processing_start = time.time()
-    processing_timeout = config.get("timeouts", {}).get("processing_seconds", 1200)
     reupload_on_fail = config.get("timeouts", {}).get("reupload_on_fail", True)
-    with tqdm(total=100, bar_format="{desc}: {bar} {elapsed}", desc="Processing") as pbar:
-        while True:
-            myfile = client.files.get(name=myfile.name)
-            if myfile.state.name == "ACTIVE":
-                pbar.update(100 - pbar.n)
-                break
-            if myfile.state.name == "FAILED":
-                print("\nProcessing failed.")
-                if reupload_on_fail:
-                    print("Deleting failed file and re-uploading once...")
-                    try:
-                        client.files.delete(name=myfile.name)
-                    except Exception:
-                        pass
-                    checkpoint.pop("uploaded_file_name", None)
-                    write_json(checkpoint_path, checkpoint)
-                    return analyze_audio(
-                        audio_path,
-                        config=config,
-                        lang=lang,
-                        include_timestamps=include_timestamps,
-                        with_transcript=with_transcript,
-                        report_keys=report_keys,
-                        tts_enabled=tts_enabled,
-                        export_formats=export_formats,
-                        dry_run=dry_run,
-                    )
-                return
-            elapsed = time.time() - processing_start
-            if elapsed > processing_timeout:
-                print(f"\nProcessing timeout after {int(elapsed)}s.")
-                return
-            if pbar.n < 90:
-                pbar.update(5)
-            time.sleep(5)
+    with tracing.span("processing"):
+        try:
+            myfile = filestate.wait_until_active(client, myfile, config, size_bytes=upload_bytes)
+        except filestate.FileProcessingFailed:
+            print("Processing failed.")
+            if reupload_on_fail:
+                print("Deleting failed file and re-uploading once...")
+                try:
+                    client.files.delete(name=myfile.name)
+                except Exception:
+                    pass
+                upload_registry.forget(myfile.name)
+                checkpoint.pop("uploaded_file_name", None)
+                write_json(checkpoint_path, checkpoint)
+                return _analyze_audio(
+                    audio_path,
+                    config=config,
+                    lang=lang,
+                    include_timestamps=include_timestamps,
+                    with_transcript=with_transcript,
+                    report_keys=report_keys,
+                    tts_enabled=tts_enabled,
+                    export_formats=export_formats,
+                    dry_run=dry_run,
+                    translate_to=translate_to,
+                )
+            return
+        except TimeoutError as e:
+            print(str(e))
+            return
+    print("Processing complete.")
 
     plugins = load_plugins(config["plugins"].get("enabled", []), config["plugins"].get("config", {}))
-    context = {"title": base_filename, "output_dir": output_dir}
-    for plugin in plugins:
-        plugin.on_start(context)
-
-    prompts_dir = config["paths"]["prompts_dir"]
+    context = {
+        "title": base_filename,
+        "output_dir": output_dir,
+        "output_root": output_root,
+        "source_sha256": checkpoint.get("source_sha256"),
+    }
+    plugin_dispatcher.emit(plugins, "on_start", context)
+
+    prompt_registry = prompts.get_registry(config)
     report_texts = {}
     content_type_json = None
     content_type_value = None
 
+    router = routing.Router(config)
+    generator = generate_with_progress
+    if config.get("context_cache", {}).get("enabled", False):
+        planned_calls = _planned_model_calls(config, checkpoint, report_keys, with_transcript)
+        if planned_calls > 1:
+            media_cache = context_cache.create_media_cache(client, router.model("report"), myfile, planned_calls, config)
+            if media_cache is not None:
+                generator = media_cache.wrap_generator(generator)
+                if streamer is not None:
+                    streamer = media_cache.wrap_streamer(streamer)
+
     if config["intelligence"].get("enabled", True) and config["intelligence"].get("content_type_detection", True):
         if config["intelligence"].get("auto_select_reports", False) or report_keys is None:
-            content_type_json = intelligence.detect_content_type(client, model_id, generate_with_progress, myfile)
+            with tracing.span("intelligence", "content_type"):
+                content_type_json = intelligence.detect_content_type(
+                    client, model_id, router.wrap("content_type", generator, "content_type.json"), myfile
+                )
             try:
                 parsed = json.loads(content_type_json)
                 content_type_value = parsed.get("type")
@@ -228,12 +483,28 @@ def analyze_audio(
     if with_transcript and not checkpoint.get("transcript_done"):
         transcript_path = os.path.join(output_dir, f"{base_filename}_transcript.md")
         if not os.path.exists(transcript_path):
-            generate_transcript(client, model_id, myfile, generate_with_progress, transcript_path)
+            with tracing.span("transcript"):
+                generate_transcript(
+                    client,
+                    model_id,
+                    myfile,
+                    router.wrap("transcript", generator, os.path.basename(transcript_path)),
+                    transcript_path,
+                    streamer=router.wrap_streamer("transcript", streamer),
+                )
+            vad.remap_timestamps_in_file(transcript_path, offset_map)
         checkpoint["transcript_done"] = True
         write_json(checkpoint_path, checkpoint)
 
+    translate_to = [other for other in (translate_to or []) if other != lang]
+    languages_cfg = config.get("languages", {})
+    translated = {other: {} for other in translate_to}
+
+    def lang_report_path(report_key, report_lang):
+        return os.path.join(output_dir, f"{base_filename}_{report_key}_{report_lang}_report.md")
+
     for report_key in report_keys:
-        report_path = os.path.join(output_dir, f"{base_filename}_{report_key}_{lang}_report.md")
+        report_path = lang_report_path(report_key, lang)
         if os.path.exists(report_path):
             with open(report_path, "r", encoding="utf-8") as f:
                 report_texts[report_key] = f.read()
@@ -242,57 +513,164 @@ def analyze_audio(
         report_cfg = config["reports"].get(report_key)
         if not report_cfg:
             continue
-        template = resolve_prompt(report_cfg.get("prompt"), prompts_dir)
-        text = generate_report(
-            client,
-            model_id,
-            myfile,
-            generate_with_progress,
-            template,
-            report_key,
-            lang,
-            include_timestamps,
-            report_cfg.get("temperature", 0.3),
-            report_path,
-        )
+        template = prompt_registry.template(report_key)
+        prompt, prompt_sha256 = prompt_registry.render(report_key, lang, include_timestamps)
+        checkpoint.setdefault("prompt_hashes", {})[f"{report_key}:{lang}"] = prompt_sha256
+        if translate_to and languages_cfg.get("mode", "translate") == "structured":
+            with tracing.span("report", report_key, lang=",".join([lang] + translate_to), prompt=prompt_sha256[:12]):
+                texts = translate.generate_multilang_report(
+                    client,
+                    model_id,
+                    myfile,
+                    router.wrap("report", generator, os.path.basename(report_path)),
+                    template,
+                    report_key,
+                    [lang] + translate_to,
+                    include_timestamps,
+                    report_cfg.get("temperature", 0.3),
+                    base_prompt=prompt,
+                )
+            if texts:
+                for text_lang, text in texts.items():
+                    text = vad.remap_timestamps(text, offset_map)
+                    with open(lang_report_path(report_key, text_lang), "w", encoding="utf-8") as f:
+                        f.write(text)
+                    if text_lang == lang:
+                        report_texts[report_key] = text
+                    else:
+                        translated[text_lang][report_key] = text
+                    plugin_dispatcher.emit(plugins, "on_report", context, report_key, lang_report_path(report_key, text_lang))
+                continue
+            print("Multi-language response could not be parsed; falling back to translation.")
+        with tracing.span("report", report_key, lang=lang, prompt=prompt_sha256[:12]):
+            text = generate_report(
+                client,
+                model_id,
+                myfile,
+                router.wrap("report", generator, os.path.basename(report_path)),
+                template,
+                report_key,
+                lang,
+                include_timestamps,
+                report_cfg.get("temperature", 0.3),
+                report_path,
+                streamer=router.wrap_streamer("report", streamer),
+                prompt=prompt,
+            )
+        if not vad.is_identity(offset_map):
+            vad.remap_timestamps_in_file(report_path, offset_map)
+            text = vad.remap_timestamps(text, offset_map)
         report_texts[report_key] = text
-        for plugin in plugins:
-            plugin.on_report(context, report_key, report_path)
-
-    if "children" in report_texts and tts_enabled and not checkpoint.get("tts_done"):
-        audio_file = os.path.join(output_dir, f"{base_filename}_children_{lang}_audio.mp3")
-        if not os.path.exists(audio_file):
-            language_name = LANGUAGE_MAP.get(lang, "English")
-            text_to_speech(client, audio_model_id, report_texts["children"], audio_file, language_name)
-        checkpoint["tts_done"] = True
-        write_json(checkpoint_path, checkpoint)
+        plugin_dispatcher.emit(plugins, "on_report", context, report_key, report_path)
+
+    translation_jobs = []
+    for other in translate_to:
+        for report_key, text in report_texts.items():
+            if report_key in translated[other]:
+                continue
+            path = lang_report_path(report_key, other)
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    translated[other][report_key] = f.read()
+                continue
+            translation_jobs.append((report_key, other, text, path))
+
+    def translate_one(job):
+        report_key, other, text, path = job
+
+        def run():
+            with tracing.span("translate", report_key, lang=other):
+                return translate.translate_report(
+                    client,
+                    model_id,
+                    router.wrap("translate", generate_quietly, os.path.basename(path)),
+                    text,
+                    report_key,
+                    other,
+                    path,
+                )
+
+        return run
+
+    translated_texts = run_in_parallel(
+        [translate_one(job) for job in translation_jobs], languages_cfg.get("concurrency", 4)
+    )
+    for (report_key, other, _, path), text in zip(translation_jobs, translated_texts):
+        translated[other][report_key] = text
+        plugin_dispatcher.emit(plugins, "on_report", context, report_key, path)
+
+    # Tracked per language so a re-run that adds a language still synthesizes it; older checkpoints
+    # only have tts_done, which covered the pivot language.
+    tts_langs = set(checkpoint.get("tts_langs") or ([lang] if checkpoint.get("tts_done") else []))
+    if tts_enabled:
+        children_texts = {lang: report_texts.get("children")}
+        children_texts.update({other: translated[other].get("children") for other in translate_to})
+        children_texts = {k: v for k, v in children_texts.items() if v and k not in tts_langs}
+        tts_jobs = []
+        for tts_lang, children_text in children_texts.items():
+            audio_file = os.path.join(output_dir, f"{base_filename}_children_{tts_lang}_audio.mp3")
+            if os.path.exists(audio_file):
+                continue
+            tts_jobs.append(
+                lambda text=children_text, path=audio_file, name=LANGUAGE_MAP.get(tts_lang, "English"): text_to_speech(
+                    client,
+                    audio_model_id,
+                    text,
+                    path,
+                    name,
+                    concurrency=config.get("async", {}).get("tts_concurrency", 4),
+                )
+            )
+        run_in_parallel(tts_jobs, len(tts_jobs))
+        if children_texts:
+            checkpoint["tts_langs"] = sorted(tts_langs | set(children_texts))
+            write_json(checkpoint_path, checkpoint)
 
     if config["intelligence"].get("enabled", True) and not checkpoint.get("intelligence_done"):
         if config["intelligence"].get("content_type_detection", True):
             if content_type_json is None:
-                content_type_json = intelligence.detect_content_type(client, model_id, generate_with_progress, myfile)
+                with tracing.span("intelligence", "content_type"):
+                    content_type_json = intelligence.detect_content_type(
+                        client, model_id, router.wrap("content_type", generator, "content_type.json"), myfile
+                    )
             with open(os.path.join(output_dir, "content_type.json"), "w", encoding="utf-8") as f:
                 f.write(content_type_json)
         if config["intelligence"].get("key_quotes", True):
-            quotes = intelligence.extract_key_quotes(client, model_id, generate_with_progress, myfile, lang)
+            with tracing.span("intelligence", "key_quotes"):
+                quotes = intelligence.extract_key_quotes(
+                    client, model_id, router.wrap("key_quotes", generator, "key_quotes.md"), myfile, lang
+                )
+            quotes = vad.remap_timestamps(quotes, offset_map)
             with open(os.path.join(output_dir, "key_quotes.md"), "w", encoding="utf-8") as f:
                 f.write(quotes)
         if config["intelligence"].get("fact_check", True):
-            flags = intelligence.fact_check_flags(client, model_id, generate_with_progress, myfile, lang)
+            with tracing.span("intelligence", "fact_check"):
+                flags = intelligence.fact_check_flags(
+                    client, model_id, router.wrap("fact_check", generator, "fact_check.md"), myfile, lang
+                )
             with open(os.path.join(output_dir, "fact_check.md"), "w", encoding="utf-8") as f:
                 f.write(flags)
         if config["intelligence"].get("follow_up_questions", True):
-            questions = intelligence.follow_up_questions(client, model_id, generate_with_progress, myfile, lang)
+            with tracing.span("intelligence", "follow_up_questions"):
+                questions = intelligence.follow_up_questions(
+                    client, model_id, router.wrap("follow_up_questions", generator, "follow_up_questions.md"), myfile, lang
+                )
             with open(os.path.join(output_dir, "follow_up_questions.md"), "w", encoding="utf-8") as f:
                 f.write(questions)
         if config["intelligence"].get("related_content", True):
             history_index = read_json(os.path.join(output_root, "index.json"), default={"items": []})
             titles = [i.get("title", "") for i in history_index.get("items", [])]
-            related = intelligence.related_content(client, model_id, generate_with_progress, myfile, lang, titles)
+            with tracing.span("intelligence", "related_content"):
+                related = intelligence.related_content(
+                    client, model_id, router.wrap("related_content", generator, "related_content.md"), myfile, lang, titles
+                )
             with open(os.path.join(output_dir, "related_content.md"), "w", encoding="utf-8") as f:
                 f.write(related)
         if config["intelligence"].get("knowledge_graph", True):
-            entities_json = intelligence.extract_entities(client, model_id, generate_with_progress, myfile)
+            with tracing.span("intelligence", "entities"):
+                entities_json = intelligence.extract_entities(
+                    client, model_id, router.wrap("entities", generator, "entities.json"), myfile
+                )
             with open(os.path.join(output_dir, "entities.json"), "w", encoding="utf-8") as f:
                 f.write(entities_json)
             try:
@@ -307,24 +685,41 @@ def analyze_audio(
         write_json(checkpoint_path, checkpoint)
 
     if export_formats:
-        primary_text = report_texts.get("professional") or next(iter(report_texts.values()), "")
-        if "pdf" in export_formats:
-            pdf_exporter.export_pdf(primary_text, os.path.join(output_dir, f"{base_filename}.pdf"))
-        if "docx" in export_formats:
-            docx_exporter.export_docx(primary_text, os.path.join(output_dir, f"{base_filename}.docx"))
+        rendered_formats = [fmt for fmt in export_formats if fmt in export_engine.FORMATS]
+        if rendered_formats:
+            with tracing.span("export", ",".join(rendered_formats)):
+                export_engine.export_reports(output_dir, rendered_formats, config)
         if "notion" in export_formats:
-            from stt.exporters.notion import export_notion
-            export_notion(primary_text, config.get("notion", {}))
+            from stt.exporters import notion as notion_exporter
+            # A Notion failure must not cost the finished job its index entry or the upload release below.
+            try:
+                with tracing.span("export", "notion"):
+                    notion_exporter.export_reports(
+                        output_dir,
+                        notion_exporter.settings_from(config),
+                        base_filename,
+                        sha256=checkpoint.get("source_sha256"),
+                        output_root=output_root,
+                    )
+            except Exception as e:
+                print(f"Export notion failed for {output_dir}: {e}")
+
+    if router.used:
+        router.write(output_dir)
 
-    index_path = os.path.join(output_root, "index.json")
-    index = read_json(index_path, default={"items": []})
-    index["items"].append({"title": base_filename, "path": output_dir})
-    write_json(index_path, index)
+    add_index_item(output_root, {"title": base_filename, "path": output_dir, "sha256": checkpoint.get("source_sha256")})
+    if config.get("dedup", {}).get("enabled", False):
+        fingerprint.remember(config, output_dir)
 
     context["primary_report_text"] = report_texts.get("professional") or next(iter(report_texts.values()), "")
-    for plugin in plugins:
-        plugin.on_complete(context)
+    plugin_dispatcher.emit(plugins, "on_complete", context)
+
+    if upload_registry.release(client, myfile.name, job_key):
+        print(f"Deleted uploaded file {myfile.name}.")
+        checkpoint.pop("uploaded_file_name", None)
+        write_json(checkpoint_path, checkpoint)
 
     print("\n" + "=" * 30)
     print(f"SUCCESS: All files located in '{output_dir}/'")
     print("=" * 30)
+    return output_dir
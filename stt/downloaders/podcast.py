@@ -1,6 +1,6 @@
 import os
-import requests
 
+from stt import clients, metrics
 from stt.utils import ensure_dir, read_json, write_json, safe_filename
 
 
@@ -43,7 +43,7 @@ def download_enclosure(entry, target_dir):
     if os.path.exists(path):
         return path
 
-    resp = requests.get(enclosure_url, stream=True, timeout=60)
+    resp = clients.get_http_session().get(enclosure_url, stream=True, timeout=60)
     resp.raise_for_status()
     with open(path, "wb") as f:
         for chunk in resp.iter_content(chunk_size=1024 * 1024):
@@ -74,9 +74,16 @@ def process_feeds(feeds_path, output_dir):
             entry_id = entry.get("id") or entry.get("link")
             if entry_id in seen_ids:
                 continue
-            file_path = download_enclosure(entry, output_dir)
+            try:
+                file_path = download_enclosure(entry, output_dir)
+            except Exception:
+                metrics.FEED_EPISODES_TOTAL.inc(outcome="failed")
+                raise
             if file_path:
+                metrics.FEED_EPISODES_TOTAL.inc(outcome="downloaded")
                 new_files.append(file_path)
+            else:
+                metrics.FEED_EPISODES_TOTAL.inc(outcome="no_enclosure")
             if entry_id:
                 seen_ids.add(entry_id)
 
@@ -1 +1 @@
-__all__ = ["markdown", "pdf", "docx", "notion"]
+__all__ = ["markdown", "pdf", "docx", "html", "notion"]
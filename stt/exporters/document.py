@@ -0,0 +1,184 @@
+import re
+from urllib.parse import urlsplit
+
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+RULE_RE = re.compile(r"^\s{0,3}([-*_])(\s*\1){2,}\s*$")
+LIST_RE = re.compile(r"^(\s*)([-*+]|\d+[.)])\s+(.*)$")
+QUOTE_RE = re.compile(r"^\s{0,3}>\s?(.*)$")
+FENCE_RE = re.compile(r"^\s{0,3}(```|~~~)\s*(\S*)")
+TABLE_SEPARATOR_RE = re.compile(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+INLINE_RE = re.compile(
+    r"`([^`]+)`"
+    r"|\[([^\]]+)\]\(([^)\s]+)\)"
+    r"|\*\*(.+?)\*\*"
+    r"|__(.+?)__"
+    r"|\*(?!\s)(.+?)\*"
+    r"|(?<!\w)_(?!\s)(.+?)_(?!\w)"
+)
+CJK_RE = re.compile(r"[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]")
+KANA_RE = re.compile(r"[\u3040-\u30ff]")
+HANGUL_RE = re.compile(r"[\uac00-\ud7af]")
+# Links come from model output; renderers drop anything else (javascript:, data:, relative, #anchor) and keep the text.
+SAFE_SCHEMES = {"http", "https", "mailto"}
+
+
+def safe_href(link):
+    try:
+        scheme = urlsplit(link.strip()).scheme.lower()
+    except ValueError:
+        return None
+    return link.strip() if scheme in SAFE_SCHEMES else None
+
+
+def _span(text, bold=False, italic=False, code=False, link=None):
+    return {"text": text, "bold": bold, "italic": italic, "code": code, "link": link}
+
+
+def parse_inline(text, bold=False, italic=False, link=None):
+    spans = []
+    pos = 0
+    for match in INLINE_RE.finditer(text):
+        if match.start() > pos:
+            spans.append(_span(text[pos : match.start()], bold, italic, link=link))
+        code, link_text, href, strong, strong_alt, em, em_alt = match.groups()
+        if code is not None:
+            spans.append(_span(code, bold, italic, code=True, link=link))
+        elif link_text is not None:
+            spans.extend(parse_inline(link_text, bold, italic, href))
+        elif strong is not None or strong_alt is not None:
+            spans.extend(parse_inline(strong if strong is not None else strong_alt, True, italic, link))
+        else:
+            spans.extend(parse_inline(em if em is not None else em_alt, bold, True, link))
+        pos = match.end()
+    if pos < len(text):
+        spans.append(_span(text[pos:], bold, italic, link=link))
+    return spans
+
+
+def _join(lines):
+    text = ""
+    for line in lines:
+        line = line.strip()
+        if not text:
+            text = line
+        elif CJK_RE.match(line[:1]) and CJK_RE.match(text[-1:]):
+            text += line
+        else:
+            text += " " + line
+    return text
+
+
+def _table_cells(line):
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|"):
+        line = line[:-1]
+    return [parse_inline(cell.strip()) for cell in line.split("|")]
+
+
+def parse_markdown(text):
+    blocks = []
+    paragraph = []
+    lines = text.replace("\r\n", "\n").split("\n")
+
+    def flush():
+        if paragraph:
+            blocks.append({"type": "paragraph", "spans": parse_inline(_join(paragraph))})
+            paragraph.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        fence = FENCE_RE.match(line)
+        if fence:
+            flush()
+            code = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith(fence.group(1)):
+                code.append(lines[i])
+                i += 1
+            blocks.append({"type": "code", "language": fence.group(2), "text": "\n".join(code)})
+            i += 1
+            continue
+        if not line.strip():
+            flush()
+            i += 1
+            continue
+        heading = HEADING_RE.match(line)
+        if heading:
+            flush()
+            blocks.append({"type": "heading", "level": len(heading.group(1)), "spans": parse_inline(heading.group(2))})
+            i += 1
+            continue
+        if RULE_RE.match(line) and not paragraph:
+            blocks.append({"type": "rule"})
+            i += 1
+            continue
+        if line.lstrip().startswith("|") and i + 1 < len(lines) and TABLE_SEPARATOR_RE.match(lines[i + 1]):
+            flush()
+            rows = [_table_cells(line)]
+            i += 2
+            while i < len(lines) and lines[i].lstrip().startswith("|"):
+                rows.append(_table_cells(lines[i]))
+                i += 1
+            blocks.append({"type": "table", "rows": rows})
+            continue
+        item = LIST_RE.match(line)
+        if item:
+            flush()
+            ordered = item.group(2)[0].isdigit()
+            indent = len(item.group(1).replace("\t", "    "))
+            current = blocks[-1] if blocks and blocks[-1]["type"] == "list" and blocks[-1].get("open") else None
+            if current is None or (indent < 2 and current["ordered"] != ordered):
+                blocks.append({"type": "list", "ordered": ordered, "items": [], "open": True})
+            blocks[-1]["items"].append({"level": min(indent // 2, 5), "ordered": ordered, "lines": [item.group(3)]})
+            i += 1
+            continue
+        quote = QUOTE_RE.match(line)
+        if quote:
+            flush()
+            quoted = []
+            while i < len(lines) and QUOTE_RE.match(lines[i]):
+                quoted.append(QUOTE_RE.match(lines[i]).group(1))
+                i += 1
+            blocks.append({"type": "quote", "spans": parse_inline(_join(quoted))})
+            continue
+        if blocks and blocks[-1]["type"] == "list" and blocks[-1].get("open") and line.startswith((" ", "\t")):
+            blocks[-1]["items"][-1]["lines"].append(line)
+            i += 1
+            continue
+        if blocks and blocks[-1].get("open"):
+            blocks[-1]["open"] = False
+        paragraph.append(line)
+        i += 1
+    flush()
+
+    for block in blocks:
+        if block["type"] == "list":
+            block.pop("open", None)
+            for entry in block["items"]:
+                entry["spans"] = parse_inline(_join(entry.pop("lines")))
+    return {"title": document_title(blocks), "script": detect_script(text), "blocks": blocks}
+
+
+def plain_text(spans):
+    return "".join(span["text"] for span in spans)
+
+
+def document_title(blocks):
+    for block in blocks:
+        if block["type"] == "heading":
+            return plain_text(block["spans"])
+    return None
+
+
+def detect_script(text):
+    if KANA_RE.search(text):
+        return "ja"
+    if HANGUL_RE.search(text):
+        return "ko"
+    if CJK_RE.search(text):
+        return "zh"
+    return "latin"
@@ -1,10 +1,106 @@
+EAST_ASIA_FONTS = {"zh": "SimSun", "ja": "MS Mincho", "ko": "Malgun Gothic"}
+
+
+def _set_east_asia_font(style, font_name):
+    from docx.oxml.ns import qn
+
+    rpr = style.element.get_or_add_rPr()
+    rfonts = rpr.find(qn("w:rFonts"))
+    if rfonts is None:
+        rfonts = rpr.makeelement(qn("w:rFonts"), {})
+        rpr.append(rfonts)
+    rfonts.set(qn("w:eastAsia"), font_name)
+
+
+def _add_runs(paragraph, spans):
+    from docx.shared import RGBColor
+
+    for span in spans:
+        run = paragraph.add_run(span["text"])
+        run.bold = span["bold"] or None
+        run.italic = span["italic"] or None
+        if span["code"]:
+            run.font.name = "Courier New"
+        if span["link"]:
+            run.underline = True
+            run.font.color.rgb = RGBColor(0x1A, 0x0D, 0xAB)
+
+
+def _list_style(document, ordered, level):
+    name = "List Number" if ordered else "List Bullet"
+    if level:
+        nested = f"{name} {min(level + 1, 3)}"
+        if nested in [style.name for style in document.styles]:
+            return nested
+    return name
+
+
+def _add_rule(paragraph):
+    from docx.oxml.ns import qn
+
+    ppr = paragraph._p.get_or_add_pPr()
+    border = ppr.makeelement(qn("w:pBdr"), {})
+    bottom = border.makeelement(qn("w:bottom"), {qn("w:val"): "single", qn("w:sz"): "6", qn("w:space"): "1", qn("w:color"): "999999"})
+    border.append(bottom)
+    ppr.append(border)
+
+
+def render(document, output_path):
+    from docx import Document
+    from docx.shared import Pt
+
+    doc = Document()
+    if document.get("title"):
+        doc.core_properties.title = document["title"]
+    font_name = EAST_ASIA_FONTS.get(document.get("script"))
+    if font_name:
+        for style in doc.styles:
+            if style.type == 1:
+                _set_east_asia_font(style, font_name)
+    for block in document["blocks"]:
+        kind = block["type"]
+        if kind == "heading":
+            heading = doc.add_heading(level=min(block["level"], 9))
+            _add_runs(heading, block["spans"])
+        elif kind == "paragraph":
+            _add_runs(doc.add_paragraph(), block["spans"])
+        elif kind == "list":
+            for item in block["items"]:
+                _add_runs(doc.add_paragraph(style=_list_style(doc, item["ordered"], item["level"])), item["spans"])
+        elif kind == "quote":
+            _add_runs(doc.add_paragraph(style="Quote"), block["spans"])
+        elif kind == "code":
+            paragraph = doc.add_paragraph()
+            for i, line in enumerate(block["text"].split("\n")):
+                run = paragraph.add_run()
+                if i:
+                    run.add_break()
+                run.add_text(line)
+                run.font.name = "Courier New"
+                run.font.size = Pt(9)
+        elif kind == "rule":
+            _add_rule(doc.add_paragraph())
+        elif kind == "table":
+            rows = block["rows"]
+            columns = max(len(row) for row in rows)
+            table = doc.add_table(rows=len(rows), cols=columns)
+            table.style = "Table Grid"
+            for r, row in enumerate(rows):
+                for c, cell in enumerate(row):
+                    paragraph = table.cell(r, c).paragraphs[0]
+                    _add_runs(paragraph, cell)
+                    if r == 0:
+                        for run in paragraph.runs:
+                            run.bold = True
+    doc.save(output_path)
+
+
 def export_docx(text, output_path):
     try:
-        from docx import Document
+        import docx  # noqa: F401
     except ImportError:
         print("python-docx not installed. Install with 'pip install python-docx' to export DOCX.")
         return
-    doc = Document()
-    for line in text.splitlines():
-        doc.add_paragraph(line)
-    doc.save(output_path)
+    from stt.exporters.document import parse_markdown
+
+    render(parse_markdown(text), output_path)
@@ -0,0 +1,175 @@
+import atexit
+import hashlib
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from stt import metrics
+from stt.exporters.document import parse_markdown
+from stt.utils import read_json, write_json
+
+
+FORMATS = {"pdf": ".pdf", "docx": ".docx", "html": ".html"}
+REQUIREMENTS = {"pdf": ("reportlab", "reportlab"), "docx": ("docx", "python-docx"), "html": (None, None)}
+RENDER_VERSION = 1
+MANIFEST_NAME = ".exports.json"
+REPORT_SUFFIX = "_report.md"
+
+DEFAULT_SETTINGS = {
+    "workers": 0,
+    "skip_unchanged": True,
+}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def resolve_settings(config):
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(config.get("export", {}))
+    return settings
+
+
+def render_job(fmt, document, output_path):
+    module = importlib.import_module(f"stt.exporters.{fmt}")
+    partial = output_path + ".part"
+    try:
+        module.render(document, partial)
+        os.replace(partial, output_path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return output_path
+
+
+def _shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def get_pool(settings):
+    global _pool
+    workers = int(settings.get("workers") or 0) or os.cpu_count() or 1
+    if workers <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            try:
+                _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            except (OSError, NotImplementedError) as e:
+                print(f"Export process pool unavailable ({e}); rendering serially.")
+                return None
+            atexit.register(_shutdown_pool)
+        return _pool
+
+
+def available_formats(formats):
+    available = []
+    for fmt in formats:
+        if fmt not in FORMATS:
+            continue
+        module, package = REQUIREMENTS[fmt]
+        if module:
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                print(f"{package} not installed. Install with 'pip install {package}' to export {fmt.upper()}.")
+                continue
+        available.append(fmt)
+    return available
+
+
+def find_reports(output_dir):
+    return sorted(
+        name for name in os.listdir(output_dir) if name.endswith(REPORT_SUFFIX) and os.path.isfile(os.path.join(output_dir, name))
+    )
+
+
+def _plan(output_dir, formats, settings):
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    manifest = read_json(manifest_path, default={})
+    jobs = []
+    skipped = []
+    for name in find_reports(output_dir):
+        with open(os.path.join(output_dir, name), "r", encoding="utf-8") as f:
+            text = f.read()
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        entry = manifest.get(name, {})
+        stem = name[: -len(".md")]
+        document = None
+        for fmt in formats:
+            output_path = os.path.join(output_dir, stem + FORMATS[fmt])
+            done = entry.get("formats", {}).get(fmt, {})
+            if (
+                settings["skip_unchanged"]
+                and done.get("sha256") == digest
+                and done.get("version") == RENDER_VERSION
+                and os.path.exists(output_path)
+            ):
+                skipped.append((name, fmt))
+                continue
+            if document is None:
+                document = parse_markdown(text)
+            jobs.append({"report": name, "format": fmt, "sha256": digest, "output_path": output_path, "document": document})
+    return manifest_path, manifest, jobs, skipped
+
+
+def export_dirs(output_dirs, formats, config):
+    settings = resolve_settings(config)
+    formats = available_formats(formats)
+    summary = {"rendered": 0, "skipped": 0, "failed": 0}
+    if not formats:
+        return summary
+
+    plans = [_plan(output_dir, formats, settings) for output_dir in output_dirs if os.path.isdir(output_dir)]
+    jobs = [job for _, _, plan_jobs, _ in plans for job in plan_jobs]
+    for _, _, _, skipped in plans:
+        for _, fmt in skipped:
+            metrics.EXPORTS_TOTAL.inc(format=fmt, outcome="skipped")
+        summary["skipped"] += len(skipped)
+
+    pool = get_pool(settings) if len(jobs) > 1 else None
+    if pool is not None:
+        futures = [pool.submit(render_job, job["format"], job["document"], job["output_path"]) for job in jobs]
+    for i, job in enumerate(jobs):
+        try:
+            if pool is not None:
+                futures[i].result()
+            else:
+                render_job(job["format"], job["document"], job["output_path"])
+            job["ok"] = True
+        except Exception as e:
+            print(f"Export {job['format']} failed for {job['output_path']}: {e}")
+            job["ok"] = False
+
+    for manifest_path, manifest, plan_jobs, _ in plans:
+        for job in plan_jobs:
+            outcome = "rendered" if job["ok"] else "failed"
+            metrics.EXPORTS_TOTAL.inc(format=job["format"], outcome=outcome)
+            summary[outcome] += 1
+            if job["ok"]:
+                entry = manifest.setdefault(job["report"], {"formats": {}})
+                entry["formats"][job["format"]] = {"sha256": job["sha256"], "version": RENDER_VERSION}
+        if plan_jobs:
+            write_json(manifest_path, manifest)
+    return summary
+
+
+def export_reports(output_dir, formats, config):
+    return export_dirs([output_dir], formats, config)
+
+
+def export_tree(output_root, formats, config):
+    output_dirs = []
+    for root, dirs, files in os.walk(output_root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        if any(name.endswith(REPORT_SUFFIX) for name in files):
+            output_dirs.append(root)
+    summary = export_dirs(output_dirs, formats, config)
+    summary["directories"] = len(output_dirs)
+    return summary
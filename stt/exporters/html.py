@@ -0,0 +1,84 @@
+import html
+
+from stt.exporters.document import safe_href
+
+
+STYLE = """
+body { font-family: -apple-system, "Segoe UI", "Noto Sans", "Noto Sans CJK SC", "Hiragino Sans", sans-serif;
+       max-width: 760px; margin: 40px auto; padding: 0 16px; line-height: 1.6; color: #222; }
+code, pre { font-family: "SFMono-Regular", Consolas, monospace; background: #f5f5f5; }
+pre { padding: 12px; overflow-x: auto; }
+blockquote { margin: 0; padding-left: 12px; border-left: 3px solid #ccc; color: #555; }
+table { border-collapse: collapse; }
+th, td { border: 1px solid #ccc; padding: 4px 8px; }
+"""
+
+LANG = {"zh": "zh", "ja": "ja", "ko": "ko", "latin": "en"}
+
+
+def render_spans(spans):
+    out = []
+    for span in spans:
+        text = html.escape(span["text"])
+        if span["code"]:
+            text = f"<code>{text}</code>"
+        if span["italic"]:
+            text = f"<em>{text}</em>"
+        if span["bold"]:
+            text = f"<strong>{text}</strong>"
+        href = safe_href(span["link"]) if span["link"] else None
+        if href:
+            text = f'<a href="{html.escape(href, quote=True)}">{text}</a>'
+        out.append(text)
+    return "".join(out)
+
+
+def _render_list(items):
+    out = []
+    stack = []
+    for item in items:
+        while stack and stack[-1][0] > item["level"]:
+            out.append(f"</li></{stack.pop()[1]}>")
+        if stack and stack[-1][0] == item["level"]:
+            out.append("</li>")
+        else:
+            tag = "ol" if item["ordered"] else "ul"
+            out.append(f"<{tag}>")
+            stack.append((item["level"], tag))
+        out.append(f"<li>{render_spans(item['spans'])}")
+    while stack:
+        out.append(f"</li></{stack.pop()[1]}>")
+    return "".join(out)
+
+
+def render_html(document):
+    body = []
+    for block in document["blocks"]:
+        kind = block["type"]
+        if kind == "heading":
+            body.append(f"<h{block['level']}>{render_spans(block['spans'])}</h{block['level']}>")
+        elif kind == "paragraph":
+            body.append(f"<p>{render_spans(block['spans'])}</p>")
+        elif kind == "list":
+            body.append(_render_list(block["items"]))
+        elif kind == "quote":
+            body.append(f"<blockquote><p>{render_spans(block['spans'])}</p></blockquote>")
+        elif kind == "code":
+            body.append(f"<pre><code>{html.escape(block['text'])}</code></pre>")
+        elif kind == "rule":
+            body.append("<hr/>")
+        elif kind == "table":
+            rows = block["rows"]
+            head = "".join(f"<th>{render_spans(cell)}</th>" for cell in rows[0])
+            rest = "".join("<tr>" + "".join(f"<td>{render_spans(c)}</td>" for c in row) + "</tr>" for row in rows[1:])
+            body.append(f"<table><thead><tr>{head}</tr></thead><tbody>{rest}</tbody></table>")
+    title = html.escape(document.get("title") or "Report")
+    return (
+        f'<!DOCTYPE html>\n<html lang="{LANG.get(document.get("script"), "en")}">\n<head>\n<meta charset="utf-8"/>\n'
+        f"<title>{title}</title>\n<style>{STYLE}</style>\n</head>\n<body>\n" + "\n".join(body) + "\n</body>\n</html>\n"
+    )
+
+
+def render(document, output_path):
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(render_html(document))
@@ -1,17 +1,298 @@
-def export_notion(text, config):
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from stt import breaker, clients, metrics
+from stt.exporters.document import parse_markdown, safe_href
+from stt.ratelimit import TokenBucket
+from stt.utils import read_json, update_json
+
+
+DEFAULT_SETTINGS = {
+    "token": None,
+    "database_id": None,
+    "title_property": "Name",
+    "concurrency": 3,
+    "requests_per_second": 3,
+    "batch_size": 100,
+    "max_batch_bytes": 400000,
+    "base_url": None,
+}
+
+MAX_TEXT = 2000
+MAX_RICH_TEXT = 100
+CODE_LANGUAGES = {
+    "bash": "bash",
+    "sh": "shell",
+    "shell": "shell",
+    "c": "c",
+    "cpp": "c++",
+    "css": "css",
+    "go": "go",
+    "html": "html",
+    "java": "java",
+    "javascript": "javascript",
+    "js": "javascript",
+    "json": "json",
+    "markdown": "markdown",
+    "md": "markdown",
+    "python": "python",
+    "py": "python",
+    "rust": "rust",
+    "sql": "sql",
+    "typescript": "typescript",
+    "ts": "typescript",
+    "yaml": "yaml",
+    "yml": "yaml",
+}
+
+_buckets = {}
+_pages_lock = threading.Lock()
+
+
+def resolve_settings(config):
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update({k: v for k, v in (config or {}).items() if v is not None})
+    return settings
+
+
+def settings_from(config):
+    merged = dict(config.get("plugins", {}).get("config", {}).get("notion", {}))
+    merged.update(config.get("notion", {}))
+    return resolve_settings(merged)
+
+
+def rich_text(spans):
+    out = []
+    for span in spans:
+        text = span["text"]
+        for start in range(0, len(text), MAX_TEXT):
+            item = {"type": "text", "text": {"content": text[start : start + MAX_TEXT]}}
+            href = safe_href(span["link"]) if span["link"] else None
+            if href:
+                item["text"]["link"] = {"url": href}
+            annotations = {key: True for key in ("bold", "italic", "code") if span[key]}
+            if annotations:
+                item["annotations"] = annotations
+            out.append(item)
+    return out
+
+
+def _text_nodes(block_type, spans, extra=None):
+    items = rich_text(spans) or [{"type": "text", "text": {"content": ""}}]
+    nodes = []
+    for start in range(0, len(items), MAX_RICH_TEXT):
+        body = {"rich_text": items[start : start + MAX_RICH_TEXT]}
+        body.update(extra or {})
+        nodes.append({"block": {"object": "block", "type": block_type, block_type: body}, "children": []})
+    return nodes
+
+
+def _list_nodes(items):
+    roots = []
+    stack = []
+    for item in items:
+        block_type = "numbered_list_item" if item["ordered"] else "bulleted_list_item"
+        node = _text_nodes(block_type, item["spans"])[0]
+        while stack and stack[-1][0] >= item["level"]:
+            stack.pop()
+        (stack[-1][1]["children"] if stack else roots).append(node)
+        stack.append((item["level"], node))
+    return roots
+
+
+def _table_node(rows, batch_size):
+    width = max(len(row) for row in rows)
+    table_rows = [
+        {
+            "object": "block",
+            "type": "table_row",
+            "table_row": {"cells": [rich_text(cell)[:MAX_RICH_TEXT] for cell in row] + [[]] * (width - len(row))},
+        }
+        for row in rows
+    ]
+    # A table must be created with its rows; rows past the first batch are appended to it afterwards.
+    block = {
+        "object": "block",
+        "type": "table",
+        "table": {
+            "table_width": width,
+            "has_column_header": True,
+            "has_row_header": False,
+            "children": table_rows[: batch_size - 1],
+        },
+    }
+    return {"block": block, "children": [{"block": row, "children": []} for row in table_rows[batch_size - 1 :]]}
+
+
+def to_nodes(document, batch_size=100):
+    nodes = []
+    for block in document["blocks"]:
+        kind = block["type"]
+        if kind == "heading":
+            nodes.extend(_text_nodes(f"heading_{min(block['level'], 3)}", block["spans"]))
+        elif kind == "paragraph":
+            nodes.extend(_text_nodes("paragraph", block["spans"]))
+        elif kind == "list":
+            nodes.extend(_list_nodes(block["items"]))
+        elif kind == "quote":
+            nodes.extend(_text_nodes("quote", block["spans"]))
+        elif kind == "code":
+            spans = [{"text": block["text"], "bold": False, "italic": False, "code": False, "link": None}]
+            language = CODE_LANGUAGES.get(block["language"].lower(), "plain text")
+            nodes.extend(_text_nodes("code", spans, {"language": language}))
+        elif kind == "rule":
+            nodes.append({"block": {"object": "block", "type": "divider", "divider": {}}, "children": []})
+        elif kind == "table":
+            nodes.append(_table_node(block["rows"], batch_size))
+    return nodes
+
+
+def batches(nodes, batch_size=100, max_bytes=400000):
+    batch = []
+    size = 0
+    for node in nodes:
+        block = node["block"]
+        count = 1 + len(block.get(block["type"], {}).get("children", []))
+        node_bytes = len(json.dumps(block, ensure_ascii=False).encode("utf-8"))
+        if batch and (sum(c for _, c in batch) + count > batch_size or size + node_bytes > max_bytes):
+            yield [n for n, _ in batch]
+            batch = []
+            size = 0
+        batch.append((node, count))
+        size += node_bytes
+    if batch:
+        yield [n for n, _ in batch]
+
+
+def _bucket(settings):
+    rps = settings.get("requests_per_second") or 0
+    if not rps:
+        return None
+    with _pages_lock:
+        bucket = _buckets.get(rps)
+        if bucket is None:
+            bucket = TokenBucket(rps * 60, burst=max(1, int(rps)))
+            _buckets[rps] = bucket
+        return bucket
+
+
+def _request(settings, operation, fn):
+    bucket = _bucket(settings)
+    if bucket is not None:
+        bucket.acquire()
+    metrics.NOTION_REQUESTS_TOTAL.inc(operation=operation)
+    return breaker.call("notion", fn)
+
+
+def _append_children(client, settings, parent_id, nodes):
+    pending = []
+    for batch in batches(nodes, settings["batch_size"], settings["max_batch_bytes"]):
+        response = _request(
+            settings,
+            "append",
+            lambda: client.blocks.children.append(block_id=parent_id, children=[node["block"] for node in batch]),
+        )
+        for node, created in zip(batch, response.get("results", [])):
+            if node["children"]:
+                pending.append((created["id"], node["children"]))
+    return pending
+
+
+def append_tree(client, settings, work, pool):
+    # Batches under one parent go in order; different parents (pages, nested list items) go in parallel.
+    while work:
+        results = pool.map(lambda item: _append_children(client, settings, *item), work)
+        work = [pending for result in results for pending in result]
+
+
+def _list_children(client, settings, page_id):
+    block_ids = []
+    cursor = None
+    while True:
+        kwargs = {"block_id": page_id, "page_size": 100}
+        if cursor:
+            kwargs["start_cursor"] = cursor
+        response = _request(settings, "list", lambda: client.blocks.children.list(**kwargs))
+        block_ids.extend(block["id"] for block in response.get("results", []))
+        if not response.get("has_more"):
+            return block_ids
+        cursor = response.get("next_cursor")
+
+
+def _upsert_page(client, settings, pages, key, title):
+    from notion_client import APIResponseError
+
+    properties = {settings["title_property"]: {"title": [{"text": {"content": title[:MAX_TEXT]}}]}}
+    page_id = pages.get(key)
+    if page_id:
+        try:
+            page = _request(settings, "retrieve", lambda: client.pages.retrieve(page_id=page_id))
+        except APIResponseError as e:
+            if e.status != 404:
+                raise
+            page = None
+        if page and not (page.get("in_trash") or page.get("archived")):
+            _request(settings, "update", lambda: client.pages.update(page_id=page_id, properties=properties))
+            return page_id, _list_children(client, settings, page_id)
+    page = _request(
+        settings,
+        "create",
+        lambda: client.pages.create(parent={"database_id": settings["database_id"]}, properties=properties),
+    )
+    return page["id"], []
+
+
+def load_pages(path):
+    with _pages_lock:
+        return read_json(path, default={}) if path else {}
+
+
+def save_pages(path, updates):
+    if not path or not updates:
+        return
+    with _pages_lock, update_json(path) as pages:
+        pages.update(updates)
+
+
+def export_documents(items, settings, pages_path=None):
     try:
-        from notion_client import Client
+        import notion_client  # noqa: F401
     except ImportError:
         print("notion-client not installed. Install with 'pip install notion-client'.")
-        return
-    token = config.get("token")
-    database_id = config.get("database_id")
-    if not token or not database_id:
+        return {}
+    if not settings.get("token") or not settings.get("database_id"):
         print("Notion export missing token or database_id in config.")
-        return
-    client = Client(auth=token)
-    client.pages.create(
-        parent={"database_id": database_id},
-        properties={"Name": {"title": [{"text": {"content": "STT Report"}}]}},
-        children=[{"object": "block", "type": "paragraph", "paragraph": {"rich_text": [{"text": {"content": text[:2000]}}]}}],
-    )
+        return {}
+    client = clients.get_notion_client(settings["token"], settings.get("base_url"))
+    pages = load_pages(pages_path)
+    with ThreadPoolExecutor(max_workers=max(1, int(settings["concurrency"]))) as pool:
+        upserted = list(pool.map(lambda item: _upsert_page(client, settings, pages, item[0], item[1]), items))
+        exported = {item[0]: page_id for item, (page_id, _) in zip(items, upserted)}
+        save_pages(pages_path, exported)
+        stale = [block_id for _, block_ids in upserted for block_id in block_ids]
+        list(pool.map(lambda block_id: _request(settings, "delete", lambda: client.blocks.delete(block_id=block_id)), stale))
+        work = [(page_id, to_nodes(item[2], settings["batch_size"])) for item, (page_id, _) in zip(items, upserted)]
+        append_tree(client, settings, work, pool)
+    return exported
+
+
+def export_reports(output_dir, config, title, sha256=None, output_root=None):
+    settings = resolve_settings(config)
+    items = []
+    for name in sorted(os.listdir(output_dir)):
+        if not name.endswith("_report.md"):
+            continue
+        report_key = name[: -len("_report.md")]
+        if report_key.startswith(f"{title}_"):
+            report_key = report_key[len(title) + 1 :]
+        with open(os.path.join(output_dir, name), "r", encoding="utf-8") as f:
+            document = parse_markdown(f.read())
+        items.append((f"{sha256 or title}:{report_key}", f"{title} ({report_key})", document))
+    pages_path = os.path.join(output_root, ".cache", "notion_pages.json") if output_root else None
+    return export_documents(items, settings, pages_path)
+
+
+def export_notion(text, config, key=None, title="STT Report", pages_path=None):
+    return export_documents([(key or title, title, parse_markdown(text))], resolve_settings(config), pages_path)
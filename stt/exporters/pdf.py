@@ -1,18 +1,136 @@
+from xml.sax.saxutils import escape
+
+from stt.exporters.document import safe_href
+
+
+CJK_FONTS = {"zh": "STSong-Light", "ja": "HeiseiMin-W3", "ko": "HYSMyeongJo-Medium"}
+
+
+def _register_cjk_font(name):
+    from reportlab.lib.fonts import addMapping
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+
+    if name not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(UnicodeCIDFont(name))
+        # CID fonts have no bold/italic faces; map them to the regular face so <b>/<i> markup still renders.
+        for bold in (0, 1):
+            for italic in (0, 1):
+                addMapping(name, bold, italic, name)
+    return name
+
+
+def _markup(spans, code_font):
+    out = []
+    for span in spans:
+        text = escape(span["text"])
+        if span["code"]:
+            text = f'<font face="{code_font}">{text}</font>'
+        if span["italic"]:
+            text = f"<i>{text}</i>"
+        if span["bold"]:
+            text = f"<b>{text}</b>"
+        href = safe_href(span["link"]) if span["link"] else None
+        if href:
+            text = f'<a href="{escape(href, {chr(34): "&quot;"})}" color="blue">{text}</a>'
+        out.append(text)
+    return "".join(out)
+
+
+def _styles(script):
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
+    base = getSampleStyleSheet()
+    cjk_font = _register_cjk_font(CJK_FONTS[script]) if script in CJK_FONTS else None
+    extra = {"fontName": cjk_font, "wordWrap": "CJK"} if cjk_font else {}
+    styles = {
+        "body": ParagraphStyle("body", parent=base["BodyText"], leading=15, **extra),
+        "quote": ParagraphStyle("quote", parent=base["BodyText"], leftIndent=18, textColor="#555555", **extra),
+        "code": ParagraphStyle("code", parent=base["Code"], fontSize=8.5, leading=11, **({"fontName": cjk_font} if cjk_font else {})),
+        "cell": ParagraphStyle("cell", parent=base["BodyText"], fontSize=9, leading=11, **extra),
+    }
+    for level in range(1, 7):
+        styles[f"h{level}"] = ParagraphStyle(f"h{level}", parent=base[f"Heading{level}"], **extra)
+    for level in range(6):
+        styles[f"li{level}"] = ParagraphStyle(
+            f"li{level}", parent=styles["body"], leftIndent=18 * (level + 1), bulletIndent=18 * level + 4
+        )
+    return styles, cjk_font or "Courier"
+
+
+def _list_flowables(items, styles, code_font):
+    from reportlab.platypus import Paragraph
+
+    flowables = []
+    counters = {}
+    for item in items:
+        level = item["level"]
+        for deeper in [k for k in counters if k > level]:
+            counters.pop(deeper)
+        counters[level] = counters.get(level, 0) + 1
+        bullet = f"{counters[level]}." if item["ordered"] else "•"
+        flowables.append(Paragraph(_markup(item["spans"], code_font), styles[f"li{level}"], bulletText=bullet))
+    return flowables
+
+
+def render(document, output_path):
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.platypus import HRFlowable, Paragraph, Preformatted, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    styles, code_font = _styles(document.get("script"))
+    template = SimpleDocTemplate(
+        output_path,
+        pagesize=A4,
+        leftMargin=20 * mm,
+        rightMargin=20 * mm,
+        topMargin=18 * mm,
+        bottomMargin=18 * mm,
+        title=document.get("title") or "",
+    )
+    story = []
+    for block in document["blocks"]:
+        kind = block["type"]
+        if kind == "heading":
+            story.append(Paragraph(_markup(block["spans"], code_font), styles[f"h{block['level']}"]))
+        elif kind == "paragraph":
+            story.append(Paragraph(_markup(block["spans"], code_font), styles["body"]))
+        elif kind == "list":
+            story.extend(_list_flowables(block["items"], styles, code_font))
+            story.append(Spacer(1, 4))
+        elif kind == "quote":
+            story.append(Paragraph(_markup(block["spans"], code_font), styles["quote"]))
+        elif kind == "code":
+            story.append(Preformatted(block["text"], styles["code"], maxLineLength=95))
+        elif kind == "rule":
+            story.append(HRFlowable(width="100%", color=colors.lightgrey, spaceBefore=4, spaceAfter=4))
+        elif kind == "table":
+            columns = max(len(row) for row in block["rows"])
+            data = [
+                [Paragraph(_markup(cell, code_font), styles["cell"]) for cell in row] + [""] * (columns - len(row))
+                for row in block["rows"]
+            ]
+            table = Table(data, colWidths=[template.width / columns] * columns, repeatRows=1)
+            table.setStyle(
+                TableStyle(
+                    [
+                        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                        ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
+                        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                    ]
+                )
+            )
+            story.append(table)
+    template.build(story)
+
+
 def export_pdf(text, output_path):
     try:
-        from reportlab.lib.pagesizes import letter
-        from reportlab.pdfgen import canvas
+        import reportlab  # noqa: F401
     except ImportError:
         print("reportlab not installed. Install with 'pip install reportlab' to export PDF.")
         return
+    from stt.exporters.document import parse_markdown
 
-    c = canvas.Canvas(output_path, pagesize=letter)
-    width, height = letter
-    y = height - 50
-    for line in text.splitlines():
-        if y < 50:
-            c.showPage()
-            y = height - 50
-        c.drawString(50, y, line[:120])
-        y -= 14
-    c.save()
+    render(parse_markdown(text), output_path)
@@ -0,0 +1,158 @@
+import threading
+import time
+
+from stt import breaker, metrics
+
+
+DEFAULT_SETTINGS = {
+    "min_interval_seconds": 1.0,
+    "max_interval_seconds": 30.0,
+    "seconds_per_mb": 0.3,
+    "backoff": 1.5,
+    "list_threshold": 4,
+    "coalesce_seconds": 0.5,
+    "wait_slack_seconds": 60,
+}
+
+
+class FileProcessingFailed(RuntimeError):
+    pass
+
+
+class _Entry:
+    def __init__(self, name, size_bytes, timeout, settings):
+        self.name = name
+        self.started = time.time()
+        self.deadline = self.started + timeout
+        first = (size_bytes or 0) / 1e6 * settings["seconds_per_mb"]
+        self.interval = min(settings["max_interval_seconds"], max(settings["min_interval_seconds"], first))
+        self.next_poll = self.started + self.interval
+        self.polls = 0
+        self.file = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class FileStateWatcher:
+    def __init__(self, client, settings=None):
+        self.client = client
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update(settings or {})
+        self.entries = {}
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="stt-filestate", daemon=True)
+            self._thread.start()
+
+    def watch(self, name, size_bytes=None, timeout=1200):
+        with self._cond:
+            entry = self.entries.get(name)
+            if entry is None:
+                entry = _Entry(name, size_bytes, timeout, self.settings)
+                self.entries[name] = entry
+                metrics.FILES_PENDING.set(len(self.entries))
+            self._ensure_thread()
+            self._cond.notify()
+        return entry
+
+    def wait(self, name, size_bytes=None, timeout=1200):
+        entry = self.watch(name, size_bytes, timeout)
+        # Bounded even if the polling thread dies, so a job can never hang here.
+        if not entry.done.wait(max(0.0, entry.deadline - time.time()) + self.settings["wait_slack_seconds"]):
+            with self._cond:
+                if self.entries.get(name) is entry:
+                    self._finish(entry, error=TimeoutError(f"No file state for {name} before the deadline."))
+        if entry.error is not None:
+            raise entry.error
+        return entry.file
+
+    def _finish(self, entry, file=None, error=None):
+        entry.file = file
+        entry.error = error
+        self.entries.pop(entry.name, None)
+        metrics.FILES_PENDING.set(len(self.entries))
+        entry.done.set()
+
+    def _fetch(self, due):
+        if len(due) >= self.settings["list_threshold"]:
+            metrics.FILE_STATE_POLLS_TOTAL.inc(method="list")
+            wanted = {entry.name for entry in due}
+            return {f.name: f for f in breaker.call("gemini:files", self.client.files.list) if f.name in wanted}
+        found = {}
+        for entry in due:
+            metrics.FILE_STATE_POLLS_TOTAL.inc(method="get")
+            found[entry.name] = breaker.call("gemini:files", lambda: self.client.files.get(name=entry.name))
+        return found
+
+    def _poll(self, due):
+        try:
+            found = self._fetch(due)
+        except Exception as e:
+            found = {}
+            print(f"   Warning: file state poll failed: {e}")
+        now = time.time()
+        with self._cond:
+            for entry in due:
+                try:
+                    self._evaluate(entry, found.get(entry.name), now)
+                except Exception as e:
+                    self._finish(entry, error=e)
+
+    def _evaluate(self, entry, myfile, now):
+        entry.polls += 1
+        state = myfile.state.name if myfile is not None and myfile.state is not None else None
+        if state == "ACTIVE":
+            metrics.FILE_PROCESSING_SECONDS.observe(now - entry.started)
+            self._finish(entry, file=myfile)
+        elif state == "FAILED":
+            self._finish(entry, error=FileProcessingFailed(f"Processing failed for {entry.name}."))
+        elif now >= entry.deadline:
+            self._finish(entry, error=TimeoutError(f"Processing timeout after {int(now - entry.started)}s."))
+        else:
+            entry.interval = min(self.settings["max_interval_seconds"], entry.interval * self.settings["backoff"])
+            entry.next_poll = min(entry.deadline, now + entry.interval)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self.entries:
+                    self._cond.wait()
+                now = time.time()
+                earliest = min(e.next_poll for e in self.entries.values())
+                if earliest > now:
+                    self._cond.wait(earliest - now)
+                    continue
+                window = now + self.settings["coalesce_seconds"]
+                due = [e for e in self.entries.values() if e.next_poll <= window]
+            try:
+                self._poll(due)
+            except Exception as e:
+                # Never let the polling thread die with waiters attached; fail this round's entries instead.
+                print(f"   Warning: file state watcher error: {e}")
+                with self._cond:
+                    for entry in due:
+                        if not entry.done.is_set():
+                            self._finish(entry, error=e)
+
+
+_watchers = {}
+_lock = threading.Lock()
+
+
+def get_watcher(client, config=None):
+    with _lock:
+        watcher = _watchers.get(id(client))
+        if watcher is None or watcher.client is not client:
+            watcher = FileStateWatcher(client, (config or {}).get("file_state", {}))
+            _watchers[id(client)] = watcher
+        return watcher
+
+
+def wait_until_active(client, myfile, config, size_bytes=None):
+    if myfile.state is not None and myfile.state.name == "ACTIVE":
+        return myfile
+    timeout = config.get("timeouts", {}).get("processing_seconds", 1200)
+    return get_watcher(client, config).wait(myfile.name, size_bytes=size_bytes, timeout=timeout)
@@ -0,0 +1,278 @@
+import array
+import base64
+import math
+import os
+import subprocess
+import sys
+import threading
+import wave
+from contextlib import contextmanager
+
+from stt import probe
+from stt.utils import read_json, update_json, write_json
+
+
+DEFAULT_SETTINGS = {
+    "enabled": False,
+    "threshold": 0.75,
+    "sample_rate": 2000,
+    "hop_ms": 50,
+    "max_seconds": 900,
+    "min_overlap_seconds": 60,
+    "max_duration_ratio": 1.5,
+}
+
+WORD_BITS = 16
+
+
+def resolve_settings(config):
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(config.get("dedup", {}))
+    return settings
+
+
+def _samples_from_bytes(data):
+    samples = array.array("h")
+    samples.frombytes(data[: len(data) - len(data) % 2])
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples
+
+
+def _decode_wav(path, settings):
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            return None
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        frames = wav.readframes(int(rate * settings["max_seconds"]))
+    raw = _samples_from_bytes(frames)
+    step = max(1, rate // settings["sample_rate"])
+    width = channels * step
+    return array.array("h", (sum(raw[i : i + width]) // width for i in range(0, len(raw) - width + 1, width)))
+
+
+def decode(path, settings):
+    command = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-nostdin",
+        "-i",
+        path,
+        "-t",
+        str(settings["max_seconds"]),
+        "-ac",
+        "1",
+        "-ar",
+        str(settings["sample_rate"]),
+        "-f",
+        "s16le",
+        "-",
+    ]
+    try:
+        result = subprocess.run(command, check=True, capture_output=True)
+    except FileNotFoundError:
+        if path.lower().endswith(".wav"):
+            return _decode_wav(path, settings)
+        print("ffmpeg not found; skipping duplicate detection.")
+        return None
+    except subprocess.CalledProcessError as e:
+        print(f"Could not decode audio for fingerprinting; skipping duplicate detection. ({e})")
+        return None
+    return _samples_from_bytes(result.stdout)
+
+
+def features(samples, rate, hop_ms):
+    hop = max(2, rate * hop_ms // 1000)
+    energy = []
+    tilt = []
+    for start in range(0, len(samples) - hop + 1, hop):
+        chunk = samples[start : start + hop]
+        e = sum(x * x for x in chunk) / hop
+        d = sum((b - a) * (b - a) for a, b in zip(chunk, chunk[1:])) / hop
+        energy.append(math.log10(e + 1.0))
+        tilt.append(math.log10(d + 1.0) - math.log10(e + 1.0))
+    return energy, tilt
+
+
+def fingerprint_samples(samples, rate, hop_ms):
+    energy, tilt = features(samples, rate, hop_ms)
+    # Two-hop windows compared two hops apart: coarse enough to survive re-encoding and small offsets.
+    energy = [a + b for a, b in zip(energy, energy[1:])]
+    tilt = [a + b for a, b in zip(tilt, tilt[1:])]
+    span = WORD_BITS // 2
+    words = []
+    for n in range(len(energy) - span - 2):
+        word = 0
+        for i in range(span):
+            if energy[n + i + 2] > energy[n + i]:
+                word |= 1 << i
+            if tilt[n + i + 2] > tilt[n + i]:
+                word |= 1 << (span + i)
+        words.append(word)
+    return words
+
+
+def compute(path, settings, duration=None):
+    samples = decode(path, settings)
+    if not samples:
+        return None
+    return {
+        "words": fingerprint_samples(samples, settings["sample_rate"], settings["hop_ms"]),
+        "duration": round(duration or len(samples) / settings["sample_rate"], 1),
+    }
+
+
+def encode_words(words):
+    data = array.array("H", words)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return base64.b64encode(data.tobytes()).decode("ascii")
+
+
+def decode_words(text):
+    data = array.array("H")
+    data.frombytes(base64.b64decode(text))
+    if sys.byteorder == "big":
+        data.byteswap()
+    return list(data)
+
+
+def _bit_similarity(query, candidate, offset):
+    start = max(0, -offset)
+    end = min(len(candidate), len(query) - offset)
+    if end <= start:
+        return 0.0, 0
+    diff = sum(bin(query[j + offset] ^ candidate[j]).count("1") for j in range(start, end))
+    return 1.0 - diff / (WORD_BITS * (end - start)), end - start
+
+
+def similarity(query, candidate, min_overlap=0):
+    positions = {}
+    for i, word in enumerate(query):
+        positions.setdefault(word, []).append(i)
+    common = max(8, len(query) // 200)
+    votes = {}
+    for j, word in enumerate(candidate):
+        hits = positions.get(word)
+        if not hits or len(hits) > common:
+            continue
+        for i in hits:
+            votes[i - j] = votes.get(i - j, 0) + 1
+    if not votes:
+        return 0.0, 0
+    best = max(votes, key=votes.get)
+    score, offset = 0.0, best
+    for candidate_offset in (best - 1, best, best + 1):
+        value, overlap = _bit_similarity(query, candidate, candidate_offset)
+        if overlap >= min_overlap and value > score:
+            score, offset = value, candidate_offset
+    return score, offset
+
+
+class FingerprintIndex:
+    def __init__(self, path):
+        self.path = path
+        self.entries = read_json(path, default={}) if path else {}
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def _transaction(self):
+        # Other workers share fingerprints.json: change the file's current contents, not this process's copy.
+        with self._lock:
+            if not self.path:
+                yield self.entries
+                return
+            with update_json(self.path) as entries:
+                yield entries
+            self.entries = entries
+
+    def reload(self):
+        if self.path:
+            with self._lock:
+                self.entries = read_json(self.path, default={})
+
+    def put(self, key, sha256, fingerprint, title=None):
+        with self._transaction() as entries:
+            entries[key] = {
+                "title": title,
+                "sha256": sha256,
+                "duration": fingerprint["duration"],
+                "words": encode_words(fingerprint["words"]),
+                "done": False,
+            }
+
+    def cached(self, key, sha256):
+        entry = self.entries.get(key)
+        if entry is None or entry.get("sha256") != sha256:
+            return None
+        return {"words": decode_words(entry["words"]), "duration": entry["duration"]}
+
+    def mark_done(self, key):
+        with self._transaction() as entries:
+            if key in entries:
+                entries[key]["done"] = True
+
+    def find(self, key, sha256, fingerprint, settings):
+        self.reload()
+        with self._lock:
+            candidates = [(k, e) for k, e in self.entries.items() if k != key and e.get("done")]
+        for other, entry in candidates:
+            if sha256 and entry.get("sha256") == sha256:
+                return {"output_dir": other, "title": entry.get("title"), "similarity": 1.0, "offset_seconds": 0.0}
+        hop_seconds = settings["hop_ms"] / 1000
+        min_overlap = int(settings["min_overlap_seconds"] / hop_seconds)
+        best = None
+        for other, entry in candidates:
+            shorter, longer = sorted([fingerprint["duration"], entry["duration"]])
+            if shorter <= 0 or longer / shorter > settings["max_duration_ratio"]:
+                continue
+            score, offset = similarity(fingerprint["words"], decode_words(entry["words"]), min_overlap)
+            if score >= settings["threshold"] and (best is None or score > best["similarity"]):
+                best = {
+                    "output_dir": other,
+                    "title": entry.get("title"),
+                    "similarity": round(score, 3),
+                    "offset_seconds": round(offset * hop_seconds, 2),
+                }
+        return best
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def get_index(config):
+    path = os.path.join(config["paths"]["output_dir"], ".cache", "fingerprints.json")
+    with _lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = FingerprintIndex(path)
+            _indexes[path] = index
+        return index
+
+
+def find_duplicate(source_path, sha256, output_dir, config, title=None):
+    settings = resolve_settings(config)
+    index = get_index(config)
+    fingerprint = index.cached(output_dir, sha256)
+    if fingerprint is None:
+        fingerprint = compute(source_path, settings, probe.probe_duration(source_path, config))
+        if fingerprint is None:
+            return None
+        index.put(output_dir, sha256, fingerprint, title)
+    return index.find(output_dir, sha256, fingerprint, settings)
+
+
+def remember(config, output_dir):
+    get_index(config).mark_done(output_dir)
+
+
+def link_duplicate(output_dir, match):
+    write_json(os.path.join(output_dir, "duplicate_of.json"), match)
+    print(
+        f"Duplicate of '{match['title'] or match['output_dir']}' "
+        f"(similarity {match['similarity']:.2f}, offset {match['offset_seconds']:+.1f}s); "
+        f"linking to {match['output_dir']} instead of re-processing."
+    )
@@ -7,9 +7,11 @@ import re
 from google.genai import types
 from tqdm import tqdm
 
+from stt import breaker, metrics, ratelimit, tracing
+from stt.breaker import CircuitOpenError
 
-def text_to_speech(client, model_id, text, output_filename, language_name):
-    print(f"Generating Audio for: {output_filename} ...")
+
+def split_into_chunks(text, limit=500):
     chunks = []
     current_chunk = ""
     raw_lines = text.split("\n")
@@ -17,7 +19,7 @@ def text_to_speech(client, model_id, text, output_filename, language_name):
         line = line.strip()
         if not line:
             continue
-        if len(line) > 500:
+        if len(line) > limit:
             sub_parts = re.split(r"([.!?。！？])", line)
             sentences = []
             for j in range(0, len(sub_parts) - 1, 2):
@@ -25,22 +27,40 @@ def text_to_speech(client, model_id, text, output_filename, language_name):
             if len(sub_parts) % 2 != 0:
                 sentences.append(sub_parts[-1])
             for sent in sentences:
-                if len(current_chunk) + len(sent) > 500:
+                if len(current_chunk) + len(sent) > limit:
                     chunks.append(current_chunk)
                     current_chunk = sent
                 else:
                     current_chunk += sent
         else:
-            if len(current_chunk) + len(line) > 500:
+            if len(current_chunk) + len(line) > limit:
                 chunks.append(current_chunk)
                 current_chunk = line + "\n"
             else:
                 current_chunk += line + "\n"
     if current_chunk:
         chunks.append(current_chunk)
+    return chunks
+
+
+def extract_pcm(response):
+    pcm = bytearray()
+    if not response.candidates:
+        return bytes(pcm)
+    for part in response.candidates[0].content.parts:
+        if part.inline_data and "audio" in part.inline_data.mime_type:
+            data = part.inline_data.data
+            if isinstance(data, str):
+                data = base64.b64decode(data)
+            pcm.extend(data)
+    return bytes(pcm)
 
+
+def synthesize_sequential(client, model_id, chunks, language_name):
+    from stt.core import model_slot
+
+    gate = breaker.get(f"gemini:{model_id}")
     all_pcm_data = bytearray()
-    print(f"   Total chunks to process: {len(chunks)}")
     with tqdm(total=len(chunks), desc="Synthesizing Audio") as pbar:
         for i, chunk in enumerate(chunks):
             if not chunk.strip():
@@ -48,33 +68,65 @@ def text_to_speech(client, model_id, text, output_filename, language_name):
                 continue
             max_retries = 3
             for attempt in range(max_retries):
+                wait_time = 0
+                # Same breaker, rate limit and scheduler accounting as every other model call.
+                ratelimit.acquire()
                 try:
-                    response = client.models.generate_content(
-                        model=model_id,
-                        contents=f"Please read this text naturally in {language_name}: {chunk}",
-                        config=types.GenerateContentConfig(response_modalities=["AUDIO"]),
-                    )
+                    with tracing.span("tts", f"chunk {i+1}", attempt=attempt + 1), model_slot(gate, model_id):
+                        response = client.models.generate_content(
+                            model=model_id,
+                            contents=f"Please read this text naturally in {language_name}: {chunk}",
+                            config=types.GenerateContentConfig(response_modalities=["AUDIO"]),
+                        )
+                        tracing.add_usage(response, model_id)
                     if response.candidates:
-                        found_audio = False
-                        for part in response.candidates[0].content.parts:
-                            if part.inline_data and "audio" in part.inline_data.mime_type:
-                                data = part.inline_data.data
-                                if isinstance(data, str):
-                                    data = base64.b64decode(data)
-                                all_pcm_data.extend(data)
-                                found_audio = True
-                        if found_audio:
+                        pcm = extract_pcm(response)
+                        all_pcm_data.extend(pcm)
+                        if pcm:
                             break
                     else:
                         print(f" (Empty response for chunk {i})")
+                except CircuitOpenError:
+                    raise
                 except Exception as e:
                     print(f"   Warning: Chunk {i+1} error (Attempt {attempt+1}/{max_retries}): {e}")
                     if attempt == max_retries - 1:
                         print(f"   Chunk {i+1} failed permanently.")
                     else:
-                        time.sleep(3 * (attempt + 1))
+                        metrics.RETRIES_TOTAL.inc(operation="tts")
+                        wait_time = 3 * (attempt + 1)
+                if wait_time:
+                    # Back off after the slot is released so other jobs can use it.
+                    time.sleep(wait_time)
             pbar.update(1)
             time.sleep(2)
+    return all_pcm_data
+
+
+def synthesize_concurrent(client, model_id, chunks, language_name, limit):
+    from stt import aio
+
+    with tracing.span("tts", f"{len(chunks)} chunks", concurrency=limit):
+        results = client.run(aio.synthesize_chunks(client.aio, model_id, chunks, language_name, limit))
+        for _, response in results:
+            if response is not None:
+                tracing.add_usage(response, model_id)
+    all_pcm_data = bytearray()
+    for i, (pcm, _) in enumerate(results):
+        if chunks[i].strip() and not pcm:
+            print(f"   Chunk {i+1} failed permanently.")
+        all_pcm_data.extend(pcm)
+    return all_pcm_data
+
+
+def text_to_speech(client, model_id, text, output_filename, language_name, concurrency=4):
+    print(f"Generating Audio for: {output_filename} ...")
+    chunks = split_into_chunks(text)
+    print(f"   Total chunks to process: {len(chunks)}")
+    if getattr(client, "is_async_bridge", False):
+        all_pcm_data = synthesize_concurrent(client, model_id, chunks, language_name, concurrency)
+    else:
+        all_pcm_data = synthesize_sequential(client, model_id, chunks, language_name)
 
     if len(all_pcm_data) > 0:
         temp_wav = output_filename.replace(".mp3", "_temp.wav")
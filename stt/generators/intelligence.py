@@ -2,7 +2,7 @@ import os
 import json
 from google.genai import types
 
-from stt.utils import read_json, write_json
+from stt.utils import update_json
 
 
 def detect_content_type(client, model_id, generator, media_file):
@@ -80,15 +80,14 @@ def related_content(client, model_id, generator, media_file, lang, history_title
 
 
 def update_knowledge_graph(graph_path, doc_id, title, entities, topics):
-    graph = read_json(graph_path, default={"nodes": [], "edges": []})
-    node = {"id": doc_id, "label": title, "type": "document", "topics": topics, "entities": entities}
-    graph["nodes"].append(node)
-    for ent in entities:
-        ent_id = f"entity:{ent}"
-        if not any(n["id"] == ent_id for n in graph["nodes"]):
-            graph["nodes"].append({"id": ent_id, "label": ent, "type": "entity"})
-        graph["edges"].append({"from": doc_id, "to": ent_id, "type": "mentions"})
-    write_json(graph_path, graph)
+    with update_json(graph_path, default={"nodes": [], "edges": []}) as graph:
+        node = {"id": doc_id, "label": title, "type": "document", "topics": topics, "entities": entities}
+        graph["nodes"].append(node)
+        for ent in entities:
+            ent_id = f"entity:{ent}"
+            if not any(n["id"] == ent_id for n in graph["nodes"]):
+                graph["nodes"].append({"id": ent_id, "label": ent, "type": "entity"})
+            graph["edges"].append({"from": doc_id, "to": ent_id, "type": "mentions"})
 
 
 def extract_entities(client, model_id, generator, media_file):
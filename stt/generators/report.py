@@ -1,5 +1,3 @@
-from google.genai import types
-
 LANGUAGE_MAP = {
     "zh": "Chinese (Mandarin)",
     "en": "English",
@@ -30,7 +28,7 @@ TIMESTAMP_BLOCK = {
 
 def get_headings(lang, report_key):
     lang_map = HEADINGS.get(lang, HEADINGS["en"])
-    headings = lang_map.get(report_key, HEADINGS["en"][report_key])
+    headings = lang_map.get(report_key) or HEADINGS["en"].get(report_key, [])
     return "\n".join([f"# {h}" for h in headings])
 
 
@@ -53,12 +51,18 @@ def transcript_prompt():
     )
 
 
-def generate_transcript(client, model_id, media_file, generator, output_path):
+def generate_transcript(client, model_id, media_file, generator, output_path, streamer=None):
+    from google.genai import types
+
+    contents = [media_file, transcript_prompt()]
+    config = types.GenerateContentConfig(temperature=0.1)
+    if streamer is not None:
+        return streamer(client, model_id, contents, config, "Generating Verbatim Transcript", output_path)
     response = generator(
         client,
         model_id,
-        contents=[media_file, transcript_prompt()],
-        config=types.GenerateContentConfig(temperature=0.1),
+        contents=contents,
+        config=config,
         message="Generating Verbatim Transcript",
     )
     with open(output_path, "w", encoding="utf-8") as f:
@@ -77,14 +81,23 @@ def generate_report(
     include_timestamps,
     temperature,
     output_path,
+    streamer=None,
+    prompt=None,
 ):
-    prompt = build_prompt(prompt_template, report_key, lang, include_timestamps)
+    from google.genai import types
+
+    prompt = prompt or build_prompt(prompt_template, report_key, lang, include_timestamps)
+    contents = [media_file, prompt]
+    config = types.GenerateContentConfig(temperature=temperature)
+    message = f"Generating {report_key.title()} Report"
+    if streamer is not None:
+        return streamer(client, model_id, contents, config, message, output_path)
     response = generator(
         client,
         model_id,
-        contents=[media_file, prompt],
-        config=types.GenerateContentConfig(temperature=temperature),
-        message=f"Generating {report_key.title()} Report",
+        contents=contents,
+        config=config,
+        message=message,
     )
     with open(output_path, "w", encoding="utf-8") as f:
         f.write(response.text)
@@ -0,0 +1,85 @@
+import json
+
+from stt.generators.report import LANGUAGE_MAP, HEADINGS, build_prompt, get_headings
+
+
+def parse_langs(value, pivot=None):
+    langs = []
+    for lang in (value or "").split(","):
+        lang = lang.strip()
+        if not lang:
+            continue
+        if lang not in LANGUAGE_MAP:
+            raise ValueError(f"Unsupported language: {lang} (expected one of {', '.join(LANGUAGE_MAP)})")
+        if lang not in langs:
+            langs.append(lang)
+    if pivot in langs:
+        langs.remove(pivot)
+        langs.insert(0, pivot)
+    return langs
+
+
+def _headings(lang, report_key):
+    return get_headings(lang, report_key) if report_key in HEADINGS.get(lang, HEADINGS["en"]) else ""
+
+
+def translation_prompt(text, report_key, lang):
+    language_name = LANGUAGE_MAP.get(lang, "English")
+    headings = _headings(lang, report_key)
+    heading_rule = f"Use exactly these top-level headings, in this order:\n{headings}\n" if headings else ""
+    return (
+        f"Translate the following Markdown report into {language_name}.\n"
+        "Keep the Markdown structure, lists and any [MM:SS] timestamps exactly as they are. "
+        "Do not add, drop or summarize content. Output only the translated report.\n"
+        f"{heading_rule}\n"
+        f"--- REPORT ---\n{text}"
+    )
+
+
+def translate_report(client, model_id, generator, text, report_key, lang, output_path):
+    from google.genai import types
+
+    response = generator(
+        client,
+        model_id,
+        contents=[translation_prompt(text, report_key, lang)],
+        config=types.GenerateContentConfig(temperature=0.1),
+        message=f"Translating {report_key.title()} Report ({lang})",
+    )
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(response.text)
+    return response.text
+
+
+def multilang_prompt(prompt_template, report_key, langs, include_timestamps, base_prompt=None):
+    base_prompt = base_prompt or build_prompt(prompt_template, report_key, langs[0], include_timestamps)
+    heading_blocks = "\n\n".join(f"[{lang}] {LANGUAGE_MAP[lang]}:\n{_headings(lang, report_key)}" for lang in langs)
+    return (
+        f"{base_prompt}\n\n"
+        f"Write this report in each of these languages: {', '.join(langs)}. "
+        "Every version must carry the same content and the same [MM:SS] timestamps; "
+        "use that language's headings below.\n\n"
+        f"{heading_blocks}\n\n"
+        'Return JSON: {"<language code>": "<full Markdown report>", ...} with one key per language.'
+    )
+
+
+def generate_multilang_report(
+    client, model_id, media_file, generator, prompt_template, report_key, langs, include_timestamps, temperature, base_prompt=None
+):
+    from google.genai import types
+
+    response = generator(
+        client,
+        model_id,
+        contents=[media_file, multilang_prompt(prompt_template, report_key, langs, include_timestamps, base_prompt)],
+        config=types.GenerateContentConfig(temperature=temperature, response_mime_type="application/json"),
+        message=f"Generating {report_key.title()} Report ({', '.join(langs)})",
+    )
+    try:
+        data = json.loads(response.text)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(data, dict) or not all(isinstance(data.get(lang), str) and data[lang] for lang in langs):
+        return None
+    return {lang: data[lang] for lang in langs}
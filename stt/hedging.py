@@ -0,0 +1,163 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+
+from stt import metrics, ratelimit, tracing
+
+
+DEFAULT_SETTINGS = {
+    "enabled": False,
+    "percentile": 95,
+    "min_samples": 20,
+    "window": 200,
+    "default_threshold_seconds": None,
+    "max_fraction": 0.1,
+    "workers": 8,
+}
+
+_current_task = contextvars.ContextVar("stt_hedge_task", default=None)
+
+
+def task_from_span(record):
+    if record.get("stage") == "intelligence":
+        return record.get("name")
+    if record.get("stage") in ("transcript", "report"):
+        return record["stage"]
+    return None
+
+
+class Hedger:
+    def __init__(self, settings=None):
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update(settings or {})
+        self.samples = {}
+        self.calls = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def observe(self, task, seconds):
+        with self._lock:
+            self.samples.setdefault(task, deque(maxlen=self.settings["window"])).append(seconds)
+
+    def seed_from_traces(self, traces):
+        for trace in traces:
+            for record in trace.get("spans", []):
+                task = task_from_span(record)
+                if task and record.get("calls") == 1 and not record.get("error"):
+                    self.observe(task, record.get("duration", 0.0))
+
+    def threshold(self, task):
+        with self._lock:
+            samples = list(self.samples.get(task, ()))
+        if len(samples) >= self.settings["min_samples"]:
+            return tracing.percentile(samples, self.settings["percentile"])
+        return self.settings["default_threshold_seconds"]
+
+    def _allow_hedge(self):
+        with self._lock:
+            if self.hedges + 1 > self.settings["max_fraction"] * max(1, self.calls):
+                return False
+        if not ratelimit.try_acquire():
+            return False
+        with self._lock:
+            self.hedges += 1
+        return True
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.settings["workers"], thread_name_prefix="stt-hedge")
+            return self._pool
+
+    def call(self, fn, task=None, slot=None):
+        # slot() wraps each request in the caller's accounting (scheduler slot, breaker, metrics).
+        task = task or _current_task.get()
+        threshold = self.threshold(task) if task else None
+        slot = slot or nullcontext
+        with self._lock:
+            self.calls += 1
+        if not self.settings["enabled"] or not threshold:
+            with slot():
+                start = time.time()
+                result = fn()
+            if task:
+                self.observe(task, time.time() - start)
+            return result
+
+        # The primary keeps the client's normal timeout. It runs on its own thread so the caller can
+        # take a hedge's answer and abandon the primary, but only once a hedge is actually in flight.
+        holding = threading.Event()
+        primary = Future()
+
+        def send_primary():
+            try:
+                with slot():
+                    holding.set()
+                    start = time.time()
+                    result = fn()
+                self.observe(task, time.time() - start)
+                primary.set_result(result)
+            except BaseException as e:
+                primary.set_exception(e)
+            finally:
+                holding.set()
+
+        threading.Thread(target=contextvars.copy_context().run, args=(send_primary,), daemon=True).start()
+        # The clock starts once the primary holds its slot, so queueing is never mistaken for slowness.
+        holding.wait()
+        if wait([primary], timeout=threshold).done or not self._allow_hedge():
+            if not primary.done():
+                metrics.HEDGES_TOTAL.inc(task=task, outcome="skipped")
+            return primary.result()
+
+        def send_hedge():
+            with slot():
+                return fn()
+
+        print(f"\n   {task} exceeded {threshold:.0f}s; sending a hedged request.")
+        tracing.annotate(hedged=True)
+        hedge = self._executor().submit(contextvars.copy_context().run, send_hedge)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # The loser is abandoned: it finishes in the background and its answer is dropped.
+                    hedge.cancel()
+                    metrics.HEDGES_TOTAL.inc(task=task, outcome="won" if future is hedge else "lost")
+                    return future.result()
+        metrics.HEDGES_TOTAL.inc(task=task, outcome="failed")
+        return primary.result()
+
+
+_hedger = Hedger()
+
+
+def configure(config, traces=None):
+    global _hedger
+    _hedger = Hedger(config.get("hedging", {}))
+    if _hedger.settings["enabled"]:
+        if traces is None:
+            traces = tracing.load_traces(config["paths"]["output_dir"])
+        _hedger.seed_from_traces(traces)
+
+
+def get_hedger():
+    return _hedger
+
+
+@contextmanager
+def task_scope(task):
+    token = _current_task.set(task)
+    try:
+        yield
+    finally:
+        _current_task.reset(token)
+
+
+def call(fn, task=None, slot=None):
+    return _hedger.call(fn, task, slot)
@@ -0,0 +1,296 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from stt.utils import ensure_dir
+
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_SETTINGS = {
+    "store": "sqlite",
+    "path": None,
+    "lease_seconds": 120,
+    "heartbeat_seconds": 30,
+    "poll_seconds": 5,
+    "max_attempts": 3,
+    "retry_delay_seconds": 60,
+    "exit_when_idle": False,
+}
+
+
+def job_id(target):
+    return hashlib.sha1(target.encode("utf-8")).hexdigest()[:16]
+
+
+def normalize_target(target):
+    return target if "://" in target else os.path.abspath(target)
+
+
+class MemoryJobStore:
+    def __init__(self, lease_seconds=120, max_attempts=3, retry_delay_seconds=60):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay_seconds = retry_delay_seconds
+        self.jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, target, params, priority=0):
+        target = normalize_target(target)
+        now = time.time()
+        with self._lock:
+            job = self.jobs.get(job_id(target))
+            if job is not None and job["status"] != FAILED:
+                return False
+            self.jobs[job_id(target)] = {
+                "id": job_id(target),
+                "target": target,
+                "params": json.loads(json.dumps(params)),
+                "status": QUEUED,
+                "owner": None,
+                "lease_until": None,
+                "available_at": now,
+                "priority": priority,
+                "attempts": 0,
+                "error": None,
+            }
+            return True
+
+    def claim(self, worker):
+        now = time.time()
+        with self._lock:
+            # Higher priority first, then oldest, matching SQLiteJobStore.claim.
+            for job in sorted(self.jobs.values(), key=lambda j: (-j["priority"], j["available_at"])):
+                ready = job["status"] == QUEUED and job["available_at"] <= now
+                expired = job["status"] == LEASED and job["lease_until"] < now
+                if not (ready or expired):
+                    continue
+                if expired and job["attempts"] >= self.max_attempts:
+                    job.update(status=FAILED, owner=None, error=f"lease expired after {job['attempts']} attempts")
+                    continue
+                job.update(status=LEASED, owner=worker, lease_until=now + self.lease_seconds)
+                job["attempts"] += 1
+                return dict(job, reclaimed=expired)
+        return None
+
+    def _owned(self, id_, worker):
+        job = self.jobs.get(id_)
+        return job if job is not None and job["status"] == LEASED and job["owner"] == worker else None
+
+    def heartbeat(self, id_, worker):
+        with self._lock:
+            job = self._owned(id_, worker)
+            if job is None:
+                return False
+            job["lease_until"] = time.time() + self.lease_seconds
+            return True
+
+    def complete(self, id_, worker):
+        with self._lock:
+            job = self._owned(id_, worker)
+            if job is None:
+                return False
+            job.update(status=DONE, owner=None, lease_until=None, error=None)
+            return True
+
+    def park(self, id_, worker, delay, error=None):
+        with self._lock:
+            job = self._owned(id_, worker)
+            if job is None:
+                return False
+            job.update(status=QUEUED, owner=None, lease_until=None, available_at=time.time() + delay, error=error)
+            job["attempts"] -= 1
+            return True
+
+    def fail(self, id_, worker, error):
+        with self._lock:
+            job = self._owned(id_, worker)
+            if job is None:
+                return False
+            status = FAILED if job["attempts"] >= self.max_attempts else QUEUED
+            job.update(
+                status=status,
+                owner=None,
+                lease_until=None,
+                available_at=time.time() + self.retry_delay_seconds,
+                error=str(error)[:500],
+            )
+            return True
+
+    def counts(self):
+        with self._lock:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+            return counts
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    target TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    owner TEXT,
+    lease_until REAL,
+    available_at REAL NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+class SQLiteJobStore:
+    def __init__(self, path, lease_seconds=120, max_attempts=3, retry_delay_seconds=60):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay_seconds = retry_delay_seconds
+        ensure_dir(os.path.dirname(path) or ".")
+        with self._connect() as db:
+            db.execute(SCHEMA)
+            columns = [row["name"] for row in db.execute("PRAGMA table_info(jobs)")]
+            if "priority" not in columns:
+                db.execute("ALTER TABLE jobs ADD COLUMN priority REAL NOT NULL DEFAULT 0")
+
+    def _connect(self):
+        # Rollback journal rather than WAL: WAL needs shared memory, which network filesystems don't provide.
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return _Transaction(db)
+
+    def submit(self, target, params, priority=0):
+        target = normalize_target(target)
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute("SELECT status FROM jobs WHERE id = ?", (job_id(target),)).fetchone()
+            if row is not None and row["status"] != FAILED:
+                return False
+            db.execute(
+                "INSERT OR REPLACE INTO jobs "
+                "(id, target, params, status, available_at, priority, attempts, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0, ?)",
+                (job_id(target), target, json.dumps(params), QUEUED, now, priority, now),
+            )
+            return True
+
+    def claim(self, worker):
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, error = 'lease expired after ' || attempts || ' attempts', "
+                "updated_at = ? WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                (FAILED, now, LEASED, now, self.max_attempts),
+            )
+            row = db.execute(
+                "SELECT * FROM jobs WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_until < ?) "
+                "ORDER BY priority DESC, available_at LIMIT 1",
+                (QUEUED, now, LEASED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = ?, owner = ?, lease_until = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ?",
+                (LEASED, worker, now + self.lease_seconds, now, row["id"]),
+            )
+        job = dict(row)
+        job.update(
+            params=json.loads(row["params"]),
+            status=LEASED,
+            owner=worker,
+            lease_until=now + self.lease_seconds,
+            attempts=row["attempts"] + 1,
+            reclaimed=row["status"] == LEASED,
+        )
+        return job
+
+    def _update_owned(self, id_, worker, assignments, values):
+        with self._connect() as db:
+            cursor = db.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ? AND status = ? AND owner = ?",
+                (*values, time.time(), id_, LEASED, worker),
+            )
+            return cursor.rowcount == 1
+
+    def heartbeat(self, id_, worker):
+        return self._update_owned(id_, worker, "lease_until = ?", (time.time() + self.lease_seconds,))
+
+    def complete(self, id_, worker):
+        return self._update_owned(id_, worker, "status = ?, owner = NULL, lease_until = NULL, error = NULL", (DONE,))
+
+    def park(self, id_, worker, delay, error=None):
+        return self._update_owned(
+            id_,
+            worker,
+            "status = ?, owner = NULL, lease_until = NULL, available_at = ?, attempts = attempts - 1, error = ?",
+            (QUEUED, time.time() + delay, error),
+        )
+
+    def fail(self, id_, worker, error):
+        return self._update_owned(
+            id_,
+            worker,
+            "status = CASE WHEN attempts >= ? THEN ? ELSE ? END, owner = NULL, lease_until = NULL, "
+            "available_at = ?, error = ?",
+            (self.max_attempts, FAILED, QUEUED, time.time() + self.retry_delay_seconds, str(error)[:500]),
+        )
+
+    def counts(self):
+        with self._connect() as db:
+            rows = db.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")
+            return {row["status"]: row["n"] for row in rows}
+
+
+class _Transaction:
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.db.close()
+        return False
+
+
+def settings_from(config):
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(config.get("workers", {}))
+    if not settings["path"]:
+        settings["path"] = os.path.join(config["paths"]["output_dir"], ".cache", "jobs.sqlite")
+    return settings
+
+
+_memory_store = None
+_lock = threading.Lock()
+
+
+def open_store(config):
+    global _memory_store
+    settings = settings_from(config)
+    options = {
+        "lease_seconds": settings["lease_seconds"],
+        "max_attempts": settings["max_attempts"],
+        "retry_delay_seconds": settings["retry_delay_seconds"],
+    }
+    if settings["store"] == "memory":
+        with _lock:
+            if _memory_store is None:
+                _memory_store = MemoryJobStore(**options)
+            return _memory_store
+    if settings["store"] != "sqlite":
+        raise ValueError(f"Unknown job store: {settings['store']}")
+    return SQLiteJobStore(settings["path"], **options)
@@ -0,0 +1,202 @@
+import threading
+
+
+DEFAULT_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+def _label_key(labelnames, labels):
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+def _format_labels(labelnames, key, extra=None):
+    pairs = list(zip(labelnames, key))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs)
+    return "{" + body + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(_label_key(self.labelnames, labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, key), value) for key, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += 1
+            entry[2] += value
+
+    def count(self, **labels):
+        entry = self._values.get(_label_key(self.labelnames, labels))
+        return entry[1] if entry else 0
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(entry[0]), entry[1], entry[2]) for key, entry in self._values.items()]
+        rows = []
+        for key, bucket_counts, count, total in items:
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                rows.append((f"{self.name}_bucket", _format_labels(self.labelnames, key, ("le", bound)), bucket_count))
+            rows.append((f"{self.name}_bucket", _format_labels(self.labelnames, key, ("le", "+Inf")), count))
+            rows.append((f"{self.name}_count", _format_labels(self.labelnames, key), count))
+            rows.append((f"{self.name}_sum", _format_labels(self.labelnames, key), total))
+        return rows
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+
+
+REGISTRY = Registry()
+
+JOBS_TOTAL = REGISTRY.counter("stt_jobs_total", "Jobs finished by outcome", ["status"])
+JOBS_IN_PROGRESS = REGISTRY.gauge("stt_jobs_in_progress", "Jobs currently running")
+QUEUE_DEPTH = REGISTRY.gauge("stt_queue_depth", "Jobs waiting to run", ["source"])
+MODEL_CALLS_IN_FLIGHT = REGISTRY.gauge("stt_model_calls_in_flight", "Model calls currently in flight")
+MODEL_CALLS_TOTAL = REGISTRY.counter("stt_model_calls_total", "Model calls by model and outcome", ["model", "outcome"])
+MODEL_FALLBACKS_TOTAL = REGISTRY.counter(
+    "stt_model_fallbacks_total", "Calls moved to the next model in a route", ["task", "model"]
+)
+HEDGES_TOTAL = REGISTRY.counter("stt_hedged_requests_total", "Hedged model calls by outcome", ["task", "outcome"])
+CIRCUIT_STATE = REGISTRY.gauge(
+    "stt_circuit_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ["dependency"]
+)
+CIRCUIT_OPENED_TOTAL = REGISTRY.counter("stt_circuit_opened_total", "Times a circuit breaker opened", ["dependency"])
+JOBS_PARKED_TOTAL = REGISTRY.counter("stt_jobs_parked_total", "Jobs parked behind an open circuit", ["source"])
+SCHEDULER_WAITING = REGISTRY.gauge("stt_scheduler_waiting_calls", "Model calls waiting for a slot", ["priority"])
+SCHEDULER_WAIT_SECONDS = REGISTRY.histogram(
+    "stt_scheduler_wait_seconds", "Time model calls waited for a slot", ["priority"]
+)
+SCHEDULER_YIELDS_TOTAL = REGISTRY.counter(
+    "stt_scheduler_yields_total", "Stage boundaries where a job yielded to higher-priority work", ["priority"]
+)
+LEASES_RECLAIMED_TOTAL = REGISTRY.counter("stt_leases_reclaimed_total", "Jobs re-claimed from an expired worker lease")
+FILES_PENDING = REGISTRY.gauge("stt_files_pending", "Uploaded files waiting to become ACTIVE")
+FILE_STATE_POLLS_TOTAL = REGISTRY.counter("stt_file_state_polls_total", "File state polls by method", ["method"])
+FILE_PROCESSING_SECONDS = REGISTRY.histogram("stt_file_processing_seconds", "Upload to ACTIVE latency")
+REMOTE_FILES_TRACKED = REGISTRY.gauge("stt_remote_files_tracked", "Uploaded files tracked by the lifecycle manager")
+REMOTE_FILES_DELETED_TOTAL = REGISTRY.counter("stt_remote_files_deleted_total", "Uploaded files deleted after use")
+RETRIES_TOTAL = REGISTRY.counter("stt_retries_total", "Retried attempts by operation", ["operation"])
+UPLOAD_BYTES_TOTAL = REGISTRY.counter("stt_upload_bytes_total", "Bytes uploaded to the Files API")
+STAGE_SECONDS = REGISTRY.histogram("stt_stage_seconds", "Stage latency in seconds", ["stage"])
+CACHED_TOKENS_TOTAL = REGISTRY.counter("stt_cached_tokens_total", "Input tokens served from context caches")
+TTFT_SECONDS = REGISTRY.histogram("stt_time_to_first_token_seconds", "Streaming time to first token", ["model"])
+WATCH_FILES_TOTAL = REGISTRY.counter("stt_watch_files_total", "Files picked up by watch mode")
+PLUGIN_EVENTS_TOTAL = REGISTRY.counter(
+    "stt_plugin_events_total", "Plugin events by plugin, event and outcome", ["plugin", "event", "outcome"]
+)
+PLUGIN_QUEUE_DEPTH = REGISTRY.gauge("stt_plugin_queue_depth", "Plugin events waiting for delivery", ["plugin"])
+NOTION_REQUESTS_TOTAL = REGISTRY.counter("stt_notion_requests_total", "Notion API requests by operation", ["operation"])
+EXPORTS_TOTAL = REGISTRY.counter("stt_exports_total", "Report exports by format and outcome", ["format", "outcome"])
+FEED_EPISODES_TOTAL = REGISTRY.counter("stt_feed_episodes_total", "Podcast episodes by outcome", ["outcome"])
+
+
+def serve_metrics(port, registry=REGISTRY):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    print(f"Metrics available at http://localhost:{port}/metrics")
+    return httpd
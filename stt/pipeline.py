@@ -1,6 +1,10 @@
 import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-from stt.core import analyze_audio
+from stt import metrics, scheduler, tracing
+from stt.breaker import CircuitOpenError
 from stt.downloaders.youtube import download_youtube_audio
 from stt.utils import ensure_dir
 
@@ -37,22 +41,127 @@ def process_target(
     tts_enabled,
     export_formats,
     dry_run,
+    translate_to=None,
+    priority=None,
 ):
+    from stt.core import analyze_audio
+
     output_root = config["paths"]["output_dir"]
     ensure_dir(output_root)
-    if "youtube.com/" in target or "youtu.be/" in target:
-        target_file = download_youtube_audio(target, output_root)
-    else:
-        target_file = target
-
-    analyze_audio(
-        target_file,
-        config=config,
-        lang=lang,
-        include_timestamps=include_timestamps,
-        with_transcript=with_transcript,
-        report_keys=report_keys,
-        tts_enabled=tts_enabled,
-        export_formats=export_formats,
-        dry_run=dry_run,
-    )
+    owns_trace = tracing.current_trace() is None and not dry_run
+    if owns_trace:
+        tracing.start_trace(target)
+    try:
+        with scheduler.priority_scope(priority):
+            if "youtube.com/" in target or "youtu.be/" in target:
+                with tracing.span("download", target):
+                    target_file = download_youtube_audio(target, output_root)
+            else:
+                target_file = target
+
+            return analyze_audio(
+                target_file,
+                config=config,
+                lang=lang,
+                include_timestamps=include_timestamps,
+                with_transcript=with_transcript,
+                report_keys=report_keys,
+                tts_enabled=tts_enabled,
+                export_formats=export_formats,
+                dry_run=dry_run,
+                translate_to=translate_to,
+            )
+    finally:
+        if owns_trace:
+            tracing.finish_trace()
+
+
+class ParkingQueue:
+    def __init__(self, targets, max_parks=10, source="batch"):
+        self.ready = deque(targets)
+        self.parked = []
+        self.parks = {}
+        self.max_parks = max_parks
+        self.source = source
+        self._update_depth()
+
+    def _update_depth(self):
+        metrics.QUEUE_DEPTH.set(len(self.ready) + len(self.parked), source=self.source)
+
+    def __bool__(self):
+        return bool(self.ready or self.parked)
+
+    def release(self):
+        now = time.time()
+        still_parked = []
+        for ready_at, target in self.parked:
+            if ready_at <= now:
+                self.ready.append(target)
+            else:
+                still_parked.append((ready_at, target))
+        self.parked = still_parked
+
+    def next_wait(self):
+        if self.ready or not self.parked:
+            return 0.0
+        return max(0.0, min(ready_at for ready_at, _ in self.parked) - time.time())
+
+    def pop(self):
+        target = self.ready.popleft()
+        self._update_depth()
+        return target
+
+    def park(self, target, error):
+        self.parks[target] = self.parks.get(target, 0) + 1
+        if self.parks[target] > self.max_parks:
+            print(f"Giving up on {target} after {self.max_parks} parks: {error}")
+            return False
+        print(f"Parking {target}: {error}")
+        metrics.JOBS_PARKED_TOTAL.inc(source=self.source)
+        self.parked.append((time.time() + max(1.0, error.retry_after), target))
+        self._update_depth()
+        return True
+
+
+def run_batch(targets, *, concurrency=1, max_parks=10, priorities=None, **job_kwargs):
+    queue = ParkingQueue(targets, max_parks=max_parks)
+    priorities = priorities or {}
+
+    if concurrency <= 1:
+        while queue:
+            queue.release()
+            if not queue.ready:
+                time.sleep(queue.next_wait())
+                continue
+            target = queue.pop()
+            try:
+                process_target(target, priority=priorities.get(target), **job_kwargs)
+            except CircuitOpenError as e:
+                queue.park(target, e)
+        return
+
+    def run_isolated(target):
+        try:
+            process_target(target, priority=priorities.get(target), **job_kwargs)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            print(f"Job failed for {target}: {e}")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        running = {}
+        while queue or running:
+            queue.release()
+            while queue.ready and len(running) < concurrency:
+                target = queue.pop()
+                running[pool.submit(run_isolated, target)] = target
+            if not running:
+                time.sleep(queue.next_wait())
+                continue
+            timeout = queue.next_wait() if queue.parked and not queue.ready else None
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                target = running.pop(future)
+                error = future.exception()
+                if isinstance(error, CircuitOpenError):
+                    queue.park(target, error)
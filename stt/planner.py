@@ -0,0 +1,142 @@
+import heapq
+import os
+import subprocess
+
+from stt import probe
+from stt.utils import estimate_tokens
+
+
+ORDERS = ("input", "sjf", "ljf")
+
+
+def is_youtube(target):
+    return "youtube.com/" in target or "youtu.be/" in target
+
+
+def youtube_duration(url):
+    try:
+        out = subprocess.check_output(
+            ["yt-dlp", "--no-warnings", "--skip-download", "--print", "duration", url],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        )
+        return float(out.strip().splitlines()[0])
+    except Exception:
+        return None
+
+
+def probe_targets(targets, config):
+    cache = probe.default_cache(config)
+    workers = config.get("batch", {}).get("probe_workers", 8)
+    local = probe.probe_many([t for t in targets if os.path.isfile(t)], cache, workers=workers)
+    durations = {}
+    for target in targets:
+        if target in local:
+            durations[target] = (local[target].get("duration_seconds"), local[target].get("source") or "unknown")
+        elif is_youtube(target):
+            durations[target] = (youtube_duration(target), "yt-dlp")
+        else:
+            durations[target] = (None, "missing")
+    return durations
+
+
+def estimate_target(duration, config):
+    planner_cfg = config.get("batch", {})
+    tokens = estimate_tokens(duration, config["cost"]["tokens_per_minute"])
+    usd = None if tokens is None else (tokens / 1000.0) * config["cost"]["usd_per_1k_tokens"]
+    seconds = None
+    if duration is not None:
+        seconds = planner_cfg.get("job_overhead_seconds", 60) + (duration / 60.0) * planner_cfg.get(
+            "seconds_per_audio_minute", 6
+        )
+    return {"tokens": tokens, "usd": usd, "seconds": seconds}
+
+
+def order_items(items, order):
+    if order == "input":
+        return list(items)
+    known = [i for i in items if i["duration_seconds"] is not None]
+    unknown = [i for i in items if i["duration_seconds"] is None]
+    known.sort(key=lambda i: i["duration_seconds"], reverse=(order == "ljf"))
+    return known + unknown
+
+
+def simulate(items, concurrency, default_seconds):
+    workers = [(0.0, w) for w in range(max(1, concurrency))]
+    heapq.heapify(workers)
+    for item in items:
+        free_at, worker = heapq.heappop(workers)
+        seconds = item["est_seconds"] if item["est_seconds"] is not None else default_seconds
+        item["start"] = free_at
+        item["finish"] = free_at + seconds
+        item["worker"] = worker
+        heapq.heappush(workers, (item["finish"], worker))
+    finishes = [i["finish"] for i in items]
+    return {
+        "makespan_seconds": max(finishes) if finishes else 0.0,
+        "first_result_seconds": min(finishes) if finishes else 0.0,
+        "mean_completion_seconds": sum(finishes) / len(finishes) if finishes else 0.0,
+    }
+
+
+def build_plan(targets, config, order="input", concurrency=1, durations=None):
+    if order not in ORDERS:
+        raise ValueError(f"Unknown batch order: {order} (expected one of {', '.join(ORDERS)})")
+    durations = durations if durations is not None else probe_targets(targets, config)
+    items = []
+    for target in targets:
+        duration, source = durations.get(target, (None, "missing"))
+        estimate = estimate_target(duration, config)
+        items.append(
+            {
+                "target": target,
+                "duration_seconds": duration,
+                "source": source,
+                "tokens": estimate["tokens"],
+                "usd": estimate["usd"],
+                "est_seconds": estimate["seconds"],
+            }
+        )
+    items = order_items(items, order)
+    default_seconds = config.get("batch", {}).get("job_overhead_seconds", 60)
+    totals = simulate(items, concurrency, default_seconds)
+    totals.update(
+        {
+            "targets": len(items),
+            "unknown": sum(1 for i in items if i["duration_seconds"] is None),
+            "duration_seconds": sum(i["duration_seconds"] or 0 for i in items),
+            "tokens": sum(i["tokens"] or 0 for i in items),
+            "usd": sum(i["usd"] or 0 for i in items),
+            "concurrency": concurrency,
+            "order": order,
+        }
+    )
+    return {"items": items, "totals": totals}
+
+
+def _fmt_seconds(seconds):
+    if seconds is None:
+        return "?"
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{secs:02d}"
+
+
+def print_plan(plan):
+    print(f"{'#':>3}  {'duration':>9}  {'tokens':>9}  {'USD':>8}  {'start':>8}  {'finish':>8}  target")
+    for n, item in enumerate(plan["items"], 1):
+        tokens = "?" if item["tokens"] is None else str(item["tokens"])
+        usd = "?" if item["usd"] is None else f"{item['usd']:.4f}"
+        print(
+            f"{n:>3}  {_fmt_seconds(item['duration_seconds']):>9}  {tokens:>9}  {usd:>8}  "
+            f"{_fmt_seconds(item['start']):>8}  {_fmt_seconds(item['finish']):>8}  {item['target']}"
+        )
+    totals = plan["totals"]
+    print()
+    print(f"Targets: {totals['targets']} ({totals['unknown']} with unknown duration)")
+    print(f"Audio: {_fmt_seconds(totals['duration_seconds'])}  Tokens: {totals['tokens']}  Estimated USD: {totals['usd']:.4f}")
+    print(
+        f"Order: {totals['order']}  Concurrency: {totals['concurrency']}  "
+        f"Makespan: {_fmt_seconds(totals['makespan_seconds'])}  "
+        f"First result: {_fmt_seconds(totals['first_result_seconds'])}"
+    )
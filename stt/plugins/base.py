@@ -13,6 +13,10 @@ class Plugin:
     def on_complete(self, context):
         pass
 
+    def on_digest(self, contexts):
+        for context in contexts:
+            self.on_complete(context)
+
 
 def load_plugins(plugin_names, plugin_config):
     plugins = []
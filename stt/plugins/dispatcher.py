@@ -0,0 +1,218 @@
+import atexit
+import queue
+import threading
+import time
+
+from stt import metrics
+from stt.breaker import CircuitOpenError
+
+
+DEFAULT_SETTINGS = {
+    "queue_size": 100,
+    "enqueue_timeout_seconds": 1,
+    "timeout_seconds": 60,
+    "max_retries": 2,
+    "retry_delay_seconds": 5,
+}
+
+DEFAULT_DIGEST = {
+    "enabled": False,
+    "plugins": ["email", "telegram"],
+    "window_seconds": 300,
+    "max_items": 50,
+}
+
+_STOP = object()
+
+
+def _call_with_timeout(fn, timeout):
+    result = {}
+
+    def run():
+        try:
+            fn()
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"timed out after {timeout}s")
+    if "error" in result:
+        raise result["error"]
+
+
+class PluginWorker:
+    def __init__(self, name, settings, digest):
+        self.name = name
+        self.settings = settings
+        self.digest = digest
+        self.queue = queue.Queue(maxsize=settings["queue_size"])
+        self.pending = []
+        self.digest_started = None
+        self.thread = threading.Thread(target=self._run, name=f"plugin-{name}", daemon=True)
+        self.thread.start()
+
+    def control(self, item):
+        self.queue.put(item)
+
+    def put(self, item):
+        try:
+            self.queue.put(item, timeout=self.settings["enqueue_timeout_seconds"])
+        except queue.Full:
+            metrics.PLUGIN_EVENTS_TOTAL.inc(plugin=self.name, event=item[1], outcome="dropped")
+            print(f"Plugin {self.name} queue is full; dropped {item[1]}.")
+            return False
+        metrics.PLUGIN_QUEUE_DEPTH.set(self.queue.qsize(), plugin=self.name)
+        return True
+
+    def _deliver(self, plugin, event, args):
+        attempts = 1 + max(0, int(self.settings["max_retries"]))
+        for attempt in range(attempts):
+            try:
+                _call_with_timeout(lambda: getattr(plugin, event)(*args), self.settings["timeout_seconds"])
+                metrics.PLUGIN_EVENTS_TOTAL.inc(plugin=self.name, event=event, outcome="ok")
+                return True
+            except TimeoutError as e:
+                # The call may still land; retrying could send a second email or message.
+                metrics.PLUGIN_EVENTS_TOTAL.inc(plugin=self.name, event=event, outcome="timeout")
+                print(f"Plugin {self.name}.{event} {e}; giving up.")
+                return False
+            except Exception as e:
+                if attempt + 1 >= attempts:
+                    metrics.PLUGIN_EVENTS_TOTAL.inc(plugin=self.name, event=event, outcome="failed")
+                    print(f"Plugin {self.name}.{event} failed: {e}")
+                    return False
+                delay = e.retry_after if isinstance(e, CircuitOpenError) else self.settings["retry_delay_seconds"] * 2**attempt
+                print(f"Plugin {self.name}.{event} failed ({e}); retrying in {delay:.0f}s.")
+                time.sleep(delay)
+        return False
+
+    def _flush_digest(self):
+        if not self.pending:
+            return
+        plugin = self.pending[-1][0]
+        contexts = [context for _, context in self.pending]
+        self.pending = []
+        self.digest_started = None
+        self._deliver(plugin, "on_digest", (contexts,))
+
+    def _digest_wait(self):
+        if not self.pending:
+            return None
+        return max(0.0, self.digest_started + self.digest["window_seconds"] - time.monotonic())
+
+    def _run(self):
+        while True:
+            try:
+                item = self.queue.get(timeout=self._digest_wait())
+            except queue.Empty:
+                self._flush_digest()
+                continue
+            metrics.PLUGIN_QUEUE_DEPTH.set(self.queue.qsize(), plugin=self.name)
+            if item is _STOP:
+                self._flush_digest()
+                return
+            if isinstance(item, threading.Event):
+                self._flush_digest()
+                item.set()
+                continue
+            plugin, event, args = item
+            if event == "on_complete" and self.digest:
+                self.pending.append((plugin, args[0]))
+                self.digest_started = self.digest_started or time.monotonic()
+                if len(self.pending) >= self.digest["max_items"]:
+                    self._flush_digest()
+            else:
+                self._deliver(plugin, event, args)
+
+
+class PluginDispatcher:
+    def __init__(self, settings=None, digest=None):
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update(settings or {})
+        self.digest = dict(DEFAULT_DIGEST)
+        self.digest.update(digest or {})
+        self.workers = {}
+        self._lock = threading.Lock()
+
+    def _worker(self, name):
+        with self._lock:
+            worker = self.workers.get(name)
+            if worker is None:
+                digest = self.digest if self.digest["enabled"] and name in self.digest["plugins"] else None
+                worker = PluginWorker(name, self.settings, digest)
+                self.workers[name] = worker
+            return worker
+
+    def emit(self, plugins, event, context, *args):
+        # Plugins see a snapshot: the job keeps mutating its context after the event is queued.
+        snapshot = dict(context)
+        for plugin in plugins:
+            self._worker(plugin.name).put((plugin, event, (snapshot, *args)))
+
+    def flush(self, timeout=None):
+        with self._lock:
+            workers = list(self.workers.values())
+        done = []
+        for worker in workers:
+            done.append(threading.Event())
+            worker.control(done[-1])
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for event in done:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not event.wait(remaining):
+                return False
+        return True
+
+    def shutdown(self, timeout=None):
+        with self._lock:
+            workers = list(self.workers.values())
+            self.workers = {}
+        for worker in workers:
+            worker.control(_STOP)
+        for worker in workers:
+            worker.thread.join(timeout)
+
+
+_dispatcher = None
+_lock = threading.Lock()
+
+
+def configure(config):
+    global _dispatcher
+    plugins_cfg = config.get("plugins", {})
+    with _lock:
+        previous = _dispatcher
+        _dispatcher = PluginDispatcher(plugins_cfg.get("dispatch"), plugins_cfg.get("digest"))
+    if previous is not None:
+        previous.shutdown(previous.settings["timeout_seconds"])
+    return _dispatcher
+
+
+def get_dispatcher():
+    global _dispatcher
+    with _lock:
+        if _dispatcher is None:
+            _dispatcher = PluginDispatcher()
+        return _dispatcher
+
+
+def emit(plugins, event, context, *args):
+    if plugins:
+        get_dispatcher().emit(plugins, event, context, *args)
+
+
+def flush(timeout=None):
+    return get_dispatcher().flush(timeout)
+
+
+def _shutdown_at_exit():
+    with _lock:
+        dispatcher = _dispatcher
+    if dispatcher is not None:
+        dispatcher.shutdown(dispatcher.settings["timeout_seconds"])
+
+
+atexit.register(_shutdown_at_exit)
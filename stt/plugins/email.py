@@ -1,6 +1,7 @@
 import smtplib
 from email.mime.text import MIMEText
 
+from stt import breaker
 from stt.plugins.base import Plugin
 
 
@@ -8,6 +9,15 @@ class EmailPlugin(Plugin):
     name = "email"
 
     def on_complete(self, context):
+        body = f"Report complete for: {context.get('title')}\nOutput: {context.get('output_dir')}"
+        self._send(self.config.get("subject", "STT Report Ready"), body)
+
+    def on_digest(self, contexts):
+        lines = [f"- {context.get('title')}: {context.get('output_dir')}" for context in contexts]
+        subject = f"{self.config.get('subject', 'STT Report Ready')} ({len(contexts)} reports)"
+        self._send(subject, f"{len(contexts)} reports complete:\n" + "\n".join(lines))
+
+    def _send(self, subject, body):
         smtp_host = self.config.get("smtp_host")
         smtp_port = self.config.get("smtp_port", 587)
         username = self.config.get("username")
@@ -17,14 +27,15 @@ class EmailPlugin(Plugin):
         if not all([smtp_host, username, password, to_addr]):
             print("Email plugin not configured (smtp_host/username/password/to).")
             return
-        subject = self.config.get("subject", "STT Report Ready")
-        body = f"Report complete for: {context.get('title')}\nOutput: {context.get('output_dir')}"
         msg = MIMEText(body)
         msg["Subject"] = subject
         msg["From"] = from_addr
         msg["To"] = to_addr
 
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.starttls()
-            server.login(username, password)
-            server.sendmail(from_addr, [to_addr], msg.as_string())
+        def send():
+            with smtplib.SMTP(smtp_host, smtp_port, timeout=30) as server:
+                server.starttls()
+                server.login(username, password)
+                server.sendmail(from_addr, [to_addr], msg.as_string())
+
+        breaker.call("smtp", send)
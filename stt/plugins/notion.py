@@ -1,12 +1,17 @@
 from stt.plugins.base import Plugin
-from stt.exporters.notion import export_notion
+from stt.exporters.notion import export_reports
 
 
 class NotionPlugin(Plugin):
     name = "notion"
 
     def on_complete(self, context):
-        report_text = context.get("primary_report_text")
-        if not report_text:
+        if not context.get("output_dir"):
             return
-        export_notion(report_text, self.config)
+        export_reports(
+            context["output_dir"],
+            self.config,
+            context["title"],
+            sha256=context.get("source_sha256"),
+            output_root=context.get("output_root"),
+        )
@@ -1,17 +1,29 @@
-import requests
-
+from stt import breaker, clients
 from stt.plugins.base import Plugin
 
 
+MAX_MESSAGE = 4096
+
+
 class TelegramPlugin(Plugin):
     name = "telegram"
 
     def on_complete(self, context):
+        self._send(f"STT report complete: {context.get('title')} | {context.get('output_dir')}")
+
+    def on_digest(self, contexts):
+        lines = [f"- {context.get('title')} | {context.get('output_dir')}" for context in contexts]
+        text = f"STT reports complete ({len(contexts)}):\n" + "\n".join(lines)
+        self._send(text[:MAX_MESSAGE])
+
+    def _send(self, text):
         token = self.config.get("bot_token")
         chat_id = self.config.get("chat_id")
         if not token or not chat_id:
             print("Telegram plugin missing bot_token or chat_id.")
             return
-        text = f"STT report complete: {context.get('title')} | {context.get('output_dir')}"
         url = f"https://api.telegram.org/bot{token}/sendMessage"
-        requests.post(url, json={"chat_id": chat_id, "text": text}, timeout=10)
+        breaker.call(
+            "telegram",
+            lambda: clients.get_http_session().post(url, json={"chat_id": chat_id, "text": text}, timeout=10).raise_for_status(),
+        )
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import re
+import subprocess
+
+from stt import probe, vad
+from stt.utils import ensure_dir
+
+
+CODECS = {
+    "opus": ("libopus", ".ogg"),
+    "aac": ("aac", ".m4a"),
+    "mp3": ("libmp3lame", ".mp3"),
+}
+
+DEFAULT_SETTINGS = {
+    "codec": "opus",
+    "bitrate": "32k",
+    "sample_rate": 16000,
+    "channels": 1,
+    "trim_silence": False,
+    "compact_silence": False,
+    "silence_threshold_db": -50,
+    "min_silence_seconds": 2.0,
+    "padding_seconds": 0.25,
+}
+
+SILENCE_START_RE = re.compile(r"silence_start:\s*(-?[\d.]+)")
+SILENCE_END_RE = re.compile(r"silence_end:\s*(-?[\d.]+)")
+
+
+def resolve_settings(config):
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update({k: v for k, v in config.get("preprocess", {}).items() if k in DEFAULT_SETTINGS})
+    if settings["codec"] not in CODECS:
+        raise ValueError(f"Unsupported preprocess codec: {settings['codec']}")
+    return settings
+
+
+def settings_key(settings):
+    payload = json.dumps(settings, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:8]
+
+
+def parse_silences(ffmpeg_stderr, duration=None):
+    silences = []
+    start = None
+    for line in ffmpeg_stderr.splitlines():
+        match = SILENCE_START_RE.search(line)
+        if match:
+            start = max(0.0, float(match.group(1)))
+            continue
+        match = SILENCE_END_RE.search(line)
+        if match and start is not None:
+            silences.append((start, float(match.group(1))))
+            start = None
+    if start is not None and duration is not None:
+        silences.append((start, duration))
+    return silences
+
+
+def detect_silences(path, threshold_db, min_silence_seconds, duration=None):
+    result = subprocess.run(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-i",
+            path,
+            "-af",
+            f"silencedetect=noise={threshold_db}dB:d={min_silence_seconds}",
+            "-f",
+            "null",
+            "-",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_silences(result.stderr, duration)
+
+
+def trim_bounds(silences, duration):
+    start = 0.0
+    end = duration
+    for s_start, s_end in silences:
+        if s_start <= 0.05:
+            start = s_end
+        elif duration is not None and s_end >= duration - 0.05:
+            end = s_start
+    if end is not None and end <= start:
+        return 0.0, duration
+    return start, end
+
+
+def plan_segments(source_path, settings):
+    duration = probe.probe_duration(source_path)
+    if duration is None:
+        return None
+    silences = detect_silences(
+        source_path, settings["silence_threshold_db"], settings["min_silence_seconds"], duration
+    )
+    if settings["compact_silence"]:
+        segments = vad.speech_segments(silences, duration, padding=settings["padding_seconds"])
+    else:
+        segments = [trim_bounds(silences, duration)]
+    if not segments or segments == [(0.0, duration)]:
+        return None
+    return segments
+
+
+def build_ffmpeg_command(source_path, output_path, settings, segments=None):
+    codec, _ = CODECS[settings["codec"]]
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        source_path,
+        "-vn",
+        "-ac",
+        str(settings["channels"]),
+        "-ar",
+        str(settings["sample_rate"]),
+        "-c:a",
+        codec,
+        "-b:a",
+        str(settings["bitrate"]),
+    ]
+    if segments:
+        cmd += ["-af", vad.select_filter(segments)]
+    if settings["codec"] == "opus":
+        cmd += ["-application", "voip"]
+    cmd.append(output_path)
+    return cmd
+
+
+def preprocess_audio(source_path, source_sha256, config):
+    settings = resolve_settings(config)
+    cache_dir = config.get("preprocess", {}).get("cache_dir") or os.path.join(
+        config["paths"]["output_dir"], ".cache", "preprocessed"
+    )
+    ensure_dir(cache_dir)
+    _, ext = CODECS[settings["codec"]]
+    output_path = os.path.join(cache_dir, f"{source_sha256[:16]}_{settings_key(settings)}{ext}")
+    meta_path = output_path + ".json"
+    source_bytes = os.path.getsize(source_path)
+
+    if os.path.exists(output_path) and os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        meta["cached"] = True
+        return meta
+
+    segments = None
+    try:
+        if settings["trim_silence"] or settings["compact_silence"]:
+            segments = plan_segments(source_path, settings)
+        tmp_path = output_path + ".part" + ext
+        subprocess.run(build_ffmpeg_command(source_path, tmp_path, settings, segments), check=True, capture_output=True)
+        os.replace(tmp_path, output_path)
+    except FileNotFoundError:
+        print("ffmpeg not found; uploading original audio.")
+        return None
+    except subprocess.CalledProcessError as e:
+        print(f"Audio pre-processing failed; uploading original audio. ({e})")
+        return None
+
+    processed_bytes = os.path.getsize(output_path)
+    meta = {
+        "path": output_path,
+        "source_bytes": source_bytes,
+        "processed_bytes": processed_bytes,
+        "saved_bytes": source_bytes - processed_bytes,
+        "offset_map": vad.build_offset_map(segments) if segments else [],
+        "settings": settings,
+    }
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    meta["cached"] = False
+    return meta
+
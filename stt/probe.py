@@ -0,0 +1,261 @@
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from stt.utils import get_audio_duration_seconds, read_json, update_json
+
+
+MP3_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MP3_SAMPLE_RATES = {1: [44100, 48000, 32000], 2: [22050, 24000, 16000], 25: [11025, 12000, 8000]}
+
+
+def _probe_wav(f, size):
+    header = f.read(12)
+    if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        return None
+    byte_rate = sample_rate = channels = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            return None
+        chunk_id, chunk_size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+        if chunk_id == b"fmt ":
+            fmt = f.read(chunk_size)
+            channels, sample_rate, byte_rate = struct.unpack("<HII", fmt[2:12])
+            if chunk_size % 2:
+                f.read(1)
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+            data_size = min(chunk_size, size - f.tell())
+            return {"format": "wav", "duration_seconds": data_size / byte_rate, "sample_rate": sample_rate, "channels": channels}
+        else:
+            f.seek(chunk_size + (chunk_size % 2), os.SEEK_CUR)
+
+
+def _probe_flac(f, size):
+    if f.read(4) != b"fLaC":
+        return None
+    block_header = f.read(4)
+    if len(block_header) < 4 or block_header[0] & 0x7F != 0:
+        return None
+    info = f.read(34)
+    packed = int.from_bytes(info[10:18], "big")
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    total_samples = packed & 0xFFFFFFFFF
+    if not sample_rate or not total_samples:
+        return None
+    return {"format": "flac", "duration_seconds": total_samples / sample_rate, "sample_rate": sample_rate, "channels": channels}
+
+
+def _probe_mp3(f, size):
+    head = f.read(10)
+    offset = 0
+    if head[:3] == b"ID3":
+        offset = 10 + ((head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9])
+    f.seek(offset)
+    data = f.read(64 * 1024)
+    for i in range(len(data) - 4):
+        if data[i] != 0xFF or data[i + 1] & 0xE0 != 0xE0:
+            continue
+        version_bits = (data[i + 1] >> 3) & 0x3
+        layer_bits = (data[i + 1] >> 1) & 0x3
+        bitrate_index = data[i + 2] >> 4
+        rate_index = (data[i + 2] >> 2) & 0x3
+        if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+            continue
+        version = {3: 1, 2: 2, 0: 25}[version_bits]
+        layer = 4 - layer_bits
+        sample_rate = MP3_SAMPLE_RATES[version][rate_index]
+        bitrate = MP3_BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+        channels = 1 if (data[i + 3] >> 6) == 3 else 2
+        if layer == 1:
+            samples_per_frame = 384
+        elif layer == 3 and version != 1:
+            samples_per_frame = 576
+        else:
+            samples_per_frame = 1152
+        frame = data[i : i + 200]
+        for tag in (b"Xing", b"Info"):
+            pos = frame.find(tag)
+            if pos != -1 and len(frame) >= pos + 12 and frame[pos + 7] & 0x1:
+                frames = struct.unpack(">I", frame[pos + 8 : pos + 12])[0]
+                return {
+                    "format": "mp3",
+                    "duration_seconds": frames * samples_per_frame / sample_rate,
+                    "sample_rate": sample_rate,
+                    "channels": channels,
+                }
+        pos = frame.find(b"VBRI")
+        if pos != -1 and len(frame) >= pos + 18:
+            frames = struct.unpack(">I", frame[pos + 14 : pos + 18])[0]
+            return {
+                "format": "mp3",
+                "duration_seconds": frames * samples_per_frame / sample_rate,
+                "sample_rate": sample_rate,
+                "channels": channels,
+            }
+        audio_bytes = size - (offset + i)
+        return {"format": "mp3", "duration_seconds": audio_bytes * 8 / bitrate, "sample_rate": sample_rate, "channels": channels}
+    return None
+
+
+def _probe_mp4(f, size, end=None, depth=0):
+    end = size if end is None else end
+    while f.tell() + 8 <= end:
+        start = f.tell()
+        header = f.read(8)
+        atom_size, atom_type = struct.unpack(">I", header[:4])[0], header[4:8]
+        if atom_size == 1:
+            atom_size = struct.unpack(">Q", f.read(8))[0]
+        elif atom_size == 0:
+            atom_size = end - start
+        if atom_size < 8:
+            return None
+        if atom_type == b"moov" and depth == 0:
+            return _probe_mp4(f, size, start + atom_size, depth + 1)
+        if atom_type == b"mvhd":
+            version = f.read(1)[0]
+            f.read(3)
+            if version == 1:
+                f.read(16)
+                timescale, duration = struct.unpack(">IQ", f.read(12))
+            else:
+                f.read(8)
+                timescale, duration = struct.unpack(">II", f.read(8))
+            if not timescale:
+                return None
+            return {"format": "m4a", "duration_seconds": duration / timescale}
+        f.seek(start + atom_size)
+    return None
+
+
+def _probe_ogg(f, size):
+    page = f.read(512)
+    if page[:4] != b"OggS":
+        return None
+    if b"OpusHead" in page:
+        pos = page.find(b"OpusHead")
+        channels = page[pos + 9]
+        pre_skip = struct.unpack("<H", page[pos + 10 : pos + 12])[0]
+        granule_rate = 48000
+        sample_rate = struct.unpack("<I", page[pos + 12 : pos + 16])[0] or 48000
+    elif b"\x01vorbis" in page:
+        pos = page.find(b"\x01vorbis")
+        channels = page[pos + 11]
+        pre_skip = 0
+        granule_rate = sample_rate = struct.unpack("<I", page[pos + 12 : pos + 16])[0]
+    else:
+        return None
+    f.seek(max(0, size - 65536))
+    tail = f.read()
+    pos = tail.rfind(b"OggS")
+    if pos == -1 or len(tail) < pos + 14 or not granule_rate:
+        return None
+    granule = struct.unpack("<q", tail[pos + 6 : pos + 14])[0]
+    if granule <= 0:
+        return None
+    return {
+        "format": "ogg",
+        "duration_seconds": max(0, granule - pre_skip) / granule_rate,
+        "sample_rate": sample_rate,
+        "channels": channels,
+    }
+
+
+PARSERS = {
+    ".wav": _probe_wav,
+    ".flac": _probe_flac,
+    ".mp3": _probe_mp3,
+    ".m4a": _probe_mp4,
+    ".mp4": _probe_mp4,
+    ".ogg": _probe_ogg,
+    ".opus": _probe_ogg,
+}
+
+
+def probe_file(path):
+    size = os.path.getsize(path)
+    parser = PARSERS.get(os.path.splitext(path)[1].lower())
+    if parser is not None:
+        try:
+            with open(path, "rb") as f:
+                info = parser(f, size)
+            if info and info.get("duration_seconds"):
+                info["source"] = "header"
+                return info
+        except (OSError, struct.error, IndexError, KeyError, ValueError):
+            pass
+    duration = get_audio_duration_seconds(path)
+    return {"format": None, "duration_seconds": duration, "source": "ffprobe" if duration is not None else None}
+
+
+class ProbeCache:
+    def __init__(self, path):
+        self.path = path
+        self.entries = read_json(path, default={}) if path else {}
+        self.updates = {}
+        self._lock = threading.Lock()
+
+    def get(self, media_path):
+        stat = os.stat(media_path)
+        entry = self.entries.get(os.path.abspath(media_path))
+        if entry and entry.get("mtime") == stat.st_mtime and entry.get("size") == stat.st_size:
+            return entry["info"]
+        return None
+
+    def put(self, media_path, info):
+        stat = os.stat(media_path)
+        with self._lock:
+            entry = {"mtime": stat.st_mtime, "size": stat.st_size, "info": info}
+            self.entries[os.path.abspath(media_path)] = self.updates[os.path.abspath(media_path)] = entry
+
+    def save(self):
+        if not self.path or not self.updates:
+            return
+        # Merge only what this process probed, so entries written by other workers survive.
+        with self._lock, update_json(self.path) as entries:
+            entries.update(self.updates)
+            self.entries = entries
+            self.updates = {}
+
+
+def default_cache(config):
+    return ProbeCache(os.path.join(config["paths"]["output_dir"], ".cache", "probe.json"))
+
+
+def probe(path, cache=None):
+    if cache is not None:
+        info = cache.get(path)
+        if info is not None:
+            return info
+    info = probe_file(path)
+    if cache is not None and info.get("duration_seconds") is not None:
+        cache.put(path, info)
+    return info
+
+
+def probe_many(paths, cache=None, workers=8):
+    existing = [p for p in paths if os.path.isfile(p)]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = dict(zip(existing, pool.map(lambda p: probe(p, cache), existing)))
+    if cache is not None:
+        cache.save()
+    return results
+
+
+def probe_duration(path, config=None):
+    cache = default_cache(config) if config else None
+    info = probe(path, cache)
+    if cache is not None:
+        cache.save()
+    return info.get("duration_seconds")
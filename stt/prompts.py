@@ -0,0 +1,168 @@
+import hashlib
+import os
+import string
+import threading
+import time
+
+from stt.config import prompt_path, resolve_prompt
+from stt.generators.report import LANGUAGE_MAP, build_prompt
+
+
+FIELDS = {"language", "headings", "timestamps_block"}
+
+DEFAULT_SETTINGS = {
+    "reload_seconds": 2,
+}
+
+
+class PromptError(ValueError):
+    pass
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def validate(report_key, text):
+    try:
+        fields = [field for _, field, _, _ in string.Formatter().parse(text) if field is not None]
+    except ValueError as e:
+        return [f"reports.{report_key}: {e} (escape literal braces as {{{{ and }}}})"]
+    errors = []
+    for field in fields:
+        name = field.split(".")[0].split("[")[0]
+        if name not in FIELDS:
+            errors.append(f"reports.{report_key}: unknown placeholder {{{field}}}; use {', '.join(sorted(FIELDS))}")
+    if errors:
+        return errors
+    for lang in LANGUAGE_MAP:
+        for include_timestamps in (False, True):
+            try:
+                build_prompt(text, report_key, lang, include_timestamps)
+            except (KeyError, IndexError, ValueError, AttributeError) as e:
+                return [f"reports.{report_key}: cannot render for {lang}: {e!r}"]
+    return []
+
+
+class PromptRegistry:
+    def __init__(self, config):
+        self.config = config
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update(config.get("prompts", {}))
+        self.templates = {}
+        self.rendered = {}
+        self.checked_at = time.monotonic()
+        self._lock = threading.RLock()
+
+    def _read(self, report_key):
+        report_cfg = self.config["reports"].get(report_key)
+        if not report_cfg:
+            raise PromptError(f"reports.{report_key}: not configured")
+        spec = report_cfg.get("prompt")
+        path = prompt_path(spec, self.config["paths"]["prompts_dir"])
+        try:
+            text = resolve_prompt(spec, self.config["paths"]["prompts_dir"])
+        except OSError as e:
+            raise PromptError(f"reports.{report_key}: cannot read {path}: {e.strerror}")
+        errors = validate(report_key, text)
+        if errors:
+            raise PromptError("\n".join(errors))
+        return {"text": text, "path": path, "mtime": _mtime(path) if path else None}
+
+    def load(self):
+        errors = []
+        for report_key in self.config["reports"]:
+            try:
+                template = self._read(report_key)
+            except PromptError as e:
+                errors.append(str(e))
+                continue
+            with self._lock:
+                self.templates[report_key] = template
+                self.rendered = {key: value for key, value in self.rendered.items() if key[0] != report_key}
+        if errors:
+            raise PromptError("Invalid prompt templates:\n" + "\n".join(errors))
+        return self
+
+    def maybe_reload(self):
+        interval = self.settings["reload_seconds"]
+        now = time.monotonic()
+        if not interval or now - self.checked_at < interval:
+            return
+        with self._lock:
+            self.checked_at = now
+            templates = dict(self.templates)
+        for report_key, template in templates.items():
+            if not template["path"] or _mtime(template["path"]) == template["mtime"]:
+                continue
+            try:
+                fresh = self._read(report_key)
+            except PromptError as e:
+                print(f"Prompt template changed but is invalid; keeping the previous version.\n{e}")
+                with self._lock:
+                    template["mtime"] = _mtime(template["path"])
+                continue
+            with self._lock:
+                self.templates[report_key] = fresh
+                self.rendered = {key: value for key, value in self.rendered.items() if key[0] != report_key}
+            print(f"Reloaded prompt template: {template['path']}")
+
+    def template(self, report_key):
+        self.maybe_reload()
+        with self._lock:
+            template = self.templates.get(report_key)
+        if template is None:
+            # Reports added after startup (e.g. the interactive custom prompt) are loaded on first use.
+            template = self._read(report_key)
+            with self._lock:
+                self.templates[report_key] = template
+        return template["text"]
+
+    def render(self, report_key, lang, include_timestamps):
+        text = self.template(report_key)
+        key = (report_key, lang, bool(include_timestamps))
+        with self._lock:
+            cached = self.rendered.get(key)
+            if cached is None or cached["template"] is not text:
+                prompt = build_prompt(text, report_key, lang, include_timestamps)
+                cached = {
+                    "template": text,
+                    "text": prompt,
+                    "sha256": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+                }
+                self.rendered[key] = cached
+            return cached["text"], cached["sha256"]
+
+    def prompt_hash(self, report_key, lang, include_timestamps):
+        return self.render(report_key, lang, include_timestamps)[1]
+
+
+_registry = None
+_lock = threading.Lock()
+
+
+def configure(config):
+    global _registry
+    registry = PromptRegistry(config).load()
+    with _lock:
+        _registry = registry
+    return registry
+
+
+def get_registry(config):
+    global _registry
+    with _lock:
+        if _registry is None or _registry.config is not config:
+            _registry = PromptRegistry(config)
+        return _registry
+
+
+def render(config, report_key, lang, include_timestamps):
+    return get_registry(config).render(report_key, lang, include_timestamps)
+
+
+def prompt_hash(config, report_key, lang, include_timestamps):
+    return get_registry(config).prompt_hash(report_key, lang, include_timestamps)
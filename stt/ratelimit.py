@@ -0,0 +1,53 @@
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute, burst=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst or max(1, rate_per_minute // 6))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_bucket = None
+
+
+def configure(config):
+    global _bucket
+    limit_cfg = config.get("rate_limit", {})
+    rpm = limit_cfg.get("requests_per_minute", 0)
+    _bucket = TokenBucket(rpm, limit_cfg.get("burst")) if rpm else None
+
+
+def acquire():
+    if _bucket is not None:
+        _bucket.acquire()
+
+
+def try_acquire():
+    return _bucket is None or _bucket.try_acquire()
@@ -0,0 +1,127 @@
+import os
+import threading
+
+from google.genai import types
+
+from stt import hedging, metrics, scheduler
+from stt.utils import read_json, write_json
+
+
+FALLBACK_ERRORS = [
+    "overloaded",
+    "unavailable",
+    "503",
+    "429",
+    "resource_exhausted",
+    "resource exhausted",
+    "deadline",
+    "timeout",
+    "timed out",
+    "circuit open",
+]
+
+TASKS = (
+    "transcript",
+    "report",
+    "content_type",
+    "key_quotes",
+    "fact_check",
+    "follow_up_questions",
+    "related_content",
+    "entities",
+    "compare",
+    "translate",
+)
+
+
+def should_fall_back(error):
+    return any(x in str(error).lower() for x in FALLBACK_ERRORS)
+
+
+def model_chain(config, task):
+    models_cfg = config["models"]
+    chain = models_cfg.get("routes", {}).get(task) or [models_cfg["text"]]
+    if isinstance(chain, str):
+        chain = [chain]
+    seen = []
+    for model in chain:
+        if model not in seen:
+            seen.append(model)
+    return seen
+
+
+def with_latency_budget(config, seconds):
+    budget = types.HttpOptions(timeout=int(seconds * 1000))
+    if config is None:
+        return types.GenerateContentConfig(http_options=budget)
+    return config.model_copy(update={"http_options": budget})
+
+
+class Router:
+    def __init__(self, config):
+        self.config = config
+        self.used = {}
+        self._lock = threading.Lock()
+
+    def chain(self, task):
+        return model_chain(self.config, task)
+
+    def model(self, task):
+        return self.chain(task)[0]
+
+    def budget(self, task):
+        return self.config["models"].get("latency_budget_seconds", {}).get(task)
+
+    def _run(self, task, artifact, attempt):
+        scheduler.stage_boundary()
+        chain = self.chain(task)
+        budget = self.budget(task)
+        for n, model in enumerate(chain):
+            last = n == len(chain) - 1
+            try:
+                result = attempt(model, None if last else budget, None if last else 1)
+            except Exception as e:
+                if last or not should_fall_back(e):
+                    raise
+                metrics.MODEL_FALLBACKS_TOTAL.inc(task=task, model=model)
+                print(f"\n   Warning: {model} unavailable for {task} ({e}); falling back to {chain[n + 1]}.")
+                continue
+            with self._lock:
+                self.used[artifact or task] = {"task": task, "model": model, "fallback": n > 0}
+            return result
+
+    def wrap(self, task, generator, artifact=None):
+        def generate(client, model, contents, config, message, **kwargs):
+            def attempt(routed_model, budget, max_retries):
+                routed_config = with_latency_budget(config, budget) if budget else config
+                call_kwargs = dict(kwargs, max_retries=max_retries) if max_retries is not None else kwargs
+                with hedging.task_scope(task):
+                    return generator(
+                        client, routed_model, contents=contents, config=routed_config, message=message, **call_kwargs
+                    )
+
+            return self._run(task, artifact, attempt)
+
+        return generate
+
+    def wrap_streamer(self, task, streamer, artifact=None):
+        if streamer is None:
+            return None
+
+        def stream(client, model, contents, config, message, output_path, **kwargs):
+            def attempt(routed_model, budget, max_retries):
+                routed_config = with_latency_budget(config, budget) if budget else config
+                call_kwargs = dict(kwargs, max_retries=max_retries) if max_retries is not None else kwargs
+                return streamer(client, routed_model, contents, routed_config, message, output_path, **call_kwargs)
+
+            return self._run(task, artifact or os.path.basename(output_path), attempt)
+
+        return stream
+
+    def write(self, output_dir):
+        path = os.path.join(output_dir, "models_used.json")
+        with self._lock:
+            used = read_json(path, default={})
+            used.update(self.used)
+            write_json(path, used)
+        return path
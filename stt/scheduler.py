@@ -0,0 +1,176 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from stt import metrics
+
+
+DEFAULT_SETTINGS = {
+    "capacity": 8,
+    "default_priority": "batch",
+    "weights": {"interactive": 8, "watch": 4, "batch": 2, "backfill": 1},
+    "preempt": ["interactive"],
+    "max_yield_seconds": 300,
+    "window": 200,
+}
+
+_current_priority = contextvars.ContextVar("stt_priority", default=None)
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class FairScheduler:
+    def __init__(self, settings=None):
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update(settings or {})
+        self.capacity = self.settings["capacity"]
+        self.in_use = 0
+        self.virtual_now = 0.0
+        self.finish = {}
+        self.queues = {}
+        self.active = {}
+        self.granted = {}
+        self.waits = {}
+        self._cond = threading.Condition()
+
+    def weight(self, priority):
+        return max(1e-6, float(self.settings["weights"].get(priority, 1)))
+
+    def _start_tag(self, priority):
+        return max(self.finish.get(priority, 0.0), self.virtual_now)
+
+    def _next_priority(self):
+        backlogged = [p for p, queue in self.queues.items() if queue]
+        if not backlogged:
+            return None
+        return min(backlogged, key=lambda p: (self._start_tag(p), -self.weight(p)))
+
+    def acquire(self, priority):
+        if self.capacity <= 0:
+            return 0.0
+        ticket = object()
+        started = time.time()
+        with self._cond:
+            queue = self.queues.setdefault(priority, deque())
+            queue.append(ticket)
+            metrics.SCHEDULER_WAITING.set(len(queue), priority=priority)
+            while not (self.in_use < self.capacity and self._next_priority() == priority and queue[0] is ticket):
+                self._cond.wait()
+            queue.popleft()
+            start = self._start_tag(priority)
+            self.virtual_now = start
+            self.finish[priority] = start + 1.0 / self.weight(priority)
+            self.in_use += 1
+            waited = time.time() - started
+            self.granted[priority] = self.granted.get(priority, 0) + 1
+            self.waits.setdefault(priority, deque(maxlen=self.settings["window"])).append(waited)
+            metrics.SCHEDULER_WAITING.set(len(queue), priority=priority)
+            self._cond.notify_all()
+        metrics.SCHEDULER_WAIT_SECONDS.observe(waited, priority=priority)
+        return waited
+
+    def release(self):
+        if self.capacity <= 0:
+            return
+        with self._cond:
+            self.in_use -= 1
+            self._cond.notify_all()
+
+    def enter_job(self, priority):
+        with self._cond:
+            self.active[priority] = self.active.get(priority, 0) + 1
+
+    def exit_job(self, priority):
+        with self._cond:
+            self.active[priority] -= 1
+            self._cond.notify_all()
+
+    def _preempting(self, priority):
+        return [p for p in self.settings["preempt"] if p != priority and self.active.get(p)]
+
+    def stage_boundary(self, priority):
+        if priority in self.settings["preempt"]:
+            return 0.0
+        started = time.time()
+        deadline = started + self.settings["max_yield_seconds"]
+        with self._cond:
+            if not self._preempting(priority):
+                return 0.0
+            metrics.SCHEDULER_YIELDS_TOTAL.inc(priority=priority)
+            while self._preempting(priority) and time.time() < deadline:
+                self._cond.wait(deadline - time.time())
+        return time.time() - started
+
+    def snapshot(self):
+        with self._cond:
+            priorities = set(self.settings["weights"]) | set(self.queues) | set(self.active)
+            return {
+                "capacity": self.capacity,
+                "in_use": self.in_use,
+                "priorities": {
+                    p: {
+                        "weight": self.weight(p),
+                        "active_jobs": self.active.get(p, 0),
+                        "waiting_calls": len(self.queues.get(p, ())),
+                        "granted_calls": self.granted.get(p, 0),
+                        "wait_p50_seconds": _percentile(list(self.waits.get(p, ())), 50),
+                        "wait_p95_seconds": _percentile(list(self.waits.get(p, ())), 95),
+                    }
+                    for p in sorted(priorities)
+                },
+            }
+
+
+_scheduler = FairScheduler()
+_lock = threading.Lock()
+
+
+def configure(config):
+    global _scheduler
+    with _lock:
+        _scheduler = FairScheduler(config.get("scheduler", {}))
+    return _scheduler
+
+
+def get_scheduler():
+    return _scheduler
+
+
+def current_priority():
+    return _current_priority.get() or _scheduler.settings["default_priority"]
+
+
+@contextmanager
+def priority_scope(priority=None):
+    priority = priority or current_priority()
+    scheduler = _scheduler
+    token = _current_priority.set(priority)
+    scheduler.enter_job(priority)
+    try:
+        yield priority
+    finally:
+        scheduler.exit_job(priority)
+        _current_priority.reset(token)
+
+
+def acquire():
+    return _scheduler.acquire(current_priority())
+
+
+def release():
+    _scheduler.release()
+
+
+def stage_boundary():
+    return _scheduler.stage_boundary(current_priority())
+
+
+def snapshot():
+    return _scheduler.snapshot()
@@ -1,11 +1,12 @@
 import os
 import threading
 
-from stt.pipeline import process_target
+from stt import breaker, clients, metrics, scheduler, streaming, uploads
+from stt.pipeline import process_target, run_batch
 from stt.utils import ensure_dir
 
 
-def run_server(config, port):
+def run_server(config, port, backlog=None):
     try:
         from flask import Flask, request, jsonify
     except ImportError:
@@ -14,6 +15,10 @@ def run_server(config, port):
 
     app = Flask(__name__)
     jobs = {}
+    uploads.start_gc(clients.get_client(config), config)
+    if backlog:
+        print(f"Processing {len(backlog['targets'])} queued target(s) in the background.")
+        threading.Thread(target=lambda: run_batch(**backlog), name="stt-backlog", daemon=True).start()
 
     @app.route("/", methods=["GET"])
     def index():
@@ -68,23 +73,47 @@ def run_server(config, port):
 
         job_id = f"job_{len(jobs)+1}"
         jobs[job_id] = {"status": "running", "target": target}
+        metrics.QUEUE_DEPTH.inc(source="server")
+
+        def on_stream(event):
+            artifacts = jobs[job_id].setdefault("artifacts", {})
+            artifact = artifacts.setdefault(os.path.basename(event["path"]), {"path": event["path"]})
+            artifact["chars"] = event["chars"]
+            artifact["tail"] = (artifact.get("tail", "") + event["text"])[-500:]
+            artifact["done"] = event.get("done", False)
+            jobs[job_id]["current_artifact"] = event["path"]
 
         def run_job():
+            # Queued (or parked) until this thread picks the job up; running jobs count in stt_jobs_in_progress.
+            metrics.QUEUE_DEPTH.dec(source="server")
             try:
                 report_keys = [x.strip() for x in reports.split(",") if x.strip()] if reports else None
                 export_formats = [x.strip() for x in formats.split(",") if x.strip()] if formats else config["defaults"].get("export_formats", ["md"])
-                process_target(
-                    target,
-                    config=config,
-                    lang=lang,
-                    include_timestamps=include_timestamps,
-                    with_transcript=with_transcript,
-                    report_keys=report_keys,
-                    tts_enabled=config["defaults"].get("tts", True),
-                    export_formats=export_formats,
-                    dry_run=False,
-                )
+                with streaming.listening(on_stream):
+                    process_target(
+                        target,
+                        config=config,
+                        lang=lang,
+                        include_timestamps=include_timestamps,
+                        with_transcript=with_transcript,
+                        report_keys=report_keys,
+                        tts_enabled=config["defaults"].get("tts", True),
+                        export_formats=export_formats,
+                        dry_run=False,
+                        priority="interactive",
+                    )
                 jobs[job_id]["status"] = "done"
+            except breaker.CircuitOpenError as e:
+                parks = jobs[job_id]["parks"] = jobs[job_id].get("parks", 0) + 1
+                if parks > config.get("breakers", {}).get("max_parks", 10):
+                    jobs[job_id]["status"] = f"error: {e}"
+                else:
+                    jobs[job_id]["status"] = f"parked: {e}"
+                    metrics.JOBS_PARKED_TOTAL.inc(source="server")
+                    metrics.QUEUE_DEPTH.inc(source="server")
+                    timer = threading.Timer(max(1.0, e.retry_after), run_job)
+                    timer.daemon = True
+                    timer.start()
             except Exception as e:
                 jobs[job_id]["status"] = f"error: {e}"
 
@@ -96,4 +125,29 @@ def run_server(config, port):
     def status(job_id):
         return jsonify(jobs.get(job_id, {"status": "unknown"}))
 
+    @app.route("/health", methods=["GET"])
+    def health():
+        breakers = breaker.snapshot()
+        degraded = [name for name, state in breakers.items() if state["state"] != breaker.CLOSED]
+        return jsonify({"status": "degraded" if degraded else "ok", "degraded": degraded, "breakers": breakers})
+
+    @app.route("/scheduler", methods=["GET"])
+    def scheduler_status():
+        return jsonify(scheduler.snapshot())
+
+    @app.route("/partial/<job_id>", methods=["GET"])
+    def partial(job_id):
+        path = jobs.get(job_id, {}).get("current_artifact")
+        if not path:
+            return "", 204
+        for candidate in (path + ".part", path):
+            if os.path.exists(candidate):
+                with open(candidate, "r", encoding="utf-8") as f:
+                    return f.read(), 200, {"Content-Type": "text/markdown; charset=utf-8"}
+        return "", 204
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics_endpoint():
+        return metrics.REGISTRY.render(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
     app.run(host="0.0.0.0", port=port)
@@ -0,0 +1,105 @@
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+
+from stt import breaker, metrics, ratelimit, scheduler, tracing
+
+
+RETRYABLE_ERRORS = ["disconnect", "timeout", "reset", "connection", "incomplete", "stream"]
+
+CONTINUE_PROMPT = (
+    "The previous response was cut off. Continue the output exactly where the partial text below stops. "
+    "Do not repeat any of it and do not add commentary.\n\n--- PARTIAL OUTPUT ---\n"
+)
+
+_listeners = contextvars.ContextVar("stt_stream_listeners", default=())
+
+
+@contextmanager
+def listening(listener):
+    token = _listeners.set(_listeners.get() + (listener,))
+    try:
+        yield
+    finally:
+        _listeners.reset(token)
+
+
+def publish(event):
+    for listener in _listeners.get():
+        try:
+            listener(event)
+        except Exception as e:
+            print(f"   Warning: stream listener failed: {e}")
+
+
+def continuation_contents(contents, received):
+    contents = list(contents) if isinstance(contents, (list, tuple)) else [contents]
+    return contents + [CONTINUE_PROMPT + received]
+
+
+def _is_retryable(error):
+    return any(x in str(error).lower() for x in RETRYABLE_ERRORS)
+
+
+def stream_to_file(client, model, contents, config, output_path, label=None, max_retries=5, on_chunk=None):
+    part_path = output_path + ".part"
+    received = ""
+    if os.path.exists(part_path):
+        with open(part_path, "r", encoding="utf-8") as f:
+            received = f.read()
+        if received:
+            print(f"   Resuming {os.path.basename(output_path)} from {len(received)} saved characters.")
+
+    label = label or os.path.basename(output_path)
+    started = time.time()
+    ttft = None
+    gate = breaker.get(f"gemini:{model}")
+    with open(part_path, "a", encoding="utf-8") as out:
+        for attempt in range(max_retries):
+            request = continuation_contents(contents, received) if received else contents
+            usage_response = None
+            gate.before_call()
+            ratelimit.acquire()
+            scheduler.acquire()
+            metrics.MODEL_CALLS_IN_FLIGHT.inc()
+            try:
+                for chunk in client.models.generate_content_stream(model=model, contents=request, config=config):
+                    if getattr(chunk, "usage_metadata", None) is not None:
+                        usage_response = chunk
+                    text = chunk.text or ""
+                    if not text:
+                        continue
+                    if ttft is None:
+                        ttft = time.time() - started
+                        metrics.TTFT_SECONDS.observe(ttft, model=model)
+                    out.write(text)
+                    out.flush()
+                    received += text
+                    event = {"path": output_path, "label": label, "text": text, "chars": len(received)}
+                    if on_chunk is not None:
+                        on_chunk(event)
+                    publish(event)
+                gate.record_success()
+                metrics.MODEL_CALLS_TOTAL.inc(model=model, outcome="ok")
+                break
+            except Exception as e:
+                gate.record(e)
+                metrics.MODEL_CALLS_TOTAL.inc(model=model, outcome="error")
+                if attempt == max_retries - 1 or not _is_retryable(e):
+                    raise
+                metrics.RETRIES_TOTAL.inc(operation="stream")
+                wait_time = 5 * (attempt + 1)
+                print(f"\n   Warning: stream dropped after {len(received)} chars ({e}); resuming in {wait_time}s...")
+            finally:
+                metrics.MODEL_CALLS_IN_FLIGHT.dec()
+                scheduler.release()
+                if usage_response is not None:
+                    tracing.add_usage(usage_response, model)
+            # Back off outside the fair-share slot so other jobs can use it meanwhile.
+            time.sleep(wait_time)
+
+    tracing.annotate(ttft_seconds=ttft, streamed_chars=len(received))
+    os.replace(part_path, output_path)
+    publish({"path": output_path, "label": label, "text": "", "chars": len(received), "done": True})
+    return received
@@ -0,0 +1,214 @@
+import contextvars
+import glob
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from stt import metrics
+from stt.utils import read_json, write_json
+
+
+_current_trace = contextvars.ContextVar("stt_trace", default=None)
+_span_stack = contextvars.ContextVar("stt_span_stack", default=())
+
+
+class Trace:
+    def __init__(self, job):
+        self.job = job
+        self.started = time.time()
+        self.output_dir = None
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        with self._lock:
+            self.spans.append(record)
+
+    def to_json(self):
+        with self._lock:
+            spans = list(self.spans)
+        return {"job": self.job, "started": self.started, "spans": spans}
+
+    def to_chrome(self):
+        events = []
+        for record in self.to_json()["spans"]:
+            args = {k: v for k, v in record.items() if k not in ("stage", "name", "start", "duration", "thread")}
+            events.append(
+                {
+                    "name": record["name"],
+                    "cat": record["stage"],
+                    "ph": "X",
+                    "ts": int((record["start"] - self.started) * 1_000_000),
+                    "dur": int(record["duration"] * 1_000_000),
+                    "pid": 1,
+                    "tid": record["thread"],
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"job": self.job}}
+
+    def write(self, output_dir):
+        write_json(os.path.join(output_dir, "trace.json"), self.to_json())
+        write_json(os.path.join(output_dir, "trace.chrome.json"), self.to_chrome())
+
+
+def start_trace(job):
+    trace = Trace(job)
+    _current_trace.set(trace)
+    _span_stack.set(())
+    return trace
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def finish_trace():
+    trace = _current_trace.get()
+    _current_trace.set(None)
+    _span_stack.set(())
+    if trace is not None and trace.output_dir:
+        trace.write(trace.output_dir)
+    return trace
+
+
+@contextmanager
+def span(stage, name=None, **attrs):
+    record = {"stage": stage, "name": name or stage}
+    record.update(attrs)
+    stack = _span_stack.get()
+    token = _span_stack.set(stack + (record,))
+    start = time.time()
+    try:
+        yield record
+    except BaseException as e:
+        record["error"] = str(e)[:200]
+        raise
+    finally:
+        _span_stack.reset(token)
+        record["start"] = start
+        record["duration"] = time.time() - start
+        record["thread"] = threading.get_ident()
+        metrics.STAGE_SECONDS.observe(record["duration"], stage=stage)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(record)
+
+
+def annotate(**attrs):
+    stack = _span_stack.get()
+    if stack:
+        stack[-1].update(attrs)
+
+
+def add_usage(response, model):
+    stack = _span_stack.get()
+    usage = getattr(response, "usage_metadata", None)
+    if not stack or usage is None:
+        return
+    record = stack[-1]
+    record["model"] = model
+    record["calls"] = record.get("calls", 0) + 1
+    record["prompt_tokens"] = record.get("prompt_tokens", 0) + (usage.prompt_token_count or 0)
+    record["output_tokens"] = (
+        record.get("output_tokens", 0) + (usage.candidates_token_count or 0) + (usage.thoughts_token_count or 0)
+    )
+    record["cached_tokens"] = record.get("cached_tokens", 0) + (usage.cached_content_token_count or 0)
+
+
+def span_cost(record, config):
+    if not record.get("model"):
+        return 0.0
+    cost_cfg = config.get("cost", {})
+    fallback = cost_cfg.get("usd_per_1k_tokens", 0.0)
+    pricing = cost_cfg.get("models", {}).get(record["model"], {})
+    input_rate = pricing.get("input_per_1k", fallback)
+    output_rate = pricing.get("output_per_1k", fallback)
+    return (record.get("prompt_tokens", 0) / 1000.0) * input_rate + (record.get("output_tokens", 0) / 1000.0) * output_rate
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def load_traces(output_root):
+    traces = []
+    for path in sorted(glob.glob(os.path.join(output_root, "*", "trace.json"))):
+        try:
+            traces.append(read_json(path))
+        except Exception:
+            continue
+    return traces
+
+
+def aggregate_traces(traces, config):
+    stages = {}
+    models = {}
+    ttfts = []
+    for trace in traces:
+        for record in trace.get("spans", []):
+            if record.get("ttft_seconds") is not None:
+                ttfts.append(record["ttft_seconds"])
+            key = record.get("stage", "unknown")
+            entry = stages.setdefault(key, {"durations": [], "prompt_tokens": 0, "output_tokens": 0, "usd": 0.0})
+            entry["durations"].append(record.get("duration", 0.0))
+            entry["prompt_tokens"] += record.get("prompt_tokens", 0)
+            entry["output_tokens"] += record.get("output_tokens", 0)
+            cost = span_cost(record, config)
+            entry["usd"] += cost
+            if record.get("model"):
+                model = models.setdefault(
+                    record["model"], {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "output_tokens": 0, "usd": 0.0}
+                )
+                model["calls"] += record.get("calls", 1)
+                model["prompt_tokens"] += record.get("prompt_tokens", 0)
+                model["cached_tokens"] += record.get("cached_tokens", 0)
+                model["output_tokens"] += record.get("output_tokens", 0)
+                model["usd"] += cost
+    summary = {
+        "jobs": len(traces),
+        "stages": {},
+        "models": models,
+        "ttft": {"count": len(ttfts), "p50": percentile(ttfts, 50), "p95": percentile(ttfts, 95)},
+    }
+    for key, entry in stages.items():
+        summary["stages"][key] = {
+            "count": len(entry["durations"]),
+            "p50": percentile(entry["durations"], 50),
+            "p95": percentile(entry["durations"], 95),
+            "prompt_tokens": entry["prompt_tokens"],
+            "output_tokens": entry["output_tokens"],
+            "usd": entry["usd"],
+        }
+    return summary
+
+
+def print_trace_report(output_root, config):
+    summary = aggregate_traces(load_traces(output_root), config)
+    if not summary["jobs"]:
+        print(f"No trace.json files found under {output_root}/")
+        return summary
+    print(f"Trace report ({summary['jobs']} jobs)")
+    print(f"{'stage':<16}{'count':>7}{'p50 s':>10}{'p95 s':>10}{'in tok':>12}{'out tok':>12}{'USD':>10}")
+    for key, entry in sorted(summary["stages"].items()):
+        print(
+            f"{key:<16}{entry['count']:>7}{entry['p50']:>10.2f}{entry['p95']:>10.2f}"
+            f"{entry['prompt_tokens']:>12}{entry['output_tokens']:>12}{entry['usd']:>10.4f}"
+        )
+    if summary["ttft"]["count"]:
+        ttft = summary["ttft"]
+        print(f"Time to first token ({ttft['count']} streams): p50 {ttft['p50']:.2f}s  p95 {ttft['p95']:.2f}s")
+    print()
+    print(f"{'model':<36}{'calls':>7}{'in tok':>12}{'cached':>12}{'out tok':>12}{'USD':>10}")
+    for model, entry in sorted(summary["models"].items()):
+        print(
+            f"{model:<36}{entry['calls']:>7}{entry['prompt_tokens']:>12}{entry['cached_tokens']:>12}"
+            f"{entry['output_tokens']:>12}{entry['usd']:>10.4f}"
+        )
+    return summary
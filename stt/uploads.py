@@ -0,0 +1,218 @@
+import fnmatch
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from stt import metrics
+from stt.utils import ensure_dir, file_lock, read_json, write_json
+
+
+FILE_TTL_SECONDS = 48 * 3600
+
+DEFAULT_SETTINGS = {
+    "delete_after_success": True,
+    "pin": [],
+    "refresh_margin_seconds": 3 * 3600,
+    "stale_job_seconds": 24 * 3600,
+    "gc_interval_seconds": 600,
+}
+
+
+def expiry_timestamp(myfile, uploaded_at):
+    expiration = getattr(myfile, "expiration_time", None)
+    if expiration is not None and hasattr(expiration, "timestamp"):
+        return expiration.timestamp()
+    return uploaded_at + FILE_TTL_SECONDS
+
+
+class UploadRegistry:
+    def __init__(self, path, settings=None):
+        self.path = path
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update(settings or {})
+        self.entries = read_json(path, default={}) if path else {}
+        self._lock = threading.RLock()
+
+    def _write(self):
+        ensure_dir(os.path.dirname(self.path) or ".")
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        write_json(tmp_path, self.entries)
+        os.replace(tmp_path, self.path)
+        metrics.REMOTE_FILES_TRACKED.set(len(self.entries))
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock, file_lock(self.path):
+            self._write()
+
+    def reload(self):
+        if self.path:
+            with self._lock:
+                self.entries = read_json(self.path, default={})
+
+    @contextmanager
+    def _transaction(self):
+        # Workers in other processes and hosts share uploads.json: re-read it under the file lock and
+        # write it back before unlocking, so nobody overwrites (or deletes files for) entries it never saw.
+        with self._lock:
+            if not self.path:
+                yield self.entries
+                return
+            with file_lock(self.path):
+                self.entries = read_json(self.path, default={})
+                yield self.entries
+                self._write()
+
+    def is_pinned(self, entry):
+        if entry.get("pinned"):
+            return True
+        return any(fnmatch.fnmatch(entry.get("display_name") or "", pattern) for pattern in self.settings["pin"])
+
+    def _new_entry(self, myfile, source_path, sha256, now):
+        return {
+            "display_name": getattr(myfile, "display_name", None) or os.path.basename(source_path),
+            "source_path": os.path.abspath(source_path),
+            "sha256": sha256,
+            "uploaded_at": now,
+            "expires_at": expiry_timestamp(myfile, now),
+            "jobs": {},
+        }
+
+    def track(self, myfile, source_path, job, sha256=None):
+        now = time.time()
+        with self._transaction() as entries:
+            entry = entries.get(myfile.name)
+            if entry is None:
+                entry = entries[myfile.name] = self._new_entry(myfile, source_path, sha256, now)
+            entry["jobs"][job] = now
+        return entry
+
+    def forget(self, name):
+        with self._transaction() as entries:
+            entries.pop(name, None)
+
+    def pin(self, name, pinned=True):
+        with self._transaction() as entries:
+            if name in entries:
+                entries[name]["pinned"] = pinned
+
+    def current_name(self, name):
+        self.reload()
+        with self._lock:
+            seen = set()
+            while name in self.entries and self.entries[name].get("replaced_by") and name not in seen:
+                seen.add(name)
+                name = self.entries[name]["replaced_by"]
+        return name
+
+    def _expiring(self, entry, margin=None, now=None):
+        margin = self.settings["refresh_margin_seconds"] if margin is None else margin
+        now = time.time() if now is None else now
+        return entry is not None and entry["expires_at"] - now < margin
+
+    def expiring(self, name, margin=None, now=None):
+        with self._lock:
+            return self._expiring(self.entries.get(name), margin, now)
+
+    def _delete_remote(self, client, name):
+        try:
+            client.files.delete(name=name)
+        except Exception as e:
+            print(f"   Warning: could not delete uploaded file {name}: {e}")
+            return False
+        metrics.REMOTE_FILES_DELETED_TOTAL.inc()
+        return True
+
+    def release(self, client, name, job):
+        with self._transaction() as entries:
+            entry = entries.get(name)
+            if entry is None:
+                return False
+            entry["jobs"].pop(job, None)
+            if entry["jobs"] or self.is_pinned(entry) or not self.settings["delete_after_success"]:
+                return False
+            entries.pop(name)
+        return self._delete_remote(client, name)
+
+    def refresh(self, client, name):
+        with self._lock:
+            entry = self.entries.get(name)
+        if entry is None or not os.path.exists(entry["source_path"]):
+            return None
+        newfile = client.files.upload(file=entry["source_path"], config={"display_name": entry["display_name"]})
+        metrics.UPLOAD_BYTES_TOTAL.inc(os.path.getsize(entry["source_path"]))
+        with self._transaction() as entries:
+            fresh = entries.get(name) or dict(entry, jobs={})
+            replacement = entries[newfile.name] = self._new_entry(
+                newfile, entry["source_path"], entry.get("sha256"), time.time()
+            )
+            replacement["jobs"] = dict(fresh["jobs"])
+            fresh.update(replaced_by=newfile.name, jobs={})
+            entries[name] = fresh
+        print(f"Re-uploaded {entry['display_name']} ahead of expiry: {newfile.name}")
+        return newfile
+
+    def gc(self, client, now=None):
+        now = time.time() if now is None else now
+        stats = {"deleted": 0, "refreshed": 0, "forgotten": 0}
+        to_delete = []
+        to_refresh = []
+        with self._transaction() as entries:
+            for name, entry in list(entries.items()):
+                live_jobs = {j: t for j, t in entry["jobs"].items() if now - t < self.settings["stale_job_seconds"]}
+                if entry["expires_at"] <= now:
+                    entries.pop(name)
+                    stats["forgotten"] += 1
+                elif entry.get("replaced_by"):
+                    continue
+                elif live_jobs and self._expiring(entry, now=now):
+                    to_refresh.append(name)
+                elif not live_jobs and not self.is_pinned(entry) and self.settings["delete_after_success"]:
+                    entries.pop(name)
+                    to_delete.append(name)
+        # Remote calls run after the shared file is unlocked.
+        for name in to_delete:
+            if self._delete_remote(client, name):
+                stats["deleted"] += 1
+        for name in to_refresh:
+            try:
+                if self.refresh(client, name) is not None:
+                    stats["refreshed"] += 1
+            except Exception as e:
+                print(f"   Warning: could not refresh {name}: {e}")
+        return stats
+
+
+_registries = {}
+_lock = threading.Lock()
+
+
+def get_registry(config):
+    path = os.path.join(config["paths"]["output_dir"], ".cache", "uploads.json")
+    with _lock:
+        registry = _registries.get(path)
+        if registry is None:
+            registry = UploadRegistry(path, config.get("uploads", {}))
+            _registries[path] = registry
+        return registry
+
+
+def start_gc(client, config):
+    registry = get_registry(config)
+    interval = registry.settings["gc_interval_seconds"]
+
+    def loop():
+        while True:
+            try:
+                stats = registry.gc(client)
+                if any(stats.values()):
+                    print(f"Upload GC: {stats}")
+            except Exception as e:
+                print(f"   Warning: upload GC failed: {e}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name="stt-upload-gc", daemon=True)
+    thread.start()
+    return thread
@@ -1,7 +1,9 @@
+import hashlib
 import json
 import os
 import re
 import subprocess
+from contextlib import contextmanager
 
 
 def safe_filename(name):
@@ -24,6 +26,51 @@ def write_json(path, data):
         json.dump(data, f, ensure_ascii=False, indent=2)
 
 
+@contextmanager
+def file_lock(path):
+    # Advisory lock on <path>.lock shared by every process (and host) that writes the same file.
+    ensure_dir(os.path.dirname(path) or ".")
+    with open(path + ".lock", "a+b") as f:
+        try:
+            import fcntl
+        except ImportError:
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            return
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def update_json(path, default=None):
+    # Read-modify-write of a file shared by several processes or hosts: re-read it under the file lock,
+    # let the caller merge into the current contents, then replace it atomically.
+    with file_lock(path):
+        data = read_json(path, default=default)
+        yield data
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        write_json(tmp_path, data)
+        os.replace(tmp_path, path)
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def get_audio_duration_seconds(path):
     try:
         result = subprocess.run(
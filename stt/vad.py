@@ -0,0 +1,85 @@
+import bisect
+import re
+
+
+TIMESTAMP_RE = re.compile(r"\[(?:(\d{1,2}):)?(\d{1,3}):(\d{2})\]")
+
+
+def speech_segments(silences, duration, padding=0.25, min_speech_seconds=0.5):
+    segments = []
+    cursor = 0.0
+    for s_start, s_end in sorted(silences):
+        if s_start > cursor:
+            segments.append((cursor, s_start))
+        cursor = max(cursor, s_end)
+    if cursor < duration:
+        segments.append((cursor, duration))
+
+    padded = []
+    for start, end in segments:
+        start = max(0.0, start - padding)
+        end = min(duration, end + padding)
+        if end - start < min_speech_seconds:
+            continue
+        if padded and start <= padded[-1][1]:
+            padded[-1] = (padded[-1][0], max(padded[-1][1], end))
+        else:
+            padded.append((start, end))
+    return padded
+
+
+def build_offset_map(segments):
+    offset_map = []
+    compact = 0.0
+    for start, end in segments:
+        offset_map.append([round(compact, 3), round(start, 3), round(end - start, 3)])
+        compact += end - start
+    return offset_map
+
+
+def is_identity(offset_map):
+    return not offset_map or (len(offset_map) == 1 and offset_map[0][1] == 0)
+
+
+def to_original(seconds, offset_map):
+    if not offset_map:
+        return seconds
+    starts = [entry[0] for entry in offset_map]
+    index = max(0, bisect.bisect_right(starts, seconds) - 1)
+    compact_start, original_start, _ = offset_map[index]
+    return original_start + (seconds - compact_start)
+
+
+def format_timestamp(seconds, with_hours=False):
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours or with_hours:
+        return f"[{hours:02d}:{minutes:02d}:{secs:02d}]"
+    return f"[{minutes:02d}:{secs:02d}]"
+
+
+def remap_timestamps(text, offset_map):
+    if is_identity(offset_map):
+        return text
+
+    def replace(match):
+        hours, minutes, secs = match.groups()
+        total = int(hours or 0) * 3600 + int(minutes) * 60 + int(secs)
+        return format_timestamp(to_original(total, offset_map), with_hours=hours is not None)
+
+    return TIMESTAMP_RE.sub(replace, text)
+
+
+def remap_timestamps_in_file(path, offset_map):
+    if is_identity(offset_map):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(remap_timestamps(text, offset_map))
+
+
+def select_filter(segments):
+    parts = [f"between(t,{start:.3f},{end:.3f})" for start, end in segments]
+    return f"aselect='{'+'.join(parts)}',asetpts=N/SR/TB"
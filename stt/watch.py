@@ -1,16 +1,24 @@
 import os
 import time
 
+from stt import clients, metrics, uploads
+from stt.breaker import CircuitOpenError
 from stt.pipeline import process_target
 
 
-def run_watch(watch_path, *, config, lang, include_timestamps, with_transcript, interval=5):
+def run_watch(watch_path, *, config, lang, include_timestamps, with_transcript, translate_to=None, interval=5):
     if not os.path.isdir(watch_path):
         print(f"Watch path is not a directory: {watch_path}")
         return
     seen = set()
+    parked = {}
+    uploads.start_gc(clients.get_client(config), config)
     print(f"Watching {watch_path} for new audio files...")
     while True:
+        now = time.time()
+        pending = [path for path, ready_at in parked.items() if ready_at <= now]
+        for path in pending:
+            parked.pop(path)
         for name in os.listdir(watch_path):
             if not name.lower().endswith((".mp3", ".wav", ".m4a", ".flac", ".aac", ".ogg")):
                 continue
@@ -18,16 +26,28 @@ def run_watch(watch_path, *, config, lang, include_timestamps, with_transcript,
             if full_path in seen:
                 continue
             seen.add(full_path)
+            metrics.WATCH_FILES_TOTAL.inc()
+            pending.append(full_path)
+        metrics.QUEUE_DEPTH.set(len(pending), source="watch")
+        for full_path in pending:
             print(f"New file detected: {full_path}")
-            process_target(
-                full_path,
-                config=config,
-                lang=lang,
-                include_timestamps=include_timestamps,
-                with_transcript=with_transcript,
-                report_keys=None,
-                tts_enabled=config["defaults"].get("tts", True),
-                export_formats=config["defaults"].get("export_formats", ["md"]),
-                dry_run=False,
-            )
+            metrics.QUEUE_DEPTH.dec(source="watch")
+            try:
+                process_target(
+                    full_path,
+                    config=config,
+                    lang=lang,
+                    include_timestamps=include_timestamps,
+                    with_transcript=with_transcript,
+                    report_keys=None,
+                    tts_enabled=config["defaults"].get("tts", True),
+                    export_formats=config["defaults"].get("export_formats", ["md"]),
+                    dry_run=False,
+                    translate_to=translate_to,
+                    priority="watch",
+                )
+            except CircuitOpenError as e:
+                print(f"Parking {full_path}: {e}")
+                metrics.JOBS_PARKED_TOTAL.inc(source="watch")
+                parked[full_path] = time.time() + max(1.0, e.retry_after)
         time.sleep(interval)
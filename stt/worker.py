@@ -0,0 +1,135 @@
+import os
+import shutil
+import socket
+import threading
+import time
+
+from stt import clients, metrics, scheduler, uploads
+from stt.breaker import CircuitOpenError
+from stt.jobstore import open_store, settings_from
+from stt.pipeline import process_target
+from stt.plugins import dispatcher as plugin_dispatcher
+from stt.utils import ensure_dir
+
+
+def worker_name(n=0):
+    return f"{socket.gethostname()}:{os.getpid()}:{n}"
+
+
+def stage_source(target, output_root):
+    from stt.core import results_dir
+
+    # Any host may claim the job, so move the source under the shared output root now (analysis would move it
+    # there anyway) and store it relative to that root.
+    staged = os.path.join(results_dir(output_root, target), os.path.basename(target))
+    if not os.path.exists(staged):
+        ensure_dir(os.path.dirname(staged))
+        shutil.move(target, staged)
+        print(f"Staged {target} -> {staged}")
+    return os.path.relpath(staged, output_root)
+
+
+def job_target(job, config):
+    params = dict(job["params"])
+    source = params.pop("source", None)
+    if source:
+        staged = os.path.join(config["paths"]["output_dir"], source)
+        if os.path.exists(staged):
+            return staged, params
+    return job["target"], params
+
+
+def enqueue(store, targets, params, priorities=None, output_root=None):
+    priorities = priorities or {}
+    default_priority = scheduler.get_scheduler().settings["default_priority"]
+    added = 0
+    for target in targets:
+        job_params = dict(params, priority=priorities[target]) if target in priorities else dict(params)
+        if output_root and "://" not in target and os.path.isfile(target):
+            job_params["source"] = stage_source(target, output_root)
+        # Claim order follows the scheduler weight of the job's class, so --priority also applies across workers.
+        weight = scheduler.get_scheduler().weight(job_params.get("priority") or default_priority)
+        added += store.submit(target, job_params, priority=weight)
+    if targets:
+        print(f"Queued {added} of {len(targets)} job(s); {len(targets) - added} already known.")
+    return added
+
+
+def _heartbeat(store, job, worker, interval, stop):
+    while not stop.wait(interval):
+        try:
+            if not store.heartbeat(job["id"], worker):
+                print(f"   Warning: lost lease on {job['target']}; another worker may pick it up.")
+                return
+        except Exception as e:
+            print(f"   Warning: heartbeat failed for {job['target']}: {e}")
+
+
+def run_job(store, job, worker, config, heartbeat_seconds=30):
+    if job.get("reclaimed"):
+        metrics.LEASES_RECLAIMED_TOTAL.inc()
+        print(f"[{worker}] Re-claimed {job['target']} from an expired lease (attempt {job['attempts']}).")
+    else:
+        print(f"[{worker}] Claimed {job['target']} (attempt {job['attempts']}).")
+    stop = threading.Event()
+    beat = threading.Thread(
+        target=_heartbeat, args=(store, job, worker, heartbeat_seconds, stop), name="stt-heartbeat", daemon=True
+    )
+    beat.start()
+    try:
+        target, params = job_target(job, config)
+        result = process_target(target, config=config, dry_run=False, **params)
+    except CircuitOpenError as e:
+        print(f"Parking {job['target']}: {e}")
+        metrics.JOBS_PARKED_TOTAL.inc(source="worker")
+        store.park(job["id"], worker, max(1.0, e.retry_after), str(e))
+        return "parked"
+    except Exception as e:
+        print(f"Job failed for {job['target']}: {e}")
+        store.fail(job["id"], worker, e)
+        return "failed"
+    finally:
+        stop.set()
+    if not result:
+        store.fail(job["id"], worker, "analysis did not finish")
+        return "failed"
+    if not store.complete(job["id"], worker):
+        print(f"   Warning: {job['target']} finished after its lease was lost.")
+    return "done"
+
+
+def _loop(store, worker, config, settings):
+    while True:
+        job = store.claim(worker)
+        if job is None:
+            counts = store.counts()
+            metrics.QUEUE_DEPTH.set(counts.get("queued", 0), source="worker")
+            if settings["exit_when_idle"] and not counts.get("queued") and not counts.get("leased"):
+                return
+            time.sleep(settings["poll_seconds"])
+            continue
+        run_job(store, job, worker, config, settings["heartbeat_seconds"])
+
+
+def run_worker(config, *, targets=None, params=None, priorities=None, concurrency=1):
+    settings = settings_from(config)
+    store = open_store(config)
+    if targets:
+        enqueue(store, targets, params or {}, priorities, config["paths"]["output_dir"])
+    uploads.start_gc(clients.get_client(config), config)
+    print(f"Worker {worker_name()} polling {settings['store']} job store ({concurrency} slot(s))...")
+    threads = [
+        threading.Thread(
+            target=_loop, args=(store, worker_name(n), config, settings), name=f"stt-worker-{n}", daemon=True
+        )
+        for n in range(max(1, concurrency))
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("Worker stopped; leases held by this process will expire and be re-claimed.")
+    plugin_dispatcher.flush()
+    print(f"Job store: {store.counts()}")
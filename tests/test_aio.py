@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from google.genai import types
+
+from stt import aio, breaker, scheduler
+from stt.breaker import CircuitOpenError
+
+
+class FakeState:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeFile:
+    def __init__(self, name, states):
+        self.name = name
+        self._states = states
+
+    @property
+    def state(self):
+        return FakeState(self._states[0])
+
+
+class FakeAsyncFiles:
+    async def list(self):
+        async def pager():
+            for n in ("a", "b"):
+                yield FakeFile(n, ["ACTIVE"])
+
+        return pager()
+
+
+class FakeResp:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeAsyncModels:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def generate_content(self, model, contents, config=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return FakeResp(f"{model}:{contents}")
+
+
+class FakeAsyncClient:
+    def __init__(self):
+        self.files = FakeAsyncFiles()
+        self.models = FakeAsyncModels()
+
+
+class FakeClient:
+    def __init__(self):
+        self.aio = FakeAsyncClient()
+
+
+def test_sync_bridge_multiplexes_on_one_loop():
+    runner = aio.LoopRunner(max_in_flight=8)
+    try:
+        bridge = aio.SyncClient(FakeClient(), runner)
+        assert bridge.models.generate_content(model="m", contents="hi").text == "m:hi"
+        assert [f.name for f in bridge.files.list()] == ["a", "b"]
+        futures = [runner.submit(bridge.aio.models.generate_content(model="m", contents=i)) for i in range(20)]
+        assert [f.result(5).text for f in futures] == [f"m:{i}" for i in range(20)]
+        assert bridge.aio.models.peak > 1
+    finally:
+        runner.close()
+
+
+def test_tts_chunks_go_through_breaker_and_scheduler():
+    class AudioModels:
+        async def generate_content(self, model, contents, config=None):
+            data = types.Blob(data=b"pcm", mime_type="audio/pcm")
+            return types.GenerateContentResponse(
+                candidates=[types.Candidate(content=types.Content(parts=[types.Part(inline_data=data)]))]
+            )
+
+    client = FakeClient()
+    client.aio.models = AudioModels()
+    runner = aio.LoopRunner()
+    try:
+        bridge = aio.SyncClient(client, runner)
+        granted = scheduler.get_scheduler().granted.get("interactive", 0)
+        with scheduler.priority_scope("interactive"):
+            results = bridge.run(aio.synthesize_chunks(bridge.aio, "tts-model", ["one", " ", "two"], "English"))
+        assert [pcm for pcm, _ in results] == [b"pcm", b"", b"pcm"]
+        assert scheduler.get_scheduler().granted["interactive"] == granted + 2
+        assert scheduler.get_scheduler().in_use == 0
+
+        gate = breaker.get("gemini:tts-model")
+        for _ in range(gate.failure_threshold):
+            gate.record_failure(ConnectionError("reset"))
+        with pytest.raises(CircuitOpenError):
+            bridge.run(aio.synthesize_chunks(bridge.aio, "tts-model", ["three"], "English"))
+        gate.record_success()
+    finally:
+        runner.close()
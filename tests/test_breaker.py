@@ -0,0 +1,68 @@
+import pytest
+
+from stt import breaker, pipeline
+
+
+def test_breaker_opens_half_opens_and_closes(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(breaker.time, "time", lambda: now[0])
+    gate = breaker.CircuitBreaker("test:dep", failure_threshold=2, reset_seconds=30)
+
+    def fail():
+        raise ConnectionError("connection reset")
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            gate.call(fail)
+    assert gate.state == breaker.OPEN
+    with pytest.raises(breaker.CircuitOpenError) as info:
+        gate.call(lambda: "ok")
+    assert info.value.retry_after == 30
+
+    now[0] += 31
+    assert gate.call(lambda: "ok") == "ok"
+    assert gate.state == breaker.CLOSED
+
+
+def test_client_errors_do_not_trip_the_breaker():
+    gate = breaker.CircuitBreaker("test:client", failure_threshold=1)
+    with pytest.raises(ValueError):
+        gate.call(lambda: (_ for _ in ()).throw(ValueError("400 INVALID_ARGUMENT")))
+    assert gate.state == breaker.CLOSED
+
+
+def test_failed_half_open_probe_reopens(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(breaker.time, "time", lambda: now[0])
+    gate = breaker.CircuitBreaker("test:probe", failure_threshold=1, reset_seconds=10)
+    gate.record_failure("503")
+    now[0] = 11
+    gate.before_call()
+    assert gate.state == breaker.HALF_OPEN
+    with pytest.raises(breaker.CircuitOpenError):
+        gate.before_call()
+    gate.record_failure("503")
+    assert gate.state == breaker.OPEN
+
+
+def test_batch_parks_and_requeues_jobs(monkeypatch):
+    attempts = []
+
+    def fake_process(target, **kwargs):
+        attempts.append(target)
+        if target == "a" and attempts.count("a") == 1:
+            raise breaker.CircuitOpenError("gemini:m", 0)
+
+    class Clock:
+        now = 0.0
+
+        def time(self):
+            return self.now
+
+        def sleep(self, seconds):
+            self.now += seconds
+
+    monkeypatch.setattr(pipeline, "process_target", fake_process)
+    monkeypatch.setattr(pipeline, "time", Clock())
+    pipeline.run_batch(["a", "b"], concurrency=1)
+    assert attempts == ["a", "b", "a"]
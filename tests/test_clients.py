@@ -0,0 +1,41 @@
+import threading
+
+from stt import clients
+
+
+def test_http_session_is_shared_and_pooled():
+    clients.reset()
+    clients.configure({"http": {"max_connections": 7, "max_keepalive_connections": 3}})
+    try:
+        session = clients.get_http_session()
+        assert clients.get_http_session() is session
+        adapter = session.get_adapter("https://example.com")
+        assert adapter._pool_maxsize == 7
+        assert adapter._pool_connections == 3
+    finally:
+        clients.configure({})
+        clients.reset()
+
+
+def test_configure_falls_back_to_defaults():
+    clients.configure({"http": {"timeout_ms": 5}})
+    try:
+        settings = clients.http_settings()
+        assert settings["timeout_ms"] == 5
+        assert settings["max_connections"] == clients.DEFAULT_HTTP["max_connections"]
+    finally:
+        clients.configure({})
+
+
+def test_concurrent_callers_get_one_session():
+    clients.reset()
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(clients.get_http_session())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    try:
+        assert len({id(s) for s in seen}) == 1
+    finally:
+        clients.reset()
@@ -0,0 +1,85 @@
+import threading
+
+from stt import compare
+from stt.utils import file_sha256, write_json
+
+
+def test_build_comparison_groups_then_merges_pairwise():
+    calls = []
+    lock = threading.Lock()
+
+    def generate(contents, message):
+        with lock:
+            calls.append(contents[0].split()[0])
+        return f"merged({len(contents) - 1})"
+
+    entries = [{"labels": [f"[{i}]"], "text": f"summary {i}"} for i in range(1, 10)]
+    settings = dict(compare.DEFAULT_SETTINGS, group_size=3)
+    text, tree = compare.build_comparison(entries, generate, settings)
+
+    assert text == "merged(2)"
+    assert [len(level) for level in tree] == [3, 2, 1]
+    assert tree[-1] == [[f"[{i}]" for i in range(1, 10)]]
+    assert calls.count("Compare") == 3
+    assert calls.count("Each") == 2
+
+
+def test_small_sets_use_a_single_call():
+    calls = []
+    entries = [{"labels": ["[1]"], "text": "a"}, {"labels": ["[2]"], "text": "b"}]
+    text, tree = compare.build_comparison(entries, lambda contents, message: calls.append(contents) or "done", compare.DEFAULT_SETTINGS)
+    assert text == "done"
+    assert len(calls) == 1 and len(calls[0]) == 3
+    assert tree == [[["[1]", "[2]"]]]
+
+
+def test_groups_close_on_character_budget():
+    entries = [{"labels": [str(i)], "text": "x" * 40} for i in range(5)]
+    assert [len(g) for g in compare.group_entries(entries, 4, 100)] == [2, 2, 1]
+
+
+def test_run_compare_reuses_reports_cache_and_catalog(tmp_path, monkeypatch):
+    output_root = tmp_path / "output"
+    config = {"paths": {"output_dir": str(output_root)}, "compare": {"concurrency": 2}}
+
+    done = output_root / "talk_results"
+    done.mkdir(parents=True)
+    (output_root / ".cache").mkdir()
+    (done / "talk_professional_en_report.md").write_text("# Talk report", encoding="utf-8")
+    write_json(str(output_root / "index.json"), {"items": [{"title": "talk", "path": str(done), "sha256": "t1"}]})
+
+    fresh = tmp_path / "fresh.wav"
+    fresh.write_bytes(b"fresh audio")
+    cached = tmp_path / "cached.wav"
+    cached.write_bytes(b"cached audio")
+    write_json(
+        str(output_root / ".cache" / "compare_summaries.json"),
+        {f"{file_sha256(str(cached))}:en:{compare.SUMMARY_VERSION}": "cached summary"},
+    )
+
+    summarized = []
+    prompts = []
+    monkeypatch.setattr(compare.clients, "get_client", lambda config: object())
+    monkeypatch.setattr(compare.routing, "model_chain", lambda config, task: ["model"])
+    monkeypatch.setattr(
+        compare, "_summarize_upload", lambda client, model_id, item, config, lang, job_key: summarized.append(item["label"]) or "fresh summary"
+    )
+
+    class Response:
+        text = "# Similarities"
+
+    monkeypatch.setattr(compare, "generate_quietly", lambda client, model, contents, config, message: prompts.append(contents) or Response())
+
+    out_path = compare.run_compare(
+        [str(fresh), str(cached), "catalog:tal*"], config=config, lang="en", include_timestamps=False, with_transcript=False
+    )
+
+    assert summarized == ["fresh"]
+    assert "Summary [2] cached:\ncached summary" in prompts[0]
+    assert "Summary [3] talk:\n# Talk report" in prompts[0]
+    assert open(out_path, encoding="utf-8").read() == "# Similarities"
+    sources = compare.read_json(str(output_root / "fresh_vs_cached_vs_talk_comparison" / "sources.json"))
+    assert [s["summary"] for s in sources["sources"]] == ["model", "cache", "report"]
+
+    compare.run_compare([str(fresh), str(cached)], config=config, lang="en", include_timestamps=False, with_transcript=False)
+    assert summarized == ["fresh"]
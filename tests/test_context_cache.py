@@ -0,0 +1,72 @@
+from google.genai import types
+
+from stt import context_cache
+
+
+class Cached:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeCaches:
+    def __init__(self):
+        self.created = []
+        self.deleted = []
+
+    def create(self, model, config=None):
+        self.created.append((model, config))
+        return Cached(f"cachedContents/{len(self.created)}")
+
+    def delete(self, name):
+        self.deleted.append(name)
+
+
+class FakeClient:
+    def __init__(self):
+        self.caches = FakeCaches()
+
+
+CONFIG = {"context_cache": {"min_ttl_seconds": 60, "seconds_per_call": 30, "max_ttl_seconds": 600}}
+
+
+def test_ttl_tracks_planned_calls():
+    assert context_cache.ttl_seconds(4, CONFIG) == 180
+    assert context_cache.ttl_seconds(100, CONFIG) == 600
+
+
+def test_generator_uses_cache_and_scope_deletes_it():
+    client = FakeClient()
+    media = types.File(name="files/abc", uri="https://example.com/files/abc", mime_type="audio/wav")
+    seen = []
+
+    def generator(client, model, contents, config, message):
+        seen.append((contents, config.cached_content))
+        return "ok"
+
+    with context_cache.job_scope(CONFIG):
+        cache = context_cache.create_media_cache(client, "m", media, 3, CONFIG)
+        wrapped = cache.wrap_generator(generator)
+        wrapped(client, "m", contents=[media, "prompt"], config=types.GenerateContentConfig(temperature=0.2), message="x")
+        wrapped(client, "other-model", contents=[media, "prompt"], config=types.GenerateContentConfig(), message="x")
+    assert client.caches.created[0][1].ttl == "150s"
+    assert seen[0] == (["prompt"], "cachedContents/1")
+    assert seen[1][1] is None and seen[1][0][0] is media
+    assert client.caches.deleted == ["cachedContents/1"]
+
+
+def test_expired_cache_falls_back_to_inline_media():
+    client = FakeClient()
+    media = types.File(name="files/abc", uri="https://example.com/files/abc", mime_type="audio/wav")
+    calls = []
+
+    def generator(client, model, contents, config, message):
+        calls.append(contents)
+        if config.cached_content:
+            raise RuntimeError("404 CachedContent not found")
+        return "ok"
+
+    cache = context_cache.create_media_cache(client, "m", media, 2, CONFIG)
+    wrapped = cache.wrap_generator(generator)
+    assert wrapped(client, "m", contents=[media, "p"], config=types.GenerateContentConfig(), message="x") == "ok"
+    assert calls[-1][0] is media
+    assert not cache.active
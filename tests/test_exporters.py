@@ -1,7 +1,98 @@
-from stt.exporters import markdown
+from stt.exporters import engine, markdown, pdf
+from stt.exporters.document import parse_markdown
+from stt.exporters.html import render_html
 
 
 def test_export_markdown(tmp_path):
     path = tmp_path / "out.md"
     markdown.export_markdown("hello", str(path))
     assert path.read_text(encoding="utf-8") == "hello"
+
+
+REPORT = """# Weekly **Summary**
+
+First line of a
+wrapped paragraph with `code` and a [link](https://example.com).
+
+- one
+  - nested *item*
+- two
+
+1. first
+2. second
+
+> quoted text
+
+| A | B |
+|---|---|
+| 1 | **2** |
+
+---
+"""
+
+
+def test_parse_markdown_blocks():
+    document = parse_markdown(REPORT)
+    kinds = [block["type"] for block in document["blocks"]]
+    assert kinds == ["heading", "paragraph", "list", "list", "quote", "table", "rule"]
+    assert document["title"] == "Weekly Summary"
+    paragraph = document["blocks"][1]["spans"]
+    assert "".join(span["text"] for span in paragraph).startswith("First line of a wrapped paragraph")
+    assert any(span["code"] for span in paragraph)
+    assert any(span["link"] == "https://example.com" for span in paragraph)
+    assert [item["level"] for item in document["blocks"][2]["items"]] == [0, 1, 0]
+    assert document["blocks"][3]["ordered"] is True
+    assert document["blocks"][5]["rows"][1][1][0]["bold"] is True
+
+
+def test_parse_markdown_joins_cjk_lines_and_detects_script():
+    document = parse_markdown("# 总结\n\n第一行\n第二行")
+    assert document["script"] == "zh"
+    assert document["blocks"][1]["spans"][0]["text"] == "第一行第二行"
+    assert parse_markdown("こんにちは")["script"] == "ja"
+
+
+def test_render_html_escapes_and_nests_lists():
+    html = render_html(parse_markdown("- a <b>\n  - b\n- c"))
+    assert "a &lt;b&gt;" in html
+    assert "<ul><li>a &lt;b&gt;<ul><li>b</li></ul></li><li>c</li></ul>" in html
+
+
+def test_render_html_drops_unsafe_links():
+    html = render_html(parse_markdown("[x](javascript:alert(1)) [y](JavaScript:1) [m](mailto:a@b.c) [w](https://e.com)"))
+    assert "javascript" not in html.lower()
+    assert '<a href="mailto:a@b.c">m</a>' in html
+    assert '<a href="https://e.com">w</a>' in html
+    assert "x" in html and "y" in html
+
+
+def test_pdf_markup_drops_unsafe_links():
+    spans = parse_markdown("[x](javascript:alert(1)) [w](https://e.com)")["blocks"][0]["spans"]
+    markup = pdf._markup(spans, "Courier")
+    assert "javascript" not in markup.lower()
+    assert '<a href="https://e.com" color="blue">w</a>' in markup
+
+
+def test_export_reports_renders_all_formats_and_skips_unchanged(tmp_path):
+    report = tmp_path / "Talk_professional_zh_report.md"
+    report.write_text(REPORT + "\n中文段落，测试换行。\n", encoding="utf-8")
+    config = {"export": {"workers": 1}}
+
+    assert engine.export_reports(str(tmp_path), ["pdf", "docx", "html"], config)["rendered"] == 3
+    for suffix in (".pdf", ".docx", ".html"):
+        assert (tmp_path / f"Talk_professional_zh_report{suffix}").stat().st_size > 0
+    assert not list(tmp_path.glob("*.part"))
+    assert engine.export_reports(str(tmp_path), ["pdf", "docx", "html"], config) == {"rendered": 0, "skipped": 3, "failed": 0}
+
+    report.write_text("# Changed\n", encoding="utf-8")
+    assert engine.export_reports(str(tmp_path), ["html"], config)["rendered"] == 1
+    assert "Changed" in (tmp_path / "Talk_professional_zh_report.html").read_text(encoding="utf-8")
+
+
+def test_export_tree_uses_process_pool(tmp_path):
+    for name in ("a_results", "b_results"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / f"{name}_professional_en_report.md").write_text(REPORT, encoding="utf-8")
+    summary = engine.export_tree(str(tmp_path), ["html", "pdf"], {"export": {"workers": 2}})
+    assert summary == {"rendered": 4, "skipped": 0, "failed": 0, "directories": 2}
+    assert (tmp_path / "b_results" / "b_results_professional_en_report.pdf").exists()
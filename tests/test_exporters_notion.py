@@ -0,0 +1,176 @@
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from stt import clients
+from stt.exporters import notion
+
+pytest.importorskip("notion_client")
+
+
+class MockNotion:
+    def __init__(self):
+        self.pages = {}
+        self.blocks = {}
+        self.children = {}
+        self.max_batch = 0
+        self.throttle = 1
+        self.lock = threading.Lock()
+
+    def _store(self, parent_id, blocks):
+        created = []
+        for block in blocks:
+            block = dict(block)
+            block_id = str(uuid.uuid4())
+            inline = block.get(block["type"], {}).pop("children", [])
+            block.update({"id": block_id, "has_children": bool(inline)})
+            self.blocks[block_id] = block
+            self.children.setdefault(parent_id, []).append(block_id)
+            self._store(block_id, inline)
+            created.append(block)
+        return created
+
+    def tree(self, parent_id):
+        out = []
+        for block_id in self.children.get(parent_id, []):
+            block = self.blocks[block_id]
+            body = block.get(block["type"], {})
+            text = "".join(t["text"]["content"] for t in body.get("rich_text", []))
+            out.append((block["type"], text, self.tree(block_id)))
+        return out
+
+    def handle(self, method, path, query, body):
+        parts = path.strip("/").split("/")[1:]
+        with self.lock:
+            if method == "POST" and parts == ["pages"]:
+                page_id = str(uuid.uuid4())
+                self.pages[page_id] = {"object": "page", "id": page_id, "properties": body["properties"], "in_trash": False}
+                return 200, self.pages[page_id]
+            if parts[0] == "pages":
+                page = self.pages.get(parts[1])
+                if page is None:
+                    return 404, {"object": "error", "status": 404, "code": "object_not_found", "message": "missing"}
+                if method == "PATCH":
+                    page["properties"] = body["properties"]
+                return 200, page
+            if parts[0] == "blocks" and parts[2:] == ["children"] and method == "PATCH":
+                if self.throttle:
+                    self.throttle -= 1
+                    return 429, {"object": "error", "status": 429, "code": "rate_limited", "message": "slow down"}
+                children = body["children"]
+                count = sum(1 + len(c.get(c["type"], {}).get("children", [])) for c in children)
+                self.max_batch = max(self.max_batch, count)
+                assert count <= 100
+                for block in children:
+                    for text in block.get(block["type"], {}).get("rich_text", []):
+                        assert len(text["text"]["content"]) <= 2000
+                return 200, {"object": "list", "results": self._store(parts[1], children)}
+            if parts[0] == "blocks" and parts[2:] == ["children"]:
+                ids = self.children.get(parts[1], [])
+                start = int(query.get("start_cursor", ["0"])[0])
+                size = int(query.get("page_size", ["100"])[0])
+                more = start + size < len(ids)
+                results = [self.blocks[i] for i in ids[start : start + size]]
+                return 200, {"object": "list", "results": results, "has_more": more, "next_cursor": str(start + size) if more else None}
+            if parts[0] == "blocks" and method == "DELETE":
+                for ids in self.children.values():
+                    if parts[1] in ids:
+                        ids.remove(parts[1])
+                return 200, self.blocks.pop(parts[1])
+        return 400, {"object": "error", "status": 400, "code": "invalid_request", "message": path}
+
+
+@pytest.fixture
+def mock_notion():
+    mock = MockNotion()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _serve(self):
+            url = urlparse(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length)) if length else {}
+            status, payload = mock.handle(self.command, url.path, parse_qs(url.query), body)
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            if status == 429:
+                self.send_header("Retry-After", "0")
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PATCH = do_DELETE = _serve
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    mock.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield mock
+    server.shutdown()
+    clients.reset()
+
+
+def _config(mock):
+    return {"token": "secret", "database_id": "db", "base_url": mock.base_url, "requests_per_second": 0}
+
+
+def test_to_nodes_nests_lists_and_splits_long_text():
+    from stt.exporters.document import parse_markdown
+
+    nodes = notion.to_nodes(parse_markdown("- a\n  - b\n    - c\n- d\n\n" + "x" * 4500))
+    assert [n["block"]["type"] for n in nodes] == ["bulleted_list_item", "bulleted_list_item", "paragraph"]
+    assert nodes[0]["children"][0]["children"][0]["block"]["bulleted_list_item"]["rich_text"][0]["text"]["content"] == "c"
+    assert [len(t["text"]["content"]) for t in nodes[2]["block"]["paragraph"]["rich_text"]] == [2000, 2000, 500]
+    assert [len(b) for b in notion.batches([nodes[1]] * 250)] == [100, 100, 50]
+    assert {len(b) for b in notion.batches([nodes[2]] * 20, max_bytes=20000)} == {4}
+
+
+def test_rich_text_keeps_only_absolute_web_links():
+    from stt.exporters.document import parse_markdown
+
+    spans = parse_markdown("[a](#intro) [b](notes.md) [c](javascript:x) [d](https://e.com)")["blocks"][0]["spans"]
+    links = [item["text"].get("link") for item in notion.rich_text(spans) if item["text"]["content"].strip()]
+    assert links == [None, None, None, {"url": "https://e.com"}]
+
+
+def test_export_reports_batches_and_updates_page_by_hash(tmp_path, mock_notion):
+    job = tmp_path / "Talk_results"
+    job.mkdir()
+    paragraphs = "\n\n".join(f"Paragraph {i}" for i in range(230))
+    table = "| A | B |\n|---|---|\n" + "\n".join(f"| {i} | **{i}** |" for i in range(120))
+    report = job / "Talk_professional_en_report.md"
+    report.write_text(f"# Talk\n\n- one\n  - nested\n    - deeper\n- two\n\n{paragraphs}\n\n{table}\n", encoding="utf-8")
+
+    pages = notion.export_reports(str(job), _config(mock_notion), "Talk", sha256="abc", output_root=str(tmp_path))
+    assert list(pages) == ["abc:professional_en"]
+    page_id = pages["abc:professional_en"]
+    tree = mock_notion.tree(page_id)
+    assert [t[0] for t in tree[:3]] == ["heading_1", "bulleted_list_item", "bulleted_list_item"]
+    assert tree[1][2] == [("bulleted_list_item", "nested", [("bulleted_list_item", "deeper", [])])]
+    assert [t[1] for t in tree[3:233]] == [f"Paragraph {i}" for i in range(230)]
+    assert tree[-1][0] == "table" and len(tree[-1][2]) == 121
+    assert mock_notion.max_batch <= 100
+
+    report.write_text("# Talk v2\n\nOnly this.\n", encoding="utf-8")
+    again = notion.export_reports(str(job), _config(mock_notion), "Talk", sha256="abc", output_root=str(tmp_path))
+    assert again == pages
+    assert len(mock_notion.pages) == 1
+    assert mock_notion.tree(page_id) == [("heading_1", "Talk v2", []), ("paragraph", "Only this.", [])]
+    assert json.loads((tmp_path / ".cache" / "notion_pages.json").read_text()) == pages
+
+
+def test_missing_page_is_recreated(tmp_path, mock_notion):
+    config = _config(mock_notion)
+    pages_path = str(tmp_path / "pages.json")
+    first = notion.export_notion("hello", config, key="k", pages_path=pages_path)
+    mock_notion.pages.pop(first["k"])
+    second = notion.export_notion("hello again", config, key="k", pages_path=pages_path)
+    assert second["k"] != first["k"]
+    assert mock_notion.tree(second["k"]) == [("paragraph", "hello again", [])]
@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from stt import filestate
+
+
+class State:
+    def __init__(self, name):
+        self.name = name
+
+
+class File:
+    def __init__(self, name, state):
+        self.name = name
+        self.state = State(state)
+
+
+class FakeFiles:
+    def __init__(self, ready_after):
+        self.ready_after = ready_after
+        self.gets = {}
+        self.lists = 0
+        self._lock = threading.Lock()
+
+    def _state(self, name):
+        polls = self.gets.get(name, 0)
+        target = self.ready_after[name]
+        if target == "FAILED":
+            return "FAILED"
+        return "ACTIVE" if polls >= target else "PROCESSING"
+
+    def get(self, name):
+        with self._lock:
+            self.gets[name] = self.gets.get(name, 0) + 1
+        return File(name, self._state(name))
+
+    def list(self):
+        with self._lock:
+            self.lists += 1
+            for name in self.ready_after:
+                self.gets[name] = self.gets.get(name, 0) + 1
+        return [File(name, self._state(name)) for name in self.ready_after]
+
+
+class FakeClient:
+    def __init__(self, ready_after):
+        self.files = FakeFiles(ready_after)
+
+
+FAST = {"min_interval_seconds": 0.01, "max_interval_seconds": 0.02, "seconds_per_mb": 0, "list_threshold": 3, "coalesce_seconds": 0.1}
+
+
+def test_waiters_wake_when_active_and_failures_raise():
+    client = FakeClient({"files/a": 2, "files/b": "FAILED"})
+    watcher = filestate.FileStateWatcher(client, FAST)
+    assert watcher.wait("files/a", timeout=5).state.name == "ACTIVE"
+    with pytest.raises(filestate.FileProcessingFailed):
+        watcher.wait("files/b", timeout=5)
+
+
+def test_timeout_applies():
+    client = FakeClient({"files/slow": 10**6})
+    watcher = filestate.FileStateWatcher(client, FAST)
+    with pytest.raises(TimeoutError):
+        watcher.wait("files/slow", timeout=0.05)
+
+
+def test_many_pending_files_share_one_list_call():
+    names = [f"files/{n}" for n in range(5)]
+    client = FakeClient({name: 1 for name in names})
+    watcher = filestate.FileStateWatcher(client, FAST)
+    for name in names:
+        watcher.watch(name, timeout=5)
+    results = [watcher.wait(name, timeout=5) for name in names]
+    assert all(r.state.name == "ACTIVE" for r in results)
+    assert client.files.lists >= 1
+
+
+def test_bad_file_object_fails_that_wait_and_keeps_the_watcher_alive():
+    client = FakeClient({"files/ok": 1})
+    real_get = client.files.get
+    client.files.get = lambda name: object() if name == "files/broken" else real_get(name)
+    watcher = filestate.FileStateWatcher(client, FAST)
+    with pytest.raises(AttributeError):
+        watcher.wait("files/broken", timeout=5)
+    assert watcher.wait("files/ok", timeout=5).state.name == "ACTIVE"
+
+
+def test_wait_is_bounded_when_the_watcher_thread_is_gone(monkeypatch):
+    watcher = filestate.FileStateWatcher(FakeClient({"files/a": 1}), dict(FAST, wait_slack_seconds=0.05))
+    monkeypatch.setattr(watcher, "_ensure_thread", lambda: None)
+    with pytest.raises(TimeoutError):
+        watcher.wait("files/a", timeout=0.05)
+    assert watcher.entries == {}
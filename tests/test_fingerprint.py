@@ -0,0 +1,87 @@
+import array
+import math
+import random
+import wave
+
+from stt import core, fingerprint
+from stt.utils import read_json
+
+
+def _speech(seed, seconds, rate=2000):
+    rng = random.Random(seed)
+    samples = []
+    env = target = phase = 0.0
+    freq = 200.0
+    for t in range(seconds * rate):
+        if t % 150 == 0:
+            target = rng.choice([0.0, 0.1, 0.5, 1.0, 0.8])
+            freq = rng.uniform(100, 800)
+        env += (target - env) * 0.01
+        phase += 2 * math.pi * freq / rate
+        samples.append(env * (0.6 * math.sin(phase) + 0.4 * rng.uniform(-1, 1)))
+    return samples
+
+
+def _pcm(samples, gain=1.0, noise=0.0, seed=9):
+    rng = random.Random(seed)
+    return array.array("h", [int(8000 * (gain * v + noise * rng.uniform(-1, 1))) for v in samples])
+
+
+def _write_wav(path, samples, rate=2000):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.tobytes())
+
+
+def test_reencoded_copy_matches_and_unrelated_audio_does_not():
+    original = _speech(1, 120)
+    words = fingerprint.fingerprint_samples(_pcm(original), 2000, 50)
+    copy = fingerprint.fingerprint_samples(_pcm([0.0] * 1234 + original, gain=0.5, noise=0.05), 2000, 50)
+    other = fingerprint.fingerprint_samples(_pcm(_speech(2, 120)), 2000, 50)
+
+    score, offset = fingerprint.similarity(words, copy, min_overlap=600)
+    assert score > 0.8
+    assert abs(offset * 0.05 + 0.617) < 0.1
+    assert fingerprint.similarity(words, other, min_overlap=600)[0] < 0.6
+    assert fingerprint.decode_words(fingerprint.encode_words(words)) == words
+
+
+def test_index_only_matches_finished_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(fingerprint.probe, "probe_duration", lambda path, config=None: None)
+    config = {"paths": {"output_dir": str(tmp_path / "output")}, "dedup": {"min_overlap_seconds": 30}}
+    speech = _speech(3, 90)
+    _write_wav(tmp_path / "podcast.wav", _pcm(speech))
+    _write_wav(tmp_path / "youtube.wav", _pcm([0.0] * 3000 + speech, gain=0.7, noise=0.03))
+
+    assert fingerprint.find_duplicate(str(tmp_path / "podcast.wav"), "aaa", "out/podcast", config) is None
+    assert fingerprint.find_duplicate(str(tmp_path / "youtube.wav"), "bbb", "out/youtube", config) is None
+    fingerprint.remember(config, "out/podcast")
+    match = fingerprint.find_duplicate(str(tmp_path / "youtube.wav"), "bbb", "out/youtube", config)
+    assert match["output_dir"] == "out/podcast"
+    assert abs(match["offset_seconds"] - 1.5) <= 0.1
+
+    strict = dict(config, dedup={"min_overlap_seconds": 30, "threshold": 0.99})
+    assert fingerprint.find_duplicate(str(tmp_path / "youtube.wav"), "bbb", "out/youtube", strict) is None
+    assert fingerprint.find_duplicate(str(tmp_path / "podcast.wav"), "aaa", "out/copy", strict)["similarity"] == 1.0
+
+
+def test_rerun_duplicate_keeps_one_index_row(tmp_path):
+    item = {"title": "copy", "path": str(tmp_path / "copy_results"), "sha256": "s", "duplicate_of": "orig"}
+    core.add_index_item(str(tmp_path), {"title": "orig", "path": "orig", "sha256": "o"})
+    core.add_index_item(str(tmp_path), item)
+    core.add_index_item(str(tmp_path), dict(item))
+    items = read_json(str(tmp_path / "index.json"))["items"]
+    assert [i["title"] for i in items] == ["orig", "copy"]
+
+
+def test_indexes_sharing_a_file_keep_each_others_entries(tmp_path):
+    path = str(tmp_path / "fingerprints.json")
+    first, second = fingerprint.FingerprintIndex(path), fingerprint.FingerprintIndex(path)
+    fp = {"duration": 1.0, "words": [1, 2, 3]}
+    first.put("a_results", "sa", fp)
+    second.put("b_results", "sb", fp)
+    first.mark_done("a_results")
+    assert sorted(read_json(path)) == ["a_results", "b_results"]
+    assert second.find("b_results", "sa", fp, fingerprint.resolve_settings({}))["output_dir"] == "a_results"
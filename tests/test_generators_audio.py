@@ -0,0 +1,47 @@
+import pytest
+from google.genai import types
+
+from stt import breaker, scheduler
+from stt.breaker import CircuitOpenError
+from stt.generators import audio
+
+
+def _audio_response():
+    data = types.Blob(data=b"pcm", mime_type="audio/pcm")
+    return types.GenerateContentResponse(
+        candidates=[types.Candidate(content=types.Content(parts=[types.Part(inline_data=data)]))]
+    )
+
+
+class FlakyModels:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("connection reset")
+        return _audio_response()
+
+
+class FakeClient:
+    def __init__(self):
+        self.models = FlakyModels()
+
+
+def test_sequential_tts_goes_through_breaker_and_scheduler(monkeypatch):
+    slots_during_sleep = []
+    monkeypatch.setattr(audio.time, "sleep", lambda s: slots_during_sleep.append(scheduler.get_scheduler().in_use))
+    granted = scheduler.get_scheduler().granted.get("interactive", 0)
+    with scheduler.priority_scope("interactive"):
+        pcm = audio.synthesize_sequential(FakeClient(), "seq-tts", ["one", " "], "English")
+    assert bytes(pcm) == b"pcm"
+    assert scheduler.get_scheduler().granted["interactive"] == granted + 2
+    assert set(slots_during_sleep) == {0}
+
+    gate = breaker.get("gemini:seq-tts")
+    for _ in range(gate.failure_threshold):
+        gate.record_failure(ConnectionError("reset"))
+    with pytest.raises(CircuitOpenError):
+        audio.synthesize_sequential(FakeClient(), "seq-tts", ["two"], "English")
+    gate.record_success()
@@ -0,0 +1,103 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from stt import hedging, ratelimit
+
+
+def test_threshold_learned_from_samples():
+    hedger = hedging.Hedger({"enabled": True, "min_samples": 5, "default_threshold_seconds": 30})
+    assert hedger.threshold("report") == 30
+    for seconds in (1, 2, 3, 4, 10):
+        hedger.observe("report", seconds)
+    assert hedger.threshold("report") == 10
+
+
+def test_seed_from_traces_uses_single_call_spans():
+    hedger = hedging.Hedger({"min_samples": 1})
+    traces = [
+        {
+            "spans": [
+                {"stage": "intelligence", "name": "key_quotes", "duration": 4.0, "calls": 1},
+                {"stage": "intelligence", "name": "key_quotes", "duration": 90.0, "calls": 3},
+                {"stage": "upload", "name": "upload", "duration": 50.0},
+            ]
+        }
+    ]
+    hedger.seed_from_traces(traces)
+    assert hedger.threshold("key_quotes") == 4.0
+    assert hedger.threshold("upload") is None
+
+
+def test_hedge_wins_and_slow_primary_is_abandoned():
+    hedger = hedging.Hedger({"enabled": True, "default_threshold_seconds": 0.05, "max_fraction": 1.0})
+    slots = []
+    release = threading.Event()
+
+    @contextmanager
+    def slot():
+        slots.append(threading.current_thread().name)
+        yield
+
+    def fn():
+        if len(slots) == 1:
+            release.wait(5)
+            return "slow"
+        return "fast"
+
+    assert hedger.call(fn, task="report", slot=slot) == "fast"
+    release.set()
+    assert hedger.hedges == 1
+    assert slots[1].startswith("stt-hedge")
+
+
+def test_primary_keeps_running_when_no_hedge_is_allowed():
+    hedger = hedging.Hedger({"enabled": True, "default_threshold_seconds": 0.01, "max_fraction": 0.0})
+    assert hedger.call(lambda: time.sleep(0.1) or "slow but fine", task="report") == "slow but fine"
+    assert hedger.hedges == 0
+
+
+def test_failed_primary_falls_back_to_hedge():
+    hedger = hedging.Hedger({"enabled": True, "default_threshold_seconds": 0.02, "max_fraction": 1.0})
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.1)
+            raise ConnectionError("reset")
+        time.sleep(0.2)
+        return "hedge"
+
+    assert hedger.call(fn, task="report") == "hedge"
+
+
+def test_time_spent_waiting_for_a_slot_does_not_trigger_a_hedge():
+    hedger = hedging.Hedger({"enabled": True, "default_threshold_seconds": 0.05, "max_fraction": 1.0})
+    busy = threading.Semaphore(1)
+
+    @contextmanager
+    def slot():
+        with busy:
+            yield
+
+    holder = threading.Thread(target=hedger.call, args=(lambda: time.sleep(0.02),), kwargs={"slot": slot})
+    busy.acquire()
+    holder.start()
+    threading.Timer(0.3, busy.release).start()
+    assert hedger.call(lambda: "instant", task="report", slot=slot) == "instant"
+    holder.join()
+    assert hedger.hedges == 0
+
+
+def test_hedges_capped_by_fraction_and_rate_limit():
+    hedger = hedging.Hedger({"enabled": True, "default_threshold_seconds": 0.01, "max_fraction": 0.0})
+    assert hedger.call(lambda: time.sleep(0.05) or "only", task="report") == "only"
+    assert hedger.hedges == 0
+
+    ratelimit.configure({"rate_limit": {"requests_per_minute": 60, "burst": 1}})
+    try:
+        assert ratelimit.try_acquire()
+        assert not ratelimit.try_acquire()
+    finally:
+        ratelimit.configure({})
@@ -0,0 +1,29 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ["google.genai", "tqdm", "flask", "reportlab", "docx", "notion_client", "httpx", "feedparser", "yaml"]
+CLI_IMPORT_BUDGET_MS = 250
+
+
+def _python(*args):
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, cwd=ROOT, check=True)
+
+
+def test_cli_import_leaves_sdks_and_backends_unloaded():
+    result = _python("-c", "import json, sys, stt.cli; print(json.dumps(sorted(sys.modules)))")
+    loaded = json.loads(result.stdout)
+    assert [m for m in loaded if any(m == name or m.startswith(name + ".") for name in HEAVY)] == []
+
+
+def test_cli_import_time_budget():
+    result = _python("-X", "importtime", "-c", "import stt.cli")
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == "stt.cli":
+            cumulative_us = int(parts[1])
+    assert cumulative_us is not None
+    assert cumulative_us / 1000 < CLI_IMPORT_BUDGET_MS, f"import stt.cli took {cumulative_us / 1000:.1f} ms"
@@ -0,0 +1,160 @@
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from stt import jobstore, worker
+from stt.breaker import CircuitOpenError
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return jobstore.MemoryJobStore(lease_seconds=10, max_attempts=2, retry_delay_seconds=0)
+    return jobstore.SQLiteJobStore(str(tmp_path / "jobs.sqlite"), lease_seconds=10, max_attempts=2, retry_delay_seconds=0)
+
+
+def test_submit_is_idempotent_and_claims_are_exclusive(store):
+    assert store.submit("https://youtu.be/a", {"lang": "en"})
+    assert not store.submit("https://youtu.be/a", {"lang": "en"})
+    job = store.claim("w1")
+    assert job["params"] == {"lang": "en"}
+    assert job["attempts"] == 1
+    assert store.claim("w2") is None
+    assert not store.heartbeat(job["id"], "w2")
+    assert store.heartbeat(job["id"], "w1")
+    assert store.complete(job["id"], "w1")
+    assert store.counts() == {"done": 1}
+    assert not store.submit("https://youtu.be/a", {"lang": "en"})
+
+
+def test_expired_lease_is_reclaimed_then_failed(store, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(jobstore.time, "time", lambda: now[0])
+    store.submit("https://youtu.be/a", {})
+    first = store.claim("crashed")
+    now[0] += 11
+    second = store.claim("w2")
+    assert second["id"] == first["id"]
+    assert second["reclaimed"]
+    assert not store.complete(first["id"], "crashed")
+    now[0] += 11
+    assert store.claim("w3") is None
+    assert store.counts() == {"failed": 1}
+    assert store.submit("https://youtu.be/a", {})
+
+
+def test_parking_does_not_use_up_attempts(store, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(jobstore.time, "time", lambda: now[0])
+    store.submit("https://youtu.be/a", {})
+    for _ in range(3):
+        job = store.claim("w1")
+        assert store.park(job["id"], "w1", 5)
+        assert store.claim("w1") is None
+        now[0] += 5
+    job = store.claim("w1")
+    assert job["attempts"] == 1
+    assert store.fail(job["id"], "w1", "boom")
+    assert store.claim("w1")["attempts"] == 2
+
+
+def test_concurrent_workers_never_share_a_job(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    setup = jobstore.SQLiteJobStore(path)
+    for n in range(20):
+        setup.submit(f"https://youtu.be/{n}", {})
+    claimed = []
+
+    def drain(name):
+        store = jobstore.SQLiteJobStore(path)
+        while True:
+            job = store.claim(name)
+            if job is None:
+                return
+            claimed.append(job["id"])
+            store.complete(job["id"], name)
+
+    threads = [threading.Thread(target=drain, args=(f"w{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(claimed) == 20
+    assert len(set(claimed)) == 20
+
+
+def test_run_job_maps_outcomes_to_the_store(monkeypatch):
+    store = jobstore.MemoryJobStore(max_attempts=5, retry_delay_seconds=0)
+    now = [0.0]
+    outcomes = iter([CircuitOpenError("gemini:m", 0), RuntimeError("bad"), None, "ok"])
+
+    def fake_process(target, **kwargs):
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(worker, "process_target", fake_process)
+    monkeypatch.setattr(jobstore.time, "time", lambda: now[0])
+    store.submit("https://youtu.be/a", {"lang": "en"})
+    results = []
+    for _ in range(4):
+        results.append(worker.run_job(store, store.claim("w"), "w", {}))
+        now[0] += 1
+    assert results == ["parked", "failed", "failed", "done"]
+    assert store.counts() == {"done": 1}
+
+
+def test_reclaimed_local_job_resolves_the_staged_source(tmp_path, monkeypatch):
+    output_root = tmp_path / "output"
+    config = {"paths": {"output_dir": str(output_root)}}
+    source = tmp_path / "inbox" / "talk.wav"
+    source.parent.mkdir()
+    source.write_bytes(b"audio")
+    store = jobstore.MemoryJobStore(lease_seconds=10)
+    now = [0.0]
+    monkeypatch.setattr(jobstore.time, "time", lambda: now[0])
+
+    assert worker.enqueue(store, [str(source)], {"lang": "en"}, output_root=str(output_root)) == 1
+    staged = output_root / "talk_results" / "talk.wav"
+    assert not source.exists() and staged.exists()
+
+    crashed = store.claim("crashed")
+    assert crashed["params"] == {"lang": "en", "source": os.path.join("talk_results", "talk.wav")}
+    now[0] += 11
+    job = store.claim("w2")
+    assert job["reclaimed"]
+
+    calls = []
+    monkeypatch.setattr(worker, "process_target", lambda target, **kwargs: calls.append((target, kwargs)) or "ok")
+    assert worker.run_job(store, job, "w2", config) == "done"
+    assert calls == [(str(staged), {"config": config, "dry_run": False, "lang": "en"})]
+
+
+def test_claims_follow_priority_before_age(store):
+    store.submit("https://youtu.be/backfill", {}, priority=1)
+    store.submit("https://youtu.be/interactive", {}, priority=8)
+    store.submit("https://youtu.be/batch", {}, priority=2)
+    assert [store.claim("w")["target"] for _ in range(3)] == [
+        "https://youtu.be/interactive",
+        "https://youtu.be/batch",
+        "https://youtu.be/backfill",
+    ]
+
+
+def test_enqueue_ranks_jobs_by_scheduler_weight():
+    store = jobstore.MemoryJobStore()
+    worker.enqueue(store, ["https://youtu.be/a", "https://youtu.be/b"], {}, {"https://youtu.be/b": "interactive"})
+    assert store.claim("w")["target"] == "https://youtu.be/b"
+
+
+def test_sqlite_store_adds_priority_to_an_existing_table(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    db = sqlite3.connect(path)
+    db.execute(jobstore.SCHEMA.replace("    priority REAL NOT NULL DEFAULT 0,\n", ""))
+    db.close()
+    store = jobstore.SQLiteJobStore(path)
+    assert store.submit("https://youtu.be/a", {}, priority=2)
+    assert store.claim("w")["priority"] == 2
@@ -0,0 +1,32 @@
+from stt.metrics import Registry
+
+
+def test_counter_and_gauge_render():
+    registry = Registry()
+    jobs = registry.counter("jobs_total", "Jobs", ["status"])
+    depth = registry.gauge("depth", "Depth")
+    jobs.inc(status="failed")
+    jobs.inc(2, status="succeeded")
+    depth.set(3)
+    depth.dec()
+    text = registry.render()
+    assert 'jobs_total{status="succeeded"} 2' in text
+    assert "# TYPE depth gauge" in text
+    assert "depth 2" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    hist = registry.histogram("lat", "Latency", ["stage"], buckets=(1, 5))
+    hist.observe(0.5, stage="upload")
+    hist.observe(3, stage="upload")
+    text = registry.render()
+    assert 'lat_bucket{stage="upload",le="1"} 1' in text
+    assert 'lat_bucket{stage="upload",le="5"} 2' in text
+    assert 'lat_bucket{stage="upload",le="+Inf"} 2' in text
+    assert hist.count(stage="upload") == 2
+
+
+def test_register_returns_existing():
+    registry = Registry()
+    assert registry.counter("a", "A") is registry.counter("a", "A")
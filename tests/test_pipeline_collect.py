@@ -1,3 +1,7 @@
+import os
+
+from stt import core, pipeline
+from stt.breaker import CircuitOpenError
 from stt.pipeline import collect_targets
 
 
@@ -6,3 +10,33 @@ def test_collect_targets_batch_file(tmp_path):
     f.write_text("a.mp3\n#comment\nb.mp3\n", encoding="utf-8")
     targets = collect_targets([], str(f))
     assert targets == ["a.mp3", "b.mp3"]
+
+
+def test_parked_local_job_resumes_from_moved_source(tmp_path, monkeypatch):
+    output_root = tmp_path / "output"
+    source = tmp_path / "talk.wav"
+    source.write_bytes(b"audio")
+    seen = []
+
+    def fake_analyze(audio_path, **kwargs):
+        seen.append(audio_path)
+        moved = os.path.join(core.results_dir(str(output_root), audio_path), os.path.basename(audio_path))
+        if len(seen) == 1:
+            os.makedirs(os.path.dirname(moved))
+            os.replace(audio_path, moved)
+            raise CircuitOpenError("gemini:m", 0)
+        return moved
+
+    monkeypatch.setattr(core, "_analyze_audio", fake_analyze)
+    pipeline.run_batch(
+        [str(source)],
+        config={"paths": {"output_dir": str(output_root)}},
+        lang="en",
+        include_timestamps=False,
+        with_transcript=False,
+        report_keys=None,
+        tts_enabled=False,
+        export_formats=[],
+        dry_run=False,
+    )
+    assert seen == [str(source), str(output_root / "talk_results" / "talk.wav")]
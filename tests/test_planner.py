@@ -0,0 +1,28 @@
+from stt import planner
+
+
+CONFIG = {
+    "cost": {"tokens_per_minute": 1500, "usd_per_1k_tokens": 0.01},
+    "batch": {"job_overhead_seconds": 0, "seconds_per_audio_minute": 60},
+}
+
+
+def _durations():
+    return {"a": (600.0, "header"), "b": (60.0, "header"), "c": (None, "missing"), "d": (300.0, "header")}
+
+
+def test_sjf_orders_known_first_and_estimates_cost():
+    plan = planner.build_plan(["a", "b", "c", "d"], CONFIG, order="sjf", durations=_durations())
+    assert [i["target"] for i in plan["items"]] == ["b", "d", "a", "c"]
+    assert plan["totals"]["tokens"] == 15000 + 1500 + 7500
+    assert plan["totals"]["unknown"] == 1
+
+
+def test_ljf_reduces_makespan_with_concurrency():
+    targets = ["a", "b", "d"]
+    durations = _durations()
+    ljf = planner.build_plan(targets, CONFIG, order="ljf", concurrency=2, durations=durations)
+    sjf = planner.build_plan(targets, CONFIG, order="sjf", concurrency=2, durations=durations)
+    assert ljf["totals"]["makespan_seconds"] == 600.0
+    assert sjf["totals"]["makespan_seconds"] == 660.0
+    assert sjf["totals"]["first_result_seconds"] == 60.0
@@ -0,0 +1,104 @@
+import threading
+import time
+
+from stt.plugins.base import Plugin
+from stt.plugins.dispatcher import PluginDispatcher
+
+
+class RecordingPlugin(Plugin):
+    def __init__(self, name, fail_times=0, delay=0.0):
+        super().__init__({})
+        self.name = name
+        self.fail_times = fail_times
+        self.delay = delay
+        self.calls = []
+        self.digests = []
+
+    def on_report(self, context, report_type, report_path):
+        time.sleep(self.delay)
+        self.calls.append(("report", report_type))
+
+    def on_complete(self, context):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("smtp down")
+        time.sleep(self.delay)
+        self.calls.append(("complete", context["title"]))
+
+    def on_digest(self, contexts):
+        self.digests.append([context["title"] for context in contexts])
+
+
+def _dispatcher(**settings):
+    base = {"timeout_seconds": 1, "max_retries": 2, "retry_delay_seconds": 0.01}
+    base.update(settings)
+    return PluginDispatcher(base)
+
+
+def test_emit_does_not_wait_for_slow_plugins_and_keeps_order():
+    dispatcher = _dispatcher()
+    slow = RecordingPlugin("email", delay=0.2)
+    context = {"title": "a"}
+    started = time.monotonic()
+    dispatcher.emit([slow], "on_report", context, "professional", "a.md")
+    dispatcher.emit([slow], "on_complete", context)
+    context["title"] = "mutated later"
+    assert time.monotonic() - started < 0.1
+    assert dispatcher.flush(timeout=5)
+    assert slow.calls == [("report", "professional"), ("complete", "a")]
+    dispatcher.shutdown()
+
+
+def test_failures_are_retried_and_isolated():
+    dispatcher = _dispatcher()
+    flaky = RecordingPlugin("email", fail_times=2)
+    broken = RecordingPlugin("telegram", fail_times=10)
+    hung = RecordingPlugin("obsidian", delay=3)
+    dispatcher.emit([flaky, broken, hung], "on_complete", {"title": "a"})
+    assert dispatcher.flush(timeout=5)
+    assert flaky.calls == [("complete", "a")]
+    assert broken.calls == []
+    assert hung.calls == []
+    dispatcher.emit([hung], "on_report", {"title": "b"}, "professional", "b.md")
+    hung.delay = 0
+    assert dispatcher.flush(timeout=5)
+    assert hung.calls == [("report", "professional")]
+    dispatcher.shutdown()
+
+
+def test_digest_batches_completions_by_size_and_on_flush():
+    dispatcher = PluginDispatcher({}, {"enabled": True, "plugins": ["email"], "max_items": 3, "window_seconds": 60})
+    email = RecordingPlugin("email")
+    obsidian = RecordingPlugin("obsidian")
+    for i in range(5):
+        dispatcher.emit([email, obsidian], "on_complete", {"title": str(i)})
+    assert dispatcher.flush(timeout=5)
+    assert email.digests == [["0", "1", "2"], ["3", "4"]]
+    assert email.calls == []
+    assert len(obsidian.calls) == 5
+    dispatcher.shutdown()
+
+
+def test_digest_flushes_after_window():
+    dispatcher = PluginDispatcher({}, {"enabled": True, "plugins": ["telegram"], "max_items": 50, "window_seconds": 0.2})
+    telegram = RecordingPlugin("telegram")
+    dispatcher.emit([telegram], "on_complete", {"title": "a"})
+    dispatcher.emit([telegram], "on_complete", {"title": "b"})
+    deadline = time.monotonic() + 5
+    while not telegram.digests and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert telegram.digests == [["a", "b"]]
+    dispatcher.shutdown()
+
+
+def test_full_queue_drops_instead_of_blocking():
+    dispatcher = _dispatcher(queue_size=1, enqueue_timeout_seconds=0.05)
+    gate = threading.Event()
+    blocked = RecordingPlugin("email")
+    blocked.on_report = lambda context, report_type, report_path: gate.wait(5)
+    for _ in range(4):
+        dispatcher.emit([blocked], "on_report", {"title": "a"}, "professional", "a.md")
+    assert dispatcher._worker("email").queue.qsize() <= 1
+    gate.set()
+    assert dispatcher.flush(timeout=5)
+    dispatcher.shutdown()
@@ -0,0 +1,43 @@
+import subprocess
+
+from stt import preprocess
+
+
+def test_parse_silences_and_trim_bounds():
+    stderr = (
+        "[silencedetect @ 0x1] silence_start: 0\n"
+        "[silencedetect @ 0x1] silence_end: 4.5 | silence_duration: 4.5\n"
+        "[silencedetect @ 0x1] silence_start: 95.2\n"
+    )
+    silences = preprocess.parse_silences(stderr, duration=100.0)
+    assert silences == [(0.0, 4.5), (95.2, 100.0)]
+    assert preprocess.trim_bounds(silences, 100.0) == (4.5, 95.2)
+
+
+def test_build_ffmpeg_command_mono_opus():
+    settings = preprocess.resolve_settings({"preprocess": {"codec": "opus", "sample_rate": 16000}})
+    cmd = preprocess.build_ffmpeg_command("in.wav", "out.ogg", settings, segments=[(4.5, 95.2)])
+    assert cmd[cmd.index("-ac") + 1] == "1"
+    assert cmd[cmd.index("-ar") + 1] == "16000"
+    assert cmd[cmd.index("-c:a") + 1] == "libopus"
+    assert "between(t,4.500,95.200)" in cmd[cmd.index("-af") + 1]
+
+
+def test_preprocess_audio_caches_by_hash(tmp_path, monkeypatch):
+    source = tmp_path / "a.wav"
+    source.write_bytes(b"x" * 1000)
+    calls = []
+
+    def fake_run(cmd, check=True, capture_output=True, **kwargs):
+        calls.append(cmd)
+        with open(cmd[-1], "wb") as f:
+            f.write(b"y" * 100)
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    config = {"paths": {"output_dir": str(tmp_path)}, "preprocess": {"enabled": True}}
+    first = preprocess.preprocess_audio(str(source), "abc123", config)
+    second = preprocess.preprocess_audio(str(source), "abc123", config)
+    assert first["saved_bytes"] == 900
+    assert not first["cached"]
+    assert second["cached"]
+    assert len(calls) == 1
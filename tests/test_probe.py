@@ -0,0 +1,61 @@
+import wave
+
+from stt import probe
+
+
+def _write_wav(path, seconds, rate=8000, channels=2):
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\x00" * 2 * channels * rate * seconds)
+
+
+def test_probe_wav_header(tmp_path):
+    path = tmp_path / "a.wav"
+    _write_wav(path, 5)
+    info = probe.probe_file(str(path))
+    assert info["source"] == "header"
+    assert info["duration_seconds"] == 5.0
+    assert info["channels"] == 2
+
+
+def test_probe_flac_streaminfo(tmp_path):
+    rate, channels, total = 44100, 2, 44100 * 7
+    packed = (rate << 44) | ((channels - 1) << 41) | (15 << 36) | total
+    info = b"\x10\x00\x10\x00" + b"\x00" * 6 + packed.to_bytes(8, "big") + b"\x00" * 16
+    path = tmp_path / "a.flac"
+    path.write_bytes(b"fLaC" + bytes([0x80, 0, 0, 34]) + info)
+    assert probe.probe_file(str(path))["duration_seconds"] == 7.0
+
+
+def test_probe_mp3_cbr(tmp_path):
+    frame = bytes([0xFF, 0xFB, 0x90, 0x00]) + b"\x00" * 413
+    path = tmp_path / "a.mp3"
+    path.write_bytes(frame * 100)
+    info = probe.probe_file(str(path))
+    assert abs(info["duration_seconds"] - 2.6) < 0.05
+
+
+def test_probe_cache_reused(tmp_path, monkeypatch):
+    path = tmp_path / "a.wav"
+    _write_wav(path, 2)
+    cache = probe.ProbeCache(str(tmp_path / "probe.json"))
+    probe.probe_many([str(path)], cache)
+    monkeypatch.setattr(probe, "probe_file", lambda p: (_ for _ in ()).throw(AssertionError("not cached")))
+    reloaded = probe.ProbeCache(str(tmp_path / "probe.json"))
+    assert probe.probe(str(path), reloaded)["duration_seconds"] == 2.0
+
+
+def test_probe_caches_in_two_processes_merge(tmp_path):
+    a, b = tmp_path / "a.wav", tmp_path / "b.wav"
+    _write_wav(a, 1)
+    _write_wav(b, 2)
+    cache_path = str(tmp_path / "probe.json")
+    first, second = probe.ProbeCache(cache_path), probe.ProbeCache(cache_path)
+    probe.probe(str(a), first)
+    probe.probe(str(b), second)
+    first.save()
+    second.save()
+    assert probe.ProbeCache(cache_path).get(str(a))["duration_seconds"] == 1
+    assert probe.ProbeCache(cache_path).get(str(b))["duration_seconds"] == 2
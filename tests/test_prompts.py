@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from stt import prompts
+
+
+def _config(tmp_path, reports, reload_seconds=0):
+    return {"paths": {"prompts_dir": str(tmp_path)}, "reports": reports, "prompts": {"reload_seconds": reload_seconds}}
+
+
+def test_load_reports_every_invalid_template(tmp_path):
+    (tmp_path / "good.md").write_text("Write in {language}\n{headings}\n{timestamps_block}", encoding="utf-8")
+    config = _config(
+        tmp_path,
+        {
+            "professional": {"prompt": {"file": "good.md"}},
+            "typo": {"prompt": "Write in {langauge}"},
+            "braces": {"prompt": "Return JSON like {\"a\": 1"},
+            "missing": {"prompt": {"file": "nope.md"}},
+        },
+    )
+    with pytest.raises(prompts.PromptError) as e:
+        prompts.PromptRegistry(config).load()
+    message = str(e.value)
+    assert "reports.typo: unknown placeholder {langauge}" in message
+    assert "reports.braces" in message
+    assert "reports.missing: cannot read" in message
+    assert "professional" not in message
+
+
+def test_render_is_memoized_and_hash_is_stable(tmp_path):
+    config = _config(tmp_path, {"professional": {"prompt": "Lang: {language}\n{headings}"}, "custom": {"prompt": "Just summarize."}})
+    registry = prompts.PromptRegistry(config).load()
+    text, digest = registry.render("professional", "en", False)
+    assert "English" in text and "# Key Points" in text
+    assert registry.render("professional", "en", False)[0] is text
+    assert registry.prompt_hash("professional", "en", False) == digest
+    assert registry.prompt_hash("professional", "en", True) == digest
+    assert registry.prompt_hash("professional", "ja", False) != digest
+    assert registry.render("custom", "zh", True)[0] == "Just summarize."
+
+
+def test_reports_added_later_are_loaded_on_first_use(tmp_path):
+    config = _config(tmp_path, {})
+    registry = prompts.PromptRegistry(config).load()
+    config["reports"]["custom"] = {"prompt": "Focus on risks in {language}."}
+    assert registry.render("custom", "en", False)[0] == "Focus on risks in English."
+    with pytest.raises(prompts.PromptError):
+        registry.render("unknown", "en", False)
+
+
+def test_changed_file_is_reloaded_and_bad_edits_are_ignored(tmp_path):
+    path = tmp_path / "professional.md"
+    path.write_text("v1 {language}", encoding="utf-8")
+    config = _config(tmp_path, {"professional": {"prompt": {"file": "professional.md"}}}, reload_seconds=0.01)
+    registry = prompts.PromptRegistry(config).load()
+    first = registry.prompt_hash("professional", "en", False)
+
+    path.write_text("v2 {language}", encoding="utf-8")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    registry.checked_at = 0
+    assert registry.render("professional", "en", False)[0] == "v2 English"
+    assert registry.prompt_hash("professional", "en", False) != first
+
+    path.write_text("v3 {unknown}", encoding="utf-8")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 2_000_000))
+    registry.checked_at = 0
+    assert registry.render("professional", "en", False)[0] == "v2 English"
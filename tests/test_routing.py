@@ -0,0 +1,54 @@
+import json
+
+from google.genai import types
+
+from stt import routing
+
+
+CONFIG = {
+    "models": {
+        "text": "pro",
+        "routes": {"content_type": ["lite", "flash"], "report": "pro"},
+        "latency_budget_seconds": {"content_type": 30},
+    }
+}
+
+
+def test_model_chain_defaults_to_text_model():
+    assert routing.model_chain(CONFIG, "content_type") == ["lite", "flash"]
+    assert routing.model_chain(CONFIG, "report") == ["pro"]
+    assert routing.model_chain(CONFIG, "entities") == ["pro"]
+
+
+def test_overload_falls_back_and_records_model(tmp_path):
+    router = routing.Router(CONFIG)
+    calls = []
+
+    def generator(client, model, contents, config, message, max_retries=5):
+        calls.append((model, config.http_options.timeout if config.http_options else None, max_retries))
+        if model == "lite":
+            raise RuntimeError("503 UNAVAILABLE: The model is overloaded.")
+        return "ok"
+
+    wrapped = router.wrap("content_type", generator, "content_type.json")
+    result = wrapped(None, "pro", contents=["x"], config=types.GenerateContentConfig(), message="m")
+    assert result == "ok"
+    assert calls == [("lite", 30000, 1), ("flash", None, 5)]
+    router.write(str(tmp_path))
+    used = json.loads((tmp_path / "models_used.json").read_text(encoding="utf-8"))
+    assert used["content_type.json"] == {"task": "content_type", "model": "flash", "fallback": True}
+
+
+def test_other_errors_are_not_swallowed():
+    router = routing.Router(CONFIG)
+
+    def generator(client, model, contents, config, message, **kwargs):
+        raise ValueError("400 INVALID_ARGUMENT")
+
+    wrapped = router.wrap("content_type", generator)
+    try:
+        wrapped(None, "pro", contents=["x"], config=None, message="m")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
@@ -0,0 +1,69 @@
+import threading
+import time
+
+from stt import scheduler
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.005)
+    assert predicate()
+
+
+def test_slots_are_shared_by_weight():
+    fair = scheduler.FairScheduler({"capacity": 1, "weights": {"interactive": 3, "backfill": 1}})
+    fair.acquire("backfill")
+    order = []
+    lock = threading.Lock()
+
+    def call(priority):
+        fair.acquire(priority)
+        with lock:
+            order.append(priority)
+        fair.release()
+
+    threads = [threading.Thread(target=call, args=(p,)) for p in ["backfill"] * 8 + ["interactive"] * 8]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: sum(len(q) for q in fair.queues.values()) == 16)
+    fair.release()
+    for thread in threads:
+        thread.join()
+    assert order[:8].count("interactive") >= 6
+    assert order[-4:] == ["backfill"] * 4
+    stats = fair.snapshot()["priorities"]
+    assert stats["interactive"]["granted_calls"] == 8
+    assert stats["backfill"]["wait_p95_seconds"] >= stats["interactive"]["wait_p50_seconds"]
+
+
+def test_bulk_jobs_yield_at_stage_boundaries_while_interactive_runs():
+    fair = scheduler.FairScheduler({"capacity": 4, "max_yield_seconds": 5})
+    fair.enter_job("interactive")
+    assert fair.stage_boundary("interactive") == 0.0
+    done = threading.Event()
+    thread = threading.Thread(target=lambda: (fair.stage_boundary("backfill"), done.set()))
+    thread.start()
+    time.sleep(0.05)
+    assert not done.is_set()
+    fair.exit_job("interactive")
+    thread.join(1)
+    assert done.is_set()
+
+
+def test_stage_boundary_gives_up_after_max_yield():
+    fair = scheduler.FairScheduler({"max_yield_seconds": 0.05})
+    fair.enter_job("interactive")
+    assert 0.05 <= fair.stage_boundary("batch") < 1
+
+
+def test_priority_scope_sets_the_current_priority(monkeypatch):
+    fair = scheduler.FairScheduler({"capacity": 0})
+    monkeypatch.setattr(scheduler, "_scheduler", fair)
+    assert scheduler.current_priority() == "batch"
+    with scheduler.priority_scope("watch"):
+        assert scheduler.current_priority() == "watch"
+        assert fair.active["watch"] == 1
+        assert scheduler.acquire() == 0.0
+        scheduler.release()
+    assert fair.active["watch"] == 0
@@ -0,0 +1,53 @@
+import os
+
+from stt import scheduler, streaming
+
+
+class Chunk:
+    def __init__(self, text, usage=None):
+        self.text = text
+        self.usage_metadata = usage
+
+
+class DroppingModels:
+    def __init__(self):
+        self.requests = []
+
+    def generate_content_stream(self, model, contents, config=None):
+        self.requests.append(contents)
+        if len(self.requests) == 1:
+            yield Chunk("Hello ")
+            yield Chunk("wor")
+            raise ConnectionError("connection reset by peer")
+        yield Chunk("ld.")
+
+
+class FakeClient:
+    def __init__(self):
+        self.models = DroppingModels()
+
+
+def test_stream_resumes_after_drop(tmp_path, monkeypatch):
+    slots_during_backoff = []
+    monkeypatch.setattr(streaming.time, "sleep", lambda s: slots_during_backoff.append(scheduler.get_scheduler().in_use))
+    client = FakeClient()
+    out = tmp_path / "report.md"
+    events = []
+    with streaming.listening(events.append):
+        text = streaming.stream_to_file(client, "m", ["media", "prompt"], None, str(out))
+    assert text == "Hello world."
+    assert out.read_text(encoding="utf-8") == "Hello world."
+    assert not os.path.exists(str(out) + ".part")
+    assert client.models.requests[1][-1].endswith("Hello wor")
+    assert events[-1]["done"] and events[-1]["chars"] == len(text)
+    assert slots_during_backoff == [0]
+
+
+def test_stream_picks_up_leftover_part_file(tmp_path):
+    out = tmp_path / "transcript.md"
+    (tmp_path / "transcript.md.part").write_text("Hello wor", encoding="utf-8")
+    client = FakeClient()
+    client.models.requests.append("earlier run")
+    text = streaming.stream_to_file(client, "m", ["media", "prompt"], None, str(out))
+    assert text == "Hello world."
+    assert streaming.CONTINUE_PROMPT in client.models.requests[1][-1]
@@ -0,0 +1,47 @@
+import json
+
+from stt import tracing
+
+
+class DummyUsage:
+    prompt_token_count = 1000
+    candidates_token_count = 200
+    thoughts_token_count = None
+    cached_content_token_count = None
+
+
+class DummyResp:
+    usage_metadata = DummyUsage()
+
+
+def test_span_records_usage_and_writes_files(tmp_path):
+    trace = tracing.start_trace("job")
+    trace.output_dir = str(tmp_path)
+    with tracing.span("report", "professional"):
+        tracing.add_usage(DummyResp(), "m1")
+    tracing.finish_trace()
+
+    data = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))
+    record = data["spans"][0]
+    assert record["stage"] == "report"
+    assert record["prompt_tokens"] == 1000
+    assert record["output_tokens"] == 200
+    chrome = json.loads((tmp_path / "trace.chrome.json").read_text(encoding="utf-8"))
+    assert chrome["traceEvents"][0]["ph"] == "X"
+    assert tracing.current_trace() is None
+
+
+def test_aggregate_traces_cost_and_percentiles():
+    config = {"cost": {"usd_per_1k_tokens": 0.01, "models": {"m1": {"input_per_1k": 0.1, "output_per_1k": 1.0}}}}
+    traces = [
+        {"spans": [{"stage": "report", "duration": d, "model": "m1", "prompt_tokens": 1000, "output_tokens": 1000}]}
+        for d in (1.0, 2.0, 3.0, 4.0)
+    ]
+    summary = tracing.aggregate_traces(traces, config)
+    assert summary["stages"]["report"]["p50"] == 2.0
+    assert summary["stages"]["report"]["p95"] == 4.0
+    assert abs(summary["models"]["m1"]["usd"] - 4.4) < 1e-9
+
+
+def test_percentile_empty():
+    assert tracing.percentile([], 50) is None
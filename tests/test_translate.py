@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from stt.generators import translate
+
+
+class Resp:
+    def __init__(self, text):
+        self.text = text
+
+
+def test_parse_langs_orders_pivot_first():
+    assert translate.parse_langs("zh, en,ja,en") == ["zh", "en", "ja"]
+    assert translate.parse_langs("zh,en,ja", pivot="en") == ["en", "zh", "ja"]
+    with pytest.raises(ValueError):
+        translate.parse_langs("zh,xx")
+
+
+def test_translate_report_is_text_only(tmp_path):
+    seen = {}
+
+    def generator(client, model, contents, config, message):
+        seen["contents"] = contents
+        return Resp("# 要点总结\n- [01:05] 内容")
+
+    out = tmp_path / "a_professional_zh_report.md"
+    text = translate.translate_report(None, "m", generator, "# Key Points\n- [01:05] x", "professional", "zh", str(out))
+    assert out.read_text(encoding="utf-8") == text
+    assert len(seen["contents"]) == 1
+    assert "Chinese" in seen["contents"][0] and "要点总结" in seen["contents"][0]
+
+
+def test_multilang_report_parses_json_and_rejects_partial():
+    template = "Write a report in {language}.\n{headings}\n{timestamps_block}"
+
+    def good(client, model, contents, config, message):
+        return Resp(json.dumps({"en": "# A", "ja": "# B"}))
+
+    def partial(client, model, contents, config, message):
+        return Resp(json.dumps({"en": "# A"}))
+
+    args = ("media", template, "professional", ["en", "ja"], False, 0.3)
+    assert translate.generate_multilang_report(None, "m", args[0], good, *args[1:]) == {"en": "# A", "ja": "# B"}
+    assert translate.generate_multilang_report(None, "m", args[0], partial, *args[1:]) is None
@@ -0,0 +1,90 @@
+from stt import uploads
+
+
+class Uploaded:
+    def __init__(self, name, display_name="a.wav"):
+        self.name = name
+        self.display_name = display_name
+        self.expiration_time = None
+
+
+class FakeFiles:
+    def __init__(self):
+        self.deleted = []
+        self.uploaded = 0
+
+    def delete(self, name):
+        self.deleted.append(name)
+
+    def upload(self, file, config=None):
+        self.uploaded += 1
+        return Uploaded(f"files/new{self.uploaded}", config["display_name"])
+
+
+class FakeClient:
+    def __init__(self):
+        self.files = FakeFiles()
+
+
+def test_release_deletes_after_last_job(tmp_path):
+    client = FakeClient()
+    registry = uploads.UploadRegistry(str(tmp_path / "uploads.json"))
+    registry.track(Uploaded("files/1"), str(tmp_path / "a.wav"), "job-a")
+    registry.track(Uploaded("files/1"), str(tmp_path / "a.wav"), "job-b")
+    assert not registry.release(client, "files/1", "job-a")
+    assert registry.release(client, "files/1", "job-b")
+    assert client.files.deleted == ["files/1"]
+    assert uploads.UploadRegistry(str(tmp_path / "uploads.json")).entries == {}
+
+
+def test_pinned_files_survive_release_and_gc(tmp_path):
+    client = FakeClient()
+    registry = uploads.UploadRegistry(str(tmp_path / "uploads.json"), {"pin": ["keep-*"]})
+    registry.track(Uploaded("files/1", "keep-me.wav"), str(tmp_path / "keep-me.wav"), "job")
+    assert not registry.release(client, "files/1", "job")
+    registry.gc(client)
+    assert client.files.deleted == []
+
+
+def test_gc_refreshes_expiring_files_for_waiting_jobs(tmp_path):
+    source = tmp_path / "a.wav"
+    source.write_bytes(b"RIFF")
+    client = FakeClient()
+    registry = uploads.UploadRegistry(str(tmp_path / "uploads.json"))
+    entry = registry.track(Uploaded("files/old"), str(source), "queued-job")
+    now = entry["expires_at"] - 60
+    entry["jobs"]["queued-job"] = now
+    registry.save()
+    stats = registry.gc(client, now=now)
+    assert stats["refreshed"] == 1
+    assert registry.current_name("files/old") == "files/new1"
+    assert "queued-job" in registry.entries["files/new1"]["jobs"]
+
+
+def test_gc_deletes_orphans_and_forgets_expired(tmp_path):
+    client = FakeClient()
+    registry = uploads.UploadRegistry(str(tmp_path / "uploads.json"), {"stale_job_seconds": 10})
+    orphan = registry.track(Uploaded("files/orphan"), str(tmp_path / "a.wav"), "crashed-job")
+    registry.track(Uploaded("files/expired"), str(tmp_path / "b.wav"), "job")
+    registry.entries["files/expired"]["expires_at"] = orphan["uploaded_at"] + 5
+    registry.save()
+    stats = registry.gc(client, now=orphan["uploaded_at"] + 20)
+    assert stats == {"deleted": 1, "refreshed": 0, "forgotten": 1}
+    assert client.files.deleted == ["files/orphan"]
+
+
+def test_registries_in_separate_processes_merge_instead_of_clobbering(tmp_path):
+    path = str(tmp_path / "uploads.json")
+    client = FakeClient()
+    first = uploads.UploadRegistry(path)
+    second = uploads.UploadRegistry(path)
+    first.track(Uploaded("files/1"), str(tmp_path / "a.wav"), "job-a")
+    second.track(Uploaded("files/2"), str(tmp_path / "b.wav"), "job-b")
+    second.track(Uploaded("files/1"), str(tmp_path / "a.wav"), "job-c")
+    assert sorted(uploads.UploadRegistry(path).entries) == ["files/1", "files/2"]
+
+    assert not first.release(client, "files/1", "job-a")
+    assert client.files.deleted == []
+    assert second.release(client, "files/1", "job-c")
+    assert client.files.deleted == ["files/1"]
+    assert list(uploads.UploadRegistry(path).entries) == ["files/2"]
@@ -0,0 +1,29 @@
+from stt import vad
+
+
+def test_speech_segments_and_offset_map():
+    silences = [(0.0, 10.0), (30.0, 50.0)]
+    segments = vad.speech_segments(silences, 80.0, padding=0.0)
+    assert segments == [(10.0, 30.0), (50.0, 80.0)]
+    offset_map = vad.build_offset_map(segments)
+    assert offset_map == [[0.0, 10.0, 20.0], [20.0, 50.0, 30.0]]
+    assert vad.to_original(5, offset_map) == 15
+    assert vad.to_original(25, offset_map) == 55
+
+
+def test_speech_segments_merges_padding_overlap():
+    segments = vad.speech_segments([(10.0, 10.3)], 20.0, padding=0.25)
+    assert segments == [(0.0, 20.0)]
+
+
+def test_remap_timestamps():
+    offset_map = [[0.0, 10.0, 20.0], [20.0, 50.0, 3600.0]]
+    text = "- [00:05] intro\n- [00:25] later\n- [01:00:00] end"
+    remapped = vad.remap_timestamps(text, offset_map)
+    assert "[00:15] intro" in remapped
+    assert "[00:55] later" in remapped
+    assert "[01:00:30] end" in remapped
+
+
+def test_remap_identity_is_noop():
+    assert vad.remap_timestamps("[00:05]", [[0.0, 0.0, 100.0]]) == "[00:05]"